@@ -0,0 +1,14 @@
+"""
+ASGI config for app project.
+
+Serves the sync views through Django's thread adapter and the /async/
+voting and leaderboard views natively on the event loop. Run with an ASGI
+server, e.g. `uvicorn app.asgi:application` or
+`gunicorn app.asgi:application -k uvicorn.workers.UvicornWorker`.
+"""
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+
+application = get_asgi_application()
@@ -19,6 +19,7 @@ class PlayerAdmin(admin.ModelAdmin):
 @admin.register(Season)
 class SeasonAdmin(admin.ModelAdmin):
     list_display = ('player', 'year', 'competition', 'goals', 'assists', 'matches', 'minutes_played')
+    list_select_related = ('player', 'competition')
     search_fields = ('player__name', 'competition__name', 'year')
     list_filter = ('year', 'competition')
 
@@ -33,14 +34,15 @@ class CompetitionAdmin(admin.ModelAdmin):
 @admin.register(Vote)
 class VoteAdmin(admin.ModelAdmin):
     list_display = ("id", "player", "manager", "vote_count", "timestamp")
+    list_select_related = ("player", "manager")
 
     @admin.display(description="Votes Count")
     def vote_count(self, obj):
         """
-        Count the number of votes for each player/manager dynamically.
+        Read the denormalized vote counter of the voted player/manager.
         """
         if obj.player:
-            return Vote.objects.filter(player=obj.player).count()
+            return obj.player.vote_count
         elif obj.manager:
-            return Vote.objects.filter(manager=obj.manager).count()
-        return 0
\ No newline at end of file
+            return obj.manager.vote_count
+        return 0
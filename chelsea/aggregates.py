@@ -0,0 +1,185 @@
+"""
+Per-player career aggregates.
+
+PlayerCareerStats holds one row per (player, competition) plus one
+all-competition row per player. Rows are recomputed for the affected
+players whenever a Season is saved or deleted (see chelsea.signals), with a
+single grouped aggregate query per refresh.
+
+The same grouped aggregate backs the ad-hoc comparisons over a season
+range, which cannot be served from the precomputed rows.
+"""
+from collections import Counter, defaultdict
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Sum
+
+from .cache import bump_version
+from .models import Season, PlayerCareerStats
+
+SUM_FIELDS = ("goals", "assists", "matches", "minutes_played", "tackles", "recoveries")
+PER_90_FIELDS = ("goals", "assists", "tackles", "recoveries")
+
+# pg_advisory_xact_lock(namespace, key) namespaces of the career refresh:
+# the whole table, then one key per player.
+CAREER_LOCK_NAMESPACE = 9001
+
+
+def _build(stats_model, totals):
+    minutes = totals["minutes_played"]
+    return stats_model(
+        player_id=totals["player_id"],
+        competition_id=totals["competition_id"],
+        seasons=totals["seasons"],
+        ground_duels_won_pct=round(totals["weighted_duels"] / minutes, 2) if minutes else 0,
+        **{field: totals[field] for field in SUM_FIELDS},
+        **{f"{field}_per_90": round(totals[field] * 90 / minutes, 3) if minutes else 0
+           for field in PER_90_FIELDS},
+    )
+
+
+def season_totals(seasons, *group_by):
+    """
+    Group a Season queryset and sum the career fields per group.
+    """
+    return (
+        seasons.order_by()
+        .values(*group_by)
+        .annotate(
+            seasons=Count("id"),
+            weighted_duels=Sum(F("ground_duels_won_pct") * F("minutes_played"), output_field=FloatField()),
+            **{field: Sum(field) for field in SUM_FIELDS},
+        )
+    )
+
+
+def filter_year_range(seasons, year_from=None, year_to=None):
+    """
+    Restrict seasons by starting year. Season.year is "YYYY/YY", so
+    comparing against the starting year as a string is exact.
+    """
+    if year_from is not None:
+        seasons = seasons.filter(year__gte=str(year_from))
+    if year_to is not None:
+        seasons = seasons.filter(year__lt=str(year_to + 1))
+    return seasons
+
+
+def compute_career_stats(player_ids=None):
+    """
+    Build unsaved career rows for the given players (all players if None).
+    """
+    seasons = Season.objects.all()
+    if player_ids is not None:
+        seasons = seasons.filter(player_id__in=player_ids)
+
+    rows = []
+    careers = defaultdict(Counter)
+    for group in season_totals(seasons, "player_id", "competition_id"):
+        group["weighted_duels"] = group["weighted_duels"] or 0
+        rows.append(_build(PlayerCareerStats, group))
+        career = careers[group["player_id"]]
+        for field in ("seasons", "weighted_duels", *SUM_FIELDS):
+            career[field] += group[field]
+
+    for player_id, career in careers.items():
+        rows.append(_build(PlayerCareerStats, {**career, "player_id": player_id, "competition_id": None}))
+    return rows
+
+
+def _lock_careers(player_ids):
+    """
+    Serialize refreshes of the same players with transaction-scoped advisory
+    locks, taken in key order. A full refresh holds the namespace lock
+    exclusively, player-scoped refreshes hold it shared. The Player rows,
+    which every vote UPDATEs, are never locked. Only PostgreSQL has advisory
+    locks; SQLite runs one writer at a time anyway.
+    """
+    connection = transaction.get_connection()
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        if player_ids is None:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s, 0)", [CAREER_LOCK_NAMESPACE])
+            return
+        cursor.execute("SELECT pg_advisory_xact_lock_shared(%s, 0)", [CAREER_LOCK_NAMESPACE])
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(%s, key) FROM unnest(%s::integer[]) AS key ORDER BY key",
+            [CAREER_LOCK_NAMESPACE + 1, sorted({pk % 2**31 for pk in player_ids})],
+        )
+
+
+def refresh_career_stats(player_ids=None):
+    """
+    Recompute the career rows of the given players (all players if None).
+
+    Concurrent refreshes of the same player (e.g. two Season saves committing
+    at once) run one after the other (see _lock_careers) instead of both
+    inserting rows and hitting the unique constraints. A player-scoped
+    upsert isn't possible here: the all-competition row's constraint is
+    partial, which ON CONFLICT can't target through Django.
+    """
+    with transaction.atomic():
+        stale = PlayerCareerStats.objects.all()
+        if player_ids is not None:
+            player_ids = set(player_ids)
+            stale = stale.filter(player_id__in=player_ids)
+        _lock_careers(player_ids)
+        stale.delete()
+        rows = PlayerCareerStats.objects.bulk_create(compute_career_stats(player_ids))
+        transaction.on_commit(partial(bump_version, PlayerCareerStats))
+    return len(rows)
+
+
+def player_stats(player_ids, competition_id=None, year_from=None, year_to=None):
+    """
+    Return {player_id: PlayerCareerStats} for the players in one query.
+    Without a year range the precomputed rows are read; with one, the
+    seasons are aggregated on the fly. Players without seasons get zeros.
+    """
+    if year_from is None and year_to is None:
+        stats = {
+            row.player_id: row
+            for row in PlayerCareerStats.objects.filter(player_id__in=player_ids, competition_id=competition_id)
+        }
+    else:
+        seasons = filter_year_range(Season.objects.filter(player_id__in=player_ids), year_from, year_to)
+        if competition_id is not None:
+            seasons = seasons.filter(competition_id=competition_id)
+        stats = {}
+        for group in season_totals(seasons, "player_id"):
+            group["weighted_duels"] = group["weighted_duels"] or 0
+            stats[group["player_id"]] = _build(PlayerCareerStats, {**group, "competition_id": competition_id})
+
+    for pk in player_ids:
+        stats.setdefault(pk, PlayerCareerStats(player_id=pk, competition_id=competition_id))
+    return stats
+
+
+def manager_stats(manager_ids, competition_id=None, year_from=None, year_to=None):
+    """
+    Return {manager_id: dict} of squad totals from the seasons each manager
+    oversaw, in one grouped query.
+    """
+    seasons = filter_year_range(Season.objects.filter(manager_id__in=manager_ids), year_from, year_to)
+    if competition_id is not None:
+        seasons = seasons.filter(competition_id=competition_id)
+
+    groups = (
+        seasons.order_by()
+        .values("manager_id")
+        .annotate(
+            seasons=Count("year", distinct=True),
+            players_used=Count("player", distinct=True),
+            goals=Sum("goals"),
+            assists=Sum("assists"),
+            tackles=Sum("tackles"),
+            recoveries=Sum("recoveries"),
+        )
+    )
+    empty = {"seasons": 0, "players_used": 0, "goals": 0, "assists": 0, "tackles": 0, "recoveries": 0}
+    stats = {pk: dict(empty) for pk in manager_ids}
+    for group in groups:
+        stats[group.pop("manager_id")] = group
+    return stats
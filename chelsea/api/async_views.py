@@ -0,0 +1,210 @@
+"""
+Native async versions of the voting and leaderboard endpoints.
+
+Served under /async/ next to their sync counterparts, with the same request
+and response shapes. Under ASGI (see app/asgi.py) a request waiting on the
+database yields the event loop instead of holding a worker, so concurrency
+is bounded by the connection pool rather than the worker count.
+
+Reads use the async ORM. Vote writes need a transaction, which the async
+ORM lacks, so they run through votes.arecord_vote in a worker thread. The
+leaderboards are read straight from the (indexed) tables: the response
+cache API is synchronous and would block the loop with a Redis backend.
+"""
+import json
+import math
+
+from asgiref.sync import sync_to_async
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework.exceptions import Throttled
+
+from ..lineups import DEFAULT_FORMATION, abest_xi, normalize_formation
+from ..models import Player, Manager
+from ..ratelimit import get_rate_limiter
+from ..rollups import atrending, parse_window
+from ..votes import arecord_vote
+from ..vote_buffer import aget_vote_buffer
+from .renderers import ORJSONResponse
+from .serializers import PlayerSerializer, ManagerSerializer
+
+
+def _payload(request):
+    """
+    Request body as a dict: JSON, or form data for non-JSON requests.
+    """
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    return request.POST.dict()
+
+
+async def _throttled(request, data):
+    """
+    The 429 response VoteRateThrottle would give, or None if the vote may
+    go ahead. Runs before any query. The check runs in a worker thread,
+    since the redis backend blocks on network I/O.
+    """
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return None
+    wait = await sync_to_async(limiter.check, thread_sensitive=False)(request.META, data)
+    if wait is None:
+        return None
+    exc = Throttled(math.ceil(wait))
+    return ORJSONResponse({"detail": str(exc.detail)}, status=exc.status_code, headers={"Retry-After": str(exc.wait)})
+
+
+# ==============================
+# 🗳️ VOTING
+# ==============================
+@csrf_exempt
+@require_POST
+async def cast_vote(request):
+    """
+    Async CastVoteView: vote for a player or a manager.
+    """
+    data = _payload(request)
+    if data is None:
+        return ORJSONResponse({"error": "Malformed request body."}, status=400)
+    if throttled := await _throttled(request, data):
+        return throttled
+
+    player_id = data.get("player_id")
+    manager_id = data.get("manager_id")
+    if not player_id and not manager_id:
+        return ORJSONResponse({"error": "A vote must be cast for either a player or a manager."}, status=400)
+    if player_id and manager_id:
+        return ORJSONResponse(
+            {"error": "A vote cannot be cast for both a player and a manager at the same time."}, status=400
+        )
+
+    buffer = await aget_vote_buffer()
+    try:
+        if buffer is not None:
+            await sync_to_async(buffer.submit)(player_id=player_id, manager_id=manager_id)
+            return ORJSONResponse({"message": "Vote queued successfully!"}, status=202)
+
+        await arecord_vote(player_id=player_id, manager_id=manager_id)
+    except (Player.DoesNotExist, Manager.DoesNotExist):
+        return ORJSONResponse({"error": "Player or Manager not found."}, status=404)
+
+    return ORJSONResponse({"message": "Vote cast successfully!"}, status=201)
+
+
+@csrf_exempt
+@require_POST
+async def vote_comparison(request):
+    """
+    Async VoteComparisonView: vote for one of two same-position players.
+    """
+    data = _payload(request)
+    if data is None:
+        return ORJSONResponse({"error": "Malformed request body."}, status=400)
+    if throttled := await _throttled(request, data):
+        return throttled
+
+    player1_id = data.get("player1_id")
+    player2_id = data.get("player2_id")
+    if not player1_id or not player2_id:
+        return ORJSONResponse({"error": "Both player1_id and player2_id are required for voting."}, status=400)
+
+    not_found = ORJSONResponse({"error": "One or both players not found."}, status=404)
+    try:
+        player1_id, player2_id = int(player1_id), int(player2_id)
+    except (TypeError, ValueError):
+        return not_found
+    players = await Player.objects.only("position").ain_bulk([player1_id, player2_id])
+    if player1_id not in players or player2_id not in players:
+        return not_found
+
+    player1, player2 = players[player1_id], players[player2_id]
+    if player1.position != player2.position:
+        return ORJSONResponse({"error": "Players must be in the same position to be compared."}, status=400)
+
+    voted_player_id = data.get("vote_for")
+    if voted_player_id not in [player1.id, player2.id]:
+        return ORJSONResponse({"error": "vote_for must be one of the compared players."}, status=400)
+
+    try:
+        await arecord_vote(player_id=voted_player_id)
+    except Player.DoesNotExist:
+        return not_found
+    return ORJSONResponse({"message": "Vote cast successfully!"}, status=201)
+
+
+# ==============================
+# 🏆 LEADERBOARDS
+# ==============================
+@require_GET
+async def best_players(request):
+    """
+    Async BestPlayersView: best XI for ?formation= or ?manager_id=.
+    """
+    formation = request.GET.get("formation")
+    manager_id = request.GET.get("manager_id")
+
+    if not formation and manager_id:
+        if not manager_id.isdigit():
+            return ORJSONResponse({"error": "'manager_id' must be an integer."}, status=400)
+        try:
+            formation = await Manager.objects.values_list("preferred_formation", flat=True).aget(id=manager_id)
+        except Manager.DoesNotExist:
+            return ORJSONResponse({"error": "Manager not found."}, status=404)
+
+    try:
+        formation = normalize_formation(formation or DEFAULT_FORMATION)
+        players = await abest_xi(formation)
+    except ValueError as exc:
+        return ORJSONResponse({"error": str(exc)}, status=400)
+    return ORJSONResponse(PlayerSerializer(players, many=True).data, safe=False, headers={"X-Formation": formation})
+
+
+@require_GET
+async def top_voted_player(request):
+    """
+    Async TopVotedPlayerView.
+    """
+    top_player = await Player.objects.order_by("-vote_count").afirst()
+    if not top_player:
+        return ORJSONResponse({"error": "No votes registered yet."}, status=404)
+    return ORJSONResponse(PlayerSerializer(top_player).data)
+
+
+@require_GET
+async def best_manager(request):
+    """
+    Async BestManagerView.
+    """
+    manager = await Manager.objects.order_by("-vote_count").afirst()
+    if not manager:
+        return ORJSONResponse({"error": "No votes found for managers."}, status=404)
+    return ORJSONResponse(ManagerSerializer(manager).data)
+
+
+@require_GET
+async def trending(request):
+    """
+    Async TrendingView: ?type=player|manager&window=24h&limit=10.
+    """
+    kind = request.GET.get("type", "player")
+    if kind not in ("player", "manager"):
+        return ORJSONResponse({"error": "type must be 'player' or 'manager'."}, status=400)
+    try:
+        window_param = request.GET.get("window", "24h")
+        window = parse_window(window_param)
+    except ValueError as exc:
+        return ORJSONResponse({"error": str(exc)}, status=400)
+    limit = request.GET.get("limit", "10")
+    if not limit.isdigit() or int(limit) < 1:
+        return ORJSONResponse({"error": "limit must be a positive integer."}, status=400)
+    limit = min(int(limit), 100)
+
+    return ORJSONResponse({
+        "type": kind,
+        "window": window_param,
+        "results": await atrending(kind, window, limit=limit),
+    })
@@ -0,0 +1,134 @@
+"""
+Streaming exports for analytics jobs.
+
+Rows are read with QuerySet.iterator(chunk_size=...) (a server-side cursor on
+PostgreSQL) and written to a StreamingHttpResponse as they arrive, so memory
+stays flat and the first bytes go out as soon as the first chunk is fetched.
+
+    GET /export/seasons/?format=csv&competition=1&year_from=2015&year_to=2020&player=7
+    GET /export/votes/?format=ndjson&player=7&year_from=2024
+"""
+import csv
+
+from django.http import StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from ..aggregates import filter_year_range
+from ..models import Season, Vote
+from .renderers import ORJSONResponse, dumps
+
+CHUNK_SIZE = 2000
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+SEASON_COLUMNS = (
+    "id", "player_id", "player__name", "competition_id", "competition__name", "manager_id", "manager__name",
+    "year", "goals", "assists", "matches", "minutes_played", "tackles", "recoveries", "ground_duels_won_pct",
+)
+VOTE_COLUMNS = ("id", "player_id", "manager_id", "timestamp")
+
+
+class ExportError(ValueError):
+    pass
+
+
+class _Echo:
+    """
+    File-like object whose write() hands the line back to the caller.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _int_param(request, name):
+    value = request.GET.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ExportError(f"'{name}' must be an integer.")
+
+
+def _render_rows(rows, columns, fmt):
+    """
+    Encode rows in batches so each chunk written to the socket carries many rows.
+    """
+    header = [column.replace("__", "_") for column in columns]
+    batch = []
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(header)
+        for row in rows:
+            batch.append(writer.writerow(row))
+            if len(batch) >= CHUNK_SIZE:
+                yield "".join(batch)
+                batch = []
+        if batch:
+            yield "".join(batch)
+    else:
+        # The API's encoder, so timestamps read the same as in every other response.
+        for row in rows:
+            batch.append(dumps(dict(zip(header, row))))
+            if len(batch) >= CHUNK_SIZE:
+                yield b"\n".join(batch) + b"\n"
+                batch = []
+        if batch:
+            yield b"\n".join(batch) + b"\n"
+
+
+def _stream(request, queryset, columns, filename):
+    fmt = request.GET.get("format", "ndjson")
+    if fmt not in FORMATS:
+        return ORJSONResponse({"error": f"format must be one of {sorted(FORMATS)}."}, status=400)
+
+    rows = queryset.values_list(*columns).iterator(chunk_size=CHUNK_SIZE)
+    response = StreamingHttpResponse(_render_rows(rows, columns, fmt), content_type=FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
+
+
+@require_GET
+def export_seasons(request):
+    """
+    Stream Season rows, optionally filtered by competition, player and year range.
+    """
+    try:
+        competition, player = _int_param(request, "competition"), _int_param(request, "player")
+        year_from, year_to = _int_param(request, "year_from"), _int_param(request, "year_to")
+    except ExportError as exc:
+        return ORJSONResponse({"error": str(exc)}, status=400)
+
+    seasons = Season.objects.order_by("id")
+    if competition is not None:
+        seasons = seasons.filter(competition_id=competition)
+    if player is not None:
+        seasons = seasons.filter(player_id=player)
+    seasons = filter_year_range(seasons, year_from, year_to)
+    return _stream(request, seasons, SEASON_COLUMNS, "seasons")
+
+
+@require_GET
+def export_votes(request):
+    """
+    Stream Vote rows, optionally filtered by player/manager and year range.
+    """
+    try:
+        player, manager = _int_param(request, "player"), _int_param(request, "manager")
+        year_from, year_to = _int_param(request, "year_from"), _int_param(request, "year_to")
+    except ExportError as exc:
+        return ORJSONResponse({"error": str(exc)}, status=400)
+
+    votes = Vote.objects.order_by("id")
+    if player is not None:
+        votes = votes.filter(player_id=player)
+    if manager is not None:
+        votes = votes.filter(manager_id=manager)
+    if year_from is not None:
+        votes = votes.filter(timestamp__year__gte=year_from)
+    if year_to is not None:
+        votes = votes.filter(timestamp__year__lte=year_to)
+    return _stream(request, votes, VOTE_COLUMNS, "votes")
@@ -0,0 +1,351 @@
+import hashlib
+from collections import namedtuple
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from ..cache import get_data_state, metrics, response_cache
+from ..db_router import may_read_replica, replica_may_lag, routing_settings
+from ..rankings import rank_index
+from ..search import name_index
+
+
+class CachedResponseMixin:
+    """
+    Serve successful GET responses from the response cache, with conditional
+    GET support.
+
+    `cache_models` lists every model the response is built from (or just
+    their vote counters or names, see chelsea.cache.vote_scope/name_scope);
+    the key embeds their versions, so a write to any of them invalidates it.
+    The same versions give the response a strong ETag, and their write times
+    its Last-Modified, so If-None-Match / If-Modified-Since requests are
+    answered 304 before any query or serializer runs.
+    Views whose output also moves with the clock return the start of the
+    current period from get_cache_epoch(), which goes into the key and
+    Last-Modified too.
+    On ViewSets only the actions in `cached_actions` are cached.
+    """
+    cache_models = ()
+    cached_actions = ("list", "retrieve")
+
+    def get_cache_models(self, request):
+        return self.cache_models
+
+    def get_cache_epoch(self, request):
+        """
+        Unix time at which the response last changed by the clock alone, or
+        None if it depends on the data only.
+        """
+        return None
+
+    def is_cacheable(self, request):
+        if request.method != "GET" or not self.cache_models:
+            return False
+        action_map = getattr(self, "action_map", None)
+        return action_map is None or action_map.get("get") in self.cached_actions
+
+    def get_response_cache_key(self, request, versions):
+        variant = f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}"
+        digest = hashlib.sha1(variant.encode()).hexdigest()
+        return f"response:{type(self).__name__}:{digest}:{'.'.join(str(version) for version in versions.values())}"
+
+    @staticmethod
+    def is_not_modified(request, etag, last_modified):
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        if if_none_match is not None:
+            # Weak comparison (RFC 9110 13.1.2), so compressed W/ variants match too.
+            tags = {tag.removeprefix("W/") for tag in parse_etags(if_none_match)}
+            return "*" in tags or etag in tags
+        if_modified_since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+        return if_modified_since is not None and last_modified <= if_modified_since
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        versions, last_modified = get_data_state(self.get_cache_models(request))
+        key = self.get_response_cache_key(request, versions)
+        changed = last_modified
+        epoch = self.get_cache_epoch(request)
+        if epoch is not None:
+            key = f"{key}:{epoch}"
+            changed = max(last_modified, epoch)
+        validators = {
+            "ETag": quote_etag(hashlib.sha1(key.encode()).hexdigest()),
+            "Last-Modified": http_date(changed),
+            "Cache-Control": "no-cache",
+        }
+        if self.is_not_modified(request, validators["ETag"], changed):
+            return HttpResponseNotModified(headers=validators)
+
+        cache = response_cache()
+        view_name = type(self).__name__
+        # Answers read from a replica that may lag are kept apart, and only
+        # served to requests that may read from a replica themselves.
+        replica_key = f"{key}:replica"
+        found = cache.get_many([key, replica_key] if may_read_replica() else [key])
+        cached = found.get(key) or found.get(replica_key)
+        if cached is not None:
+            metrics.record(view_name, hit=True)
+            content, headers = cached
+            response = HttpResponse(content, headers=headers)
+            response["X-Cache"] = "HIT"
+            return response
+
+        metrics.record(view_name, hit=False)
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            if replica_may_lag(last_modified):
+                # Possibly read before the replica caught up with `versions`:
+                # no validators, and cached only until the replica has caught up.
+                response["Cache-Control"] = "no-cache"
+                key, timeout = replica_key, routing_settings()["STICKY_SECONDS"]
+            else:
+                for header, value in validators.items():
+                    response[header] = value
+                timeout = DEFAULT_TIMEOUT
+            if hasattr(response, "render"):
+                response.render()
+            cache.set(key, (response.content, dict(response.items())), timeout=timeout)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class NameSearchMixin:
+    """
+    Name lookups served from the in-memory index in chelsea.search:
+    exact get_by_name, search-as-you-type, and batch name -> id resolution.
+    """
+    max_search_results = 50
+    max_resolve_names = 1000
+
+    @action(detail=False, methods=["get"])
+    def get_by_name(self, request):
+        """
+        Retrieve one row by name, ignoring case and accents.
+        Example: /api/players/get_by_name/?name=Eden Hazard
+        """
+        name = request.GET.get("name")
+        if not name:
+            return Response({"error": "Name parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        not_found = Response({"error": f"{model._meta.verbose_name.title()} not found."},
+                             status=status.HTTP_404_NOT_FOUND)
+        pk = name_index(model).resolve([name])[name]
+        if pk is None:
+            return not_found
+        try:
+            instance = self.get_queryset().get(pk=pk)
+        except model.DoesNotExist:
+            return not_found
+        return Response(self.get_serializer(instance).data)
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Autocomplete and typo-tolerant search.
+        Example: /api/players/search/?q=haz&limit=5
+        """
+        query = request.GET.get("q", "")
+        try:
+            limit = min(int(request.GET.get("limit", 10)), self.max_search_results)
+        except ValueError:
+            return Response({"error": "'limit' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        results = name_index(self.get_queryset().model).search(query, max(limit, 1))
+        return Response({"query": query, "results": results})
+
+    @action(detail=False, methods=["post"])
+    def resolve(self, request):
+        """
+        Resolve many names to ids in one call.
+        Body: {"names": ["Eden Hazard", "Didier Drogba", ...]}
+        """
+        names = request.data.get("names") if isinstance(request.data, dict) else None
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            return Response({"error": "'names' must be a list of strings."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(names) > self.max_resolve_names:
+            return Response({"error": f"At most {self.max_resolve_names} names per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        ids = name_index(self.get_queryset().model).resolve(names)
+        return Response({
+            "resolved": {name: pk for name, pk in ids.items() if pk is not None},
+            "unresolved": [name for name, pk in ids.items() if pk is None],
+        })
+
+
+class RankMixin:
+    """
+    Vote leaderboard position of one row, served from chelsea.rankings.
+    """
+    max_rank_neighbours = 25
+
+    @action(detail=True, methods=["get"])
+    def rank(self, request, pk=None):
+        """
+        Rank, vote count and the k rows either side of it.
+        Example: /api/players/12/rank/?k=2
+        """
+        try:
+            pk, k = int(pk), min(int(request.GET.get("k", 0)), self.max_rank_neighbours)
+        except ValueError:
+            return Response({"error": "'k' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        entry = rank_index(model).rank(pk, neighbours=max(k, 0))
+        if entry is None:
+            return Response({"error": f"{model._meta.verbose_name.title()} not found."},
+                            status=status.HTTP_404_NOT_FOUND)
+        return Response(entry)
+
+
+class BulkWriteMixin:
+    """
+    Batch create/update through `bulk_importer_class` (chelsea.importers):
+    one many=True validation, related names resolved in one query per model,
+    one bulk_create / bulk_update in a single transaction.
+    """
+    bulk_importer_class = None
+    max_bulk_rows = 1000
+
+    @action(detail=False, methods=["post", "patch"])
+    def bulk(self, request):
+        """
+        POST a JSON array of rows to create them, PATCH one (each row with
+        its "id") to update them. Invalid rows are reported by index and the
+        others written (207); with ?atomic=true any invalid row rejects all.
+        """
+        update = request.method == "PATCH"
+        atomic = request.query_params.get("atomic", "").lower() in ("1", "true", "yes")
+        importer = self.bulk_importer_class(records=request.data if isinstance(request.data, list) else None)
+        try:
+            ids, errors = importer.write(request.data, update=update, atomic=atomic, max_rows=self.max_bulk_rows)
+        except ValidationError as exc:
+            return Response({"error": exc.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not ids:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        body = {"updated" if update else "created": ids, "errors": errors}
+        if errors:
+            return Response(body, status=status.HTTP_207_MULTI_STATUS)
+        return Response(body, status=status.HTTP_200_OK if update else status.HTTP_201_CREATED)
+
+
+# Related rows a ViewSet can nest with ?expand=<name>: the Prefetch loading
+# them, the serializer class / excluded fields rendering each row, and the
+# extra models cached responses then depend on.
+Expansion = namedtuple("Expansion", "prefetch serializer_class exclude cache_models", defaults=((), ()))
+
+
+class SparseFieldsetMixin:
+    """
+    Sparse fieldsets for list/retrieve:
+
+    - ?fields=id,name keeps only those fields, ?exclude=vote_count drops some;
+      the query then selects only the columns the remaining fields read;
+    - ?expand=seasons nests related rows (see `expandable_fields`) loaded by
+      one prefetch query instead of a request per row.
+
+    Fields whose columns can't be worked out (a source of "*" or a property
+    missing from the serializer's Meta.computed_fields) disable the column
+    trimming, never the output trimming.
+    """
+    expandable_fields = {}
+    sparse_actions = ("list", "retrieve")
+
+    def _csv_param(self, name):
+        value = self.request.query_params.get(name, "")
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+    def get_sparse_fieldset(self):
+        """
+        (fields or None, exclude, expand) for this request; 400 on unknown names.
+        """
+        if getattr(self, "action", None) not in self.sparse_actions:
+            return None, (), ()
+        cached = getattr(self, "_sparse_fieldset", None)
+        if cached is not None:
+            return cached
+
+        fields, exclude, expand = self._csv_param("fields") or None, self._csv_param("exclude"), self._csv_param("expand")
+        unknown_expand = set(expand) - set(self.expandable_fields)
+        if unknown_expand:
+            raise ValidationError({"expand": f"Unknown: {', '.join(sorted(unknown_expand))}. "
+                                             f"Expandable: {', '.join(sorted(self.expandable_fields)) or 'none'}."})
+        available = set(self.get_serializer_class()().fields)
+        unknown = (set(fields or ()) | set(exclude)) - available - set(expand)
+        if unknown:
+            raise ValidationError({"fields": f"Unknown field(s): {', '.join(sorted(unknown))}."})
+
+        self._sparse_fieldset = fields, exclude, expand
+        return self._sparse_fieldset
+
+    def get_cache_models(self, request):
+        models = list(super().get_cache_models(request))
+        for name in request.GET.get("expand", "").split(","):
+            expansion = self.expandable_fields.get(name.strip())
+            if expansion is not None:
+                models.extend(model for model in expansion.cache_models if model not in models)
+        return models
+
+    def get_serializer(self, *args, **kwargs):
+        fields, exclude, expand = self.get_sparse_fieldset()
+        if fields is not None or exclude or expand:
+            kwargs.update(fields=fields, exclude=exclude, expand={
+                name: self.expandable_fields[name].serializer_class(
+                    many=True, read_only=True, exclude=self.expandable_fields[name].exclude
+                )
+                for name in expand
+            })
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields, exclude, expand = self.get_sparse_fieldset()
+        if expand:
+            queryset = queryset.prefetch_related(*(self.expandable_fields[name].prefetch for name in expand))
+        if fields is not None or exclude:
+            queryset = self.trim_columns(queryset)
+        return queryset
+
+    def _ordering_fields(self, queryset):
+        names = {queryset.model._meta.pk.name}
+        for backend in getattr(self, "filter_backends", ()):
+            if hasattr(backend, "get_ordering"):
+                names.update(field.lstrip("-") for field in backend().get_ordering(self.request, queryset, self) or ())
+        return names
+
+    def trim_columns(self, queryset):
+        """
+        queryset.only() the columns read by the selected serializer fields,
+        plus the pk and the ordering fields the paginator reads back.
+        """
+        serializer = self.get_serializer()
+        model = queryset.model
+        concrete = {field.name: field for field in model._meta.concrete_fields}
+        computed = getattr(getattr(serializer, "Meta", None), "computed_fields", {})
+
+        columns = self._ordering_fields(queryset)
+        for name, field in serializer.fields.items():
+            source = field.source
+            if name in self.expandable_fields:
+                continue
+            if source in concrete:
+                columns.add(source)
+            elif source in computed:
+                columns.update(computed[source])
+            else:
+                return queryset
+
+        related = queryset.query.select_related
+        if isinstance(related, dict):
+            kept = [name for name in related if name in columns]
+            queryset = queryset.select_related(None).select_related(*kept)
+        return queryset.only(*columns)
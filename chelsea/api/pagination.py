@@ -0,0 +1,110 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (seek) pagination.
+
+    Rows are sorted by the view's ordering (?ordering= through its
+    OrderingFilter, else `ordering`) with the primary key appended as a
+    tiebreaker, and the cursor holds the boundary row's value for each of
+    those columns. A page is `WHERE rate <= r AND (rate < r OR (rate = r
+    AND id < i)) ORDER BY rate DESC, id DESC LIMIT n` (see seek()): an OR
+    chain rather than a row-value comparison, since columns may sort in
+    different directions, plus a redundant bound on the first column that
+    the (rate, id) index can start its range scan from, so deep pages cost
+    about the same as the first one. Rows tied on a non-unique column are
+    each returned exactly once, and rows inserted while a client is paging
+    never shift or repeat results. Ordering columns must not be nullable.
+    Clients pick the page size with ?page_size=, capped at max_page_size.
+    """
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view))
+        pk = queryset.model._meta.pk.name
+        if not any(field.lstrip("-") in (pk, "pk") for field in ordering):
+            ordering.append(f"-{pk}" if ordering[0].startswith("-") else pk)
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = list(self.ordering)
+        if reverse:
+            ordering = [field[1:] if field.startswith("-") else f"-{field}" for field in ordering]
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(self.seek(ordering, self.parse_position(queryset.model, self.cursor.position)))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, more
+        else:
+            self.has_next, self.has_previous = more, self.cursor is not None
+        return self.page
+
+    @staticmethod
+    def seek(ordering, position):
+        """
+        Rows strictly after `position` in `ordering`:
+        a >= x AND ((a > x) OR (a = x AND b > y) OR ...)
+        """
+        condition, equal = Q(), {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        first = ordering[0]
+        bound = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": position[0]})
+        return bound & condition
+
+    def parse_position(self, model, position):
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError(position)
+            fields = [
+                model._meta.pk if name == "pk" else model._meta.get_field(name)
+                for name in (field.lstrip("-") for field in self.ordering)
+            ]
+            return [getattr(field, "output_field", field).to_python(value) for field, value in zip(fields, values)]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def position(self, instance):
+        values = [
+            instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            for name in (field.lstrip("-") for field in self.ordering)
+        ]
+        return json.dumps(values, cls=DjangoJSONEncoder, separators=(",", ":"))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.position(self.page[0])))
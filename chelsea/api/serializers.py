@@ -1,16 +1,62 @@
 from rest_framework import serializers
-from ..models import Player, Manager, Season, Competition
+from ..instrumentation import timed_serialization
+from ..models import Player, Manager, Season, Competition, PlayerCareerStats
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with timed_serialization():
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Count the time spent building `.data` (single or many=True) toward the
+    request's serializer time, see chelsea.instrumentation.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = cls.__dict__.get("Meta")
+        if meta is not None and not hasattr(meta, "list_serializer_class"):
+            meta.list_serializer_class = TimedListSerializer
+
+    @property
+    def data(self):
+        with timed_serialization():
+            return super().data
+
+
+class SparseFieldsMixin:
+    """
+    Optional `fields` / `exclude` kwargs keep only (or drop) the named fields,
+    and `expand` adds {name: serializer field} entries, see
+    chelsea.api.mixins.SparseFieldsetMixin. Model properties exposed as
+    fields declare the columns they read in Meta.computed_fields.
+    """
+
+    def __init__(self, *args, fields=None, exclude=(), expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, field in (expand or {}).items():
+            self.fields[name] = field
+        if fields is not None:
+            for name in set(self.fields) - set(fields) - set(expand or ()):
+                self.fields.pop(name)
+        for name in exclude:
+            self.fields.pop(name, None)
+
 
 # ==============================
 # 📌 MANAGER SERIALIZER
 # ==============================
-class ManagerSerializer(serializers.ModelSerializer):
+class ManagerSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     win_rate = serializers.ReadOnlyField()
-    vote_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Manager
         fields = '__all__'
+        computed_fields = {"win_rate": ("games_won", "games_drawn", "games_lost")}
 
     @staticmethod
     def validate_start_year(value):
@@ -18,9 +64,6 @@ class ManagerSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Start year must be realistic.")
         return value
 
-    def get_vote_count(self, obj):
-        return obj.votes.count()
-
     def validate(self, data):
         start_year = data.get("start_year")
         end_year = data.get("end_year")
@@ -32,16 +75,11 @@ class ManagerSerializer(serializers.ModelSerializer):
 # ==============================
 # 📌 PLAYER SERIALIZER
 # ==============================
-class PlayerSerializer(serializers.ModelSerializer):
-    vote_count = serializers.SerializerMethodField()
-
+class PlayerSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Player
         fields = '__all__'
 
-    def get_vote_count(self, obj):
-        return obj.votes.count()
-
     @staticmethod
     def validate_age(value):
         if not (15 <= value <= 50):
@@ -60,13 +98,19 @@ class PlayerSerializer(serializers.ModelSerializer):
         end_year = data.get("end_year")
         if end_year and end_year < start_year:
             raise serializers.ValidationError("End year cannot be before start year.")
+        for successful, attempted in (("take_ons_successful", "take_ons_attempted"),
+                                      ("aerial_duels_won", "aerial_duels_attempted")):
+            count = data.get(successful, getattr(self.instance, successful, 0))
+            out_of = data.get(attempted, getattr(self.instance, attempted, 0))
+            if count > out_of:
+                raise serializers.ValidationError({successful: f"Cannot exceed {attempted} ({out_of})."})
         return data
 
 
 # ==============================
 # 📌 SEASON SERIALIZER
 # ==============================
-class SeasonSerializer(serializers.ModelSerializer):
+class SeasonSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     player = serializers.StringRelatedField()
     manager = serializers.StringRelatedField()
     competition = serializers.SlugRelatedField(slug_field="name", queryset=Competition.objects.all())
@@ -83,10 +127,42 @@ class SeasonSerializer(serializers.ModelSerializer):
         return value
 
 
+class NamedRelatedField(serializers.RelatedField):
+    """
+    Read-only representation of a related row as {"id": ..., "name": ...}.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return {"id": value.pk, "name": value.name}
+
+
+class CompactSeasonSerializer(SeasonSerializer):
+    """
+    Season with ids next to the related names, so clients can join on ids.
+    Selected with ?compact=true.
+    """
+    player = NamedRelatedField()
+    manager = NamedRelatedField()
+    competition = NamedRelatedField()
+
+
 # ==============================
 # 📌 COMPETITION SERIALIZER
 # ==============================
-class CompetitionSerializer(serializers.ModelSerializer):
+class CompetitionSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Competition
         fields = '__all__'
+
+
+# ==============================
+# 📌 CAREER STATS SERIALIZER
+# ==============================
+class CareerStatsSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = PlayerCareerStats
+        exclude = ("id", "player", "competition")
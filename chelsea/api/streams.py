@@ -0,0 +1,65 @@
+"""
+Server-Sent Events stream of leaderboard changes.
+
+    GET /leaderboard/stream/
+
+Sends a "snapshot" event on connect, then "delta" events from the shared
+LeaderboardBroadcaster (see chelsea/live.py), with a comment line every
+HEARTBEAT seconds so proxies keep the connection open. Under ASGI the
+stream waits on the event loop instead of holding a thread per viewer.
+"""
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from ..live import AsyncSubscriber, Subscriber, get_broadcaster, live_settings
+
+HEARTBEAT = ": keep-alive\n\n"
+
+
+def _stream(broadcaster, heartbeat):
+    subscriber = Subscriber(broadcaster.queue_size)
+    try:
+        yield broadcaster.subscribe(subscriber)
+        while True:
+            yield subscriber.get(heartbeat) or HEARTBEAT
+    finally:
+        broadcaster.unsubscribe(subscriber)
+
+
+class _AsyncStream:
+    """
+    Async counterpart of _stream. A class rather than an async generator:
+    StreamingHttpResponse only registers a synchronous close(), which is how
+    the subscription is dropped when the client disconnects.
+    """
+
+    def __init__(self, broadcaster, heartbeat):
+        self.broadcaster = broadcaster
+        self.heartbeat = heartbeat
+        self.subscriber = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.subscriber is None:
+            self.subscriber = AsyncSubscriber(self.broadcaster.queue_size)
+            return await sync_to_async(self.broadcaster.subscribe)(self.subscriber)
+        return await self.subscriber.get(self.heartbeat) or HEARTBEAT
+
+    def close(self):
+        if self.subscriber is not None:
+            self.broadcaster.unsubscribe(self.subscriber)
+
+
+@require_GET
+def leaderboard_stream(request):
+    broadcaster = get_broadcaster()
+    heartbeat = live_settings()["HEARTBEAT"]
+    stream = _AsyncStream if isinstance(request, ASGIRequest) else _stream
+    response = StreamingHttpResponse(stream(broadcaster, heartbeat), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # stop nginx from buffering the stream
+    return response
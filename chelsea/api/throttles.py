@@ -0,0 +1,22 @@
+from rest_framework.throttling import BaseThrottle
+
+from ..ratelimit import get_rate_limiter
+
+
+class VoteRateThrottle(BaseThrottle):
+    """
+    chelsea.ratelimit limits for the vote views. DRF checks throttles in
+    APIView.initial(), so rejected votes get their 429 before the handler
+    runs a single query.
+    """
+    retry_after = None
+
+    def allow_request(self, request, view):
+        limiter = get_rate_limiter()
+        if limiter is None:
+            return True
+        self.retry_after = limiter.check(request.META, request.data)
+        return self.retry_after is None
+
+    def wait(self):
+        return self.retry_after
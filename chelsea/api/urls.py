@@ -1,9 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
+from .exports import export_seasons, export_votes
+from .streams import leaderboard_stream
 from .views import (
     api_home, PlayerViewSet, ManagerViewSet, SeasonViewSet, CompetitionViewSet,
     CastVoteView, BestPlayersView, TopVotedPlayerView, BestManagerView,
-    ComparePlayersView, CompareManagersView, VoteComparisonView, PlayerCompetitionStatsView, ManagerCompetitionStatsView
+    ComparePlayersView, CompareManagersView, VoteComparisonView, PlayerCompetitionStatsView, ManagerCompetitionStatsView,
+    CacheMetricsView, RequestMetricsView, TrendingView,
 )
 
 # Create a router and register the ViewSets
@@ -32,6 +36,16 @@ urlpatterns = [
     path('leaderboard/best-players/', BestPlayersView.as_view(), name='best-players'),
     path('leaderboard/top-voted-player/', TopVotedPlayerView.as_view(), name='top-voted-player'),
     path('leaderboard/best-manager/', BestManagerView.as_view(), name='best-manager'),
+    path('leaderboard/trending/', TrendingView.as_view(), name='trending'),
+    path('leaderboard/stream/', leaderboard_stream, name='leaderboard-stream'),
+
+    # Async (ASGI) voting & leaderboards
+    path('async/vote/', async_views.cast_vote, name='async-cast-vote'),
+    path('async/vote/comparison/', async_views.vote_comparison, name='async-vote-comparison'),
+    path('async/leaderboard/best-players/', async_views.best_players, name='async-best-players'),
+    path('async/leaderboard/top-voted-player/', async_views.top_voted_player, name='async-top-voted-player'),
+    path('async/leaderboard/best-manager/', async_views.best_manager, name='async-best-manager'),
+    path('async/leaderboard/trending/', async_views.trending, name='async-trending'),
 
     # Player & Manager Comparisons
     path("compare/players/", ComparePlayersView.as_view(), name="compare-players"),
@@ -40,4 +54,12 @@ urlpatterns = [
     # Retrieve Player & Manager Stats by Competition
     path("players/<int:player_id>/competition/<int:competition_id>/", PlayerCompetitionStatsView.as_view(), name="player-competition-stats"),
     path("managers/<int:manager_id>/competition/<int:competition_id>/", ManagerCompetitionStatsView.as_view(), name="manager-competition-stats"),
+
+    # Streaming exports (NDJSON / CSV)
+    path("export/seasons/", export_seasons, name="export-seasons"),
+    path("export/votes/", export_votes, name="export-votes"),
+
+    # Metrics
+    path("metrics/cache/", CacheMetricsView.as_view(), name="cache-metrics"),
+    path("metrics/requests/", RequestMetricsView.as_view(), name="request-metrics"),
 ]
@@ -1,56 +1,112 @@
-from django.db.models import Count
-from django.http import JsonResponse
-from rest_framework import viewsets, status
+from django.db.models import Prefetch
+from django.utils import timezone
+from rest_framework import filters, viewsets, status
+from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from rest_framework.decorators import action
 from rest_framework.views import APIView
 
-from ..models import Player, Manager, Season, Competition, Vote
-from .serializers import PlayerSerializer, ManagerSerializer, SeasonSerializer, CompetitionSerializer
+from ..aggregates import manager_stats, player_stats
+from ..cache import metrics as cache_metrics, name_scope, response_cache, vote_scope
+from ..instrumentation import get_request_metrics
+from ..lineups import DEFAULT_FORMATION, best_xi, normalize_formation
+from ..rollups import hour_bucket, parse_window, trending
+from ..models import Player, Manager, Season, Competition, PlayerCareerStats, VoteRollup
+from ..votes import record_vote
+from ..vote_buffer import get_vote_buffer
+from ..importers import PlayerImporter, SeasonImporter
+from .mixins import (
+    BulkWriteMixin, CachedResponseMixin, Expansion, NameSearchMixin, RankMixin, SparseFieldsetMixin,
+)
+from .throttles import VoteRateThrottle
+from .serializers import (
+    PlayerSerializer, ManagerSerializer, SeasonSerializer, CompactSeasonSerializer, CompetitionSerializer,
+    CareerStatsSerializer,
+)
 
 
 ### 📌 API Home ###
+@api_view(["GET"])
 def api_home(request, *args, **kwargs):
-    return JsonResponse({"message": "Welcome to Chelsea Tracker API!"})
+    return Response({"message": "Welcome to Chelsea Tracker API!"})
 
 
 ### 📌 Player ViewSet ###
-class PlayerViewSet(viewsets.ModelViewSet):
+class PlayerViewSet(NameSearchMixin, RankMixin, BulkWriteMixin, SparseFieldsetMixin, CachedResponseMixin,
+                    viewsets.ModelViewSet):
+    """
+    Filters: ?position=DEF, ?min_take_ons=N / ?min_aerial_duels=N (attempts).
+    Sorting: ?ordering=-aerial_duel_success_rate (see ordering_fields), served
+    by the (position, rate) indexes when combined with ?position=.
+    Batch writes: POST/PATCH /api/players/bulk/.
+    """
+    cache_models = (Player, vote_scope(Player))
+    bulk_importer_class = PlayerImporter
     queryset = Player.objects.all()
     serializer_class = PlayerSerializer
-
-    @action(detail=False, methods=['get'])
-    def get_by_name(self, request):
-        """
-        Retrieve a player by name.
-        Example: /api/players/get_by_name/?name=Eden Hazard
-        """
-        name = request.GET.get('name')
-        if not name:
-            return JsonResponse({"error": "Name parameter is required."}, status=400)
-
-        try:
-            player = Player.objects.get(name__iexact=name)  # Case-insensitive match
-            serializer = PlayerSerializer(player)
-            return JsonResponse(serializer.data, safe=False)
-        except Player.DoesNotExist:
-            return JsonResponse({"error": "Player not found."}, status=404)
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = [
+        "id", "name", "age", "start_year", "vote_count",
+        "take_on_success_rate", "aerial_duel_success_rate", "take_ons_attempted", "aerial_duels_attempted",
+    ]
+    ordering = ("id",)
+    expandable_fields = {
+        "seasons": Expansion(
+            Prefetch("seasons", queryset=Season.objects.select_related("manager", "competition").order_by("year", "id")),
+            CompactSeasonSerializer, exclude=("player",), cache_models=(Season, name_scope(Manager), Competition),
+        ),
+    }
+    attempt_filters = {"min_take_ons": "take_ons_attempted", "min_aerial_duels": "aerial_duels_attempted"}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != "list":
+            return queryset
+        params = self.request.query_params
+        if position := params.get("position"):
+            queryset = queryset.filter(position=position.upper())
+        for param, field in self.attempt_filters.items():
+            if params.get(param, "").isdigit():
+                queryset = queryset.filter(**{f"{field}__gte": int(params[param])})
+        return queryset
 
 
 ### 📌 Manager ViewSet ###
-class ManagerViewSet(viewsets.ModelViewSet):
+class ManagerViewSet(NameSearchMixin, RankMixin, SparseFieldsetMixin, CachedResponseMixin, viewsets.ModelViewSet):
+    cache_models = (Manager, vote_scope(Manager))
     queryset = Manager.objects.all()
     serializer_class = ManagerSerializer
+    expandable_fields = {
+        "seasons": Expansion(
+            Prefetch("seasons", queryset=Season.objects.select_related("player", "competition").order_by("year", "id")),
+            CompactSeasonSerializer, exclude=("manager",), cache_models=(Season, name_scope(Player), Competition),
+        ),
+    }
 
 
 ### 📌 Season ViewSet ###
-class SeasonViewSet(viewsets.ModelViewSet):
-    queryset = Season.objects.all()
+class SeasonViewSet(BulkWriteMixin, SparseFieldsetMixin, CachedResponseMixin, viewsets.ModelViewSet):
+    """
+    Batch writes: POST/PATCH /api/seasons/bulk/, with player, manager and
+    competition given by name.
+    """
+    cache_models = (Season, name_scope(Player), name_scope(Manager), Competition)
+    bulk_importer_class = SeasonImporter
+    queryset = Season.objects.select_related("player", "manager", "competition")
     serializer_class = SeasonSerializer
 
+    def get_serializer_class(self):
+        """
+        ?compact=true returns {"id", "name"} objects for player/manager/competition.
+        """
+        compact = self.request.query_params.get("compact", "").lower() in ("1", "true", "yes")
+        if compact and self.action in ("list", "retrieve"):
+            return CompactSeasonSerializer
+        return super().get_serializer_class()
+
 
 ### 📌 Competition ViewSet ###
-class CompetitionViewSet(viewsets.ModelViewSet):
+class CompetitionViewSet(SparseFieldsetMixin, CachedResponseMixin, viewsets.ModelViewSet):
+    cache_models = (Competition,)
     queryset = Competition.objects.all()
     serializer_class = CompetitionSerializer
 
@@ -61,7 +117,10 @@ class CompetitionViewSet(viewsets.ModelViewSet):
 class CastVoteView(APIView):
     """
     API to cast a vote for a player or manager.
+    With settings.VOTE_BUFFER enabled the vote is queued and written in a batch (202).
+    Rate limited per client and voted entity (settings.RATE_LIMIT, 429).
     """
+    throttle_classes = [VoteRateThrottle]
 
     def post(self, request, *args, **kwargs):
         player_id = request.data.get("player_id")
@@ -78,15 +137,13 @@ class CastVoteView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        buffer = get_vote_buffer()
         try:
-            if player_id:
-                player = Player.objects.get(id=player_id)
-                Vote.objects.create(player=player)
-
-            elif manager_id:
-                manager = Manager.objects.get(id=manager_id)
-                Vote.objects.create(manager=manager)
+            if buffer is not None:
+                buffer.submit(player_id=player_id, manager_id=manager_id)
+                return Response({"message": "Vote queued successfully!"}, status=status.HTTP_202_ACCEPTED)
 
+            record_vote(player_id=player_id, manager_id=manager_id)
         except (Player.DoesNotExist, Manager.DoesNotExist):
             return Response(
                 {"error": "Player or Manager not found."}, status=status.HTTP_404_NOT_FOUND
@@ -99,7 +156,9 @@ class VoteComparisonView(APIView):
     """
     API to cast a vote for a player comparison based on all-time stats.
     Only allows voting if both players play in the same position.
+    Rate limited like CastVoteView.
     """
+    throttle_classes = [VoteRateThrottle]
 
     def post(self, request, *args, **kwargs):
         player1_id = request.data.get("player1_id")
@@ -129,8 +188,7 @@ class VoteComparisonView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            voted_player = Player.objects.get(id=voted_player_id)
-            Vote.objects.create(player=voted_player)
+            record_vote(player_id=voted_player_id)
 
             return Response({"message": "Vote cast successfully!"}, status=status.HTTP_201_CREATED)
 
@@ -141,36 +199,46 @@ class VoteComparisonView(APIView):
 # ==============================
 # 🏆 LEADERBOARD & BEST PLAYER/MANAGER
 # ==============================
-class BestPlayersView(APIView):
+class BestPlayersView(CachedResponseMixin, APIView):
     """
-    Retrieve the best 11 players following a structured formation.
+    Retrieve the best 11 players for a formation.
+    Example: /leaderboard/best-players/?formation=3-4-3 or ?manager_id=4
+    (uses the manager's preferred formation; defaults to 4-3-3).
+    The formation used is returned in the X-Formation header.
     """
+    cache_models = (Player, vote_scope(Player), Manager)
 
     def get(self, request, *args, **kwargs):
-        POSITIONS = {
-            "Keeper": 1,  # 1 Goalkeeper
-            "Defense": 4,  # 4 Defenders
-            "Midfield": 3,  # 3 Midfielders
-            "Forward": 3  # 3 Attackers
-        }
+        formation = request.GET.get("formation")
+        manager_id = request.GET.get("manager_id")
 
-        players = Player.objects.annotate(vote_count=Count("votes")).order_by("-vote_count")
-        best_11 = []
+        if not formation and manager_id:
+            if not manager_id.isdigit():
+                return Response({"error": "'manager_id' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                formation = Manager.objects.values_list("preferred_formation", flat=True).get(id=manager_id)
+            except Manager.DoesNotExist:
+                return Response({"error": "Manager not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        for category, limit in POSITIONS.items():
-            best_11.extend(players.filter(position=category)[:limit])
+        try:
+            formation = normalize_formation(formation or DEFAULT_FORMATION)
+            best_11 = best_xi(formation)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
         serializer = PlayerSerializer(best_11, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # The body stays the plain list of players; the formation used goes in a header.
+        return Response(serializer.data, status=status.HTTP_200_OK, headers={"X-Formation": formation})
 
 
-class TopVotedPlayerView(APIView):
+class TopVotedPlayerView(CachedResponseMixin, APIView):
     """
     Retrieve the player with the most votes.
     """
+    cache_models = (Player, vote_scope(Player))
 
     def get(self, request):
-        top_player = Player.objects.annotate(vote_count=Count('votes')).order_by('-vote_count').first()
+        top_player = Player.objects.order_by('-vote_count').first()
         if not top_player:
             return Response({"error": "No votes registered yet."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -178,13 +246,14 @@ class TopVotedPlayerView(APIView):
         return Response(serializer.data)
 
 
-class BestManagerView(APIView):
+class BestManagerView(CachedResponseMixin, APIView):
     """
     Retrieve the manager with the most votes.
     """
+    cache_models = (Manager, vote_scope(Manager))
 
     def get(self, request, *args, **kwargs):
-        best_manager = Manager.objects.annotate(vote_count=Count("votes")).order_by("-vote_count").first()
+        best_manager = Manager.objects.order_by("-vote_count").first()
         if not best_manager:
             return Response({"error": "No votes found for managers."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -192,43 +261,159 @@ class BestManagerView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class TrendingView(CachedResponseMixin, APIView):
+    """
+    Most voted players or managers over a sliding window, summed from the
+    hourly/daily vote rollups.
+    Example: /leaderboard/trending/?type=manager&window=7d&limit=5
+    (window: 1h, 24h, 7d or any "<n>h" / "<n>d"; defaults to player, 24h, 10).
+    """
+    cache_models = (VoteRollup, name_scope(Player), name_scope(Manager))
+
+    def get_cache_epoch(self, request):
+        # The window slides with the clock, one hourly bucket at a time.
+        return int(hour_bucket(timezone.now()).timestamp())
+
+    def get(self, request, *args, **kwargs):
+        kind = request.GET.get("type", "player")
+        if kind not in ("player", "manager"):
+            return Response({"error": "type must be 'player' or 'manager'."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            window_param = request.GET.get("window", "24h")
+            window = parse_window(window_param)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        limit = request.GET.get("limit", "10")
+        if not limit.isdigit() or int(limit) < 1:
+            return Response({"error": "limit must be a positive integer."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(int(limit), 100)
+
+        return Response({
+            "type": kind,
+            "window": window_param,
+            "results": trending(kind, window, limit=limit),
+        }, status=status.HTTP_200_OK)
+
+
 # ==============================
 # ⚖️ PLAYER & MANAGER COMPARISON
 # ==============================
-class ComparePlayersView(APIView):
+MAX_COMPARED = 25
+
+
+def parse_comparison_params(request):
+    """
+    Parse ?ids=1,2,3 (or repeated ?ids=) plus the optional competition_id,
+    year_from and year_to filters. Raises ValueError on bad input.
+    """
+    raw = ",".join(request.GET.getlist("ids"))
+    try:
+        ids = list(dict.fromkeys(int(pk) for pk in raw.split(",") if pk.strip()))
+    except ValueError:
+        raise ValueError("'ids' must be comma-separated integers.")
+    if not ids or len(ids) > MAX_COMPARED:
+        raise ValueError(f"ids must list between 1 and {MAX_COMPARED} ids.")
+
+    def optional_int(name):
+        value = request.GET.get(name)
+        try:
+            return int(value) if value else None
+        except ValueError:
+            raise ValueError(f"'{name}' must be an integer.")
+
+    return ids, {
+        "competition_id": optional_int("competition_id"),
+        "year_from": optional_int("year_from"),
+        "year_to": optional_int("year_to"),
+    }
+
+
+class ComparePlayersView(CachedResponseMixin, APIView):
     """
-    Compare two players based on their stats in a specific competition.
+    Compare two players' career stats, in one competition or across all of them.
+    Example: /compare/players/?player1_id=1&player2_id=2&competition_id=3
+
+    With ?ids=1,2,3 any number of players (up to MAX_COMPARED) are compared
+    side by side, optionally within a season range (&year_from=2015&year_to=2020).
     """
+    cache_models = (Player, vote_scope(Player), Competition, Season, PlayerCareerStats)
 
     def get(self, request, *args, **kwargs):
-        player1_id = request.GET.get("player1_id")
-        player2_id = request.GET.get("player2_id")
-        competition_id = request.GET.get("competition_id")
+        if "ids" in request.GET:
+            return self.compare_many(request)
 
-        if not player1_id or not player2_id or not competition_id:
-            return Response({"error": "player1_id, player2_id, and competition_id are required."},
+        try:
+            player_ids = [int(request.GET["player1_id"]), int(request.GET["player2_id"])]
+            competition_id = int(request.GET["competition_id"]) if request.GET.get("competition_id") else None
+        except (KeyError, ValueError):
+            return Response({"error": "player1_id and player2_id are required; competition_id is optional."},
                             status=status.HTTP_400_BAD_REQUEST)
 
+        stats = {
+            row.player_id: row
+            for row in PlayerCareerStats.objects.select_related("player", "competition")
+            .filter(player_id__in=player_ids, competition_id=competition_id)
+        }
+
+        # Players without seasons in the competition have no aggregate row.
+        missing = [pk for pk in player_ids if pk not in stats]
+        if missing:
+            players = Player.objects.in_bulk(missing)
+            if len(players) < len(set(missing)):
+                return Response({"error": "Player or competition not found."}, status=status.HTTP_404_NOT_FOUND)
+            for pk, player in players.items():
+                stats[pk] = PlayerCareerStats(player=player, competition_id=competition_id)
+
+        competition = None
+        if competition_id is not None:
+            competition = next((row.competition for row in stats.values() if row.pk), None)
+            if competition is None and not Competition.objects.filter(id=competition_id).exists():
+                return Response({"error": "Player or competition not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        data = {"competition": competition.name if competition else None}
+        for label, pk in zip(("player1", "player2"), player_ids):
+            data[label] = {
+                **PlayerSerializer(stats[pk].player).data,
+                "stats": CareerStatsSerializer(stats[pk]).data,
+            }
+        return Response(data, status=status.HTTP_200_OK)
+
+    def compare_many(self, request):
+        """
+        Two queries regardless of the number of players: the player rows
+        (which carry the vote counters) and one grouped stats query.
+        """
         try:
-            player1 = Player.objects.get(id=player1_id)
-            player2 = Player.objects.get(id=player2_id)
-            competition = Competition.objects.get(id=competition_id)
+            ids, filters = parse_comparison_params(request)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-            return Response({
-                "player1": PlayerSerializer(player1).data,
-                "player2": PlayerSerializer(player2).data
-            }, status=status.HTTP_200_OK)
+        players = Player.objects.in_bulk(ids)
+        if len(players) < len(ids):
+            return Response({"error": "One or more players not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        except (Player.DoesNotExist, Competition.DoesNotExist):
-            return Response({"error": "Player or competition not found."}, status=status.HTTP_404_NOT_FOUND)
+        stats = player_stats(ids, **filters)
+        return Response({
+            **filters,
+            "players": [
+                {**PlayerSerializer(players[pk]).data, "stats": CareerStatsSerializer(stats[pk]).data}
+                for pk in ids
+            ],
+        }, status=status.HTTP_200_OK)
 
 
-class CompareManagersView(APIView):
+class CompareManagersView(CachedResponseMixin, APIView):
     """
     Compare two managers.
+    With ?ids=1,2,3 any number of managers are compared side by side, including
+    squad totals from their seasons (&competition_id=, &year_from=, &year_to=).
     """
+    cache_models = (Manager, vote_scope(Manager), Season)
 
     def get(self, request, *args, **kwargs):
+        if "ids" in request.GET:
+            return self.compare_many(request)
+
         manager1_id = request.GET.get("manager1_id")
         manager2_id = request.GET.get("manager2_id")
 
@@ -247,65 +432,98 @@ class CompareManagersView(APIView):
         except Manager.DoesNotExist:
             return Response({"error": "One or both managers not found."}, status=status.HTTP_404_NOT_FOUND)
 
+    def compare_many(self, request):
+        try:
+            ids, filters = parse_comparison_params(request)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        managers = Manager.objects.in_bulk(ids)
+        if len(managers) < len(ids):
+            return Response({"error": "One or more managers not found."}, status=status.HTTP_404_NOT_FOUND)
 
-class PlayerCompetitionStatsView(APIView):
+        stats = manager_stats(ids, **filters)
+        return Response({
+            **filters,
+            "managers": [{**ManagerSerializer(managers[pk]).data, "stats": stats[pk]} for pk in ids],
+        }, status=status.HTTP_200_OK)
+
+
+class PlayerCompetitionStatsView(CachedResponseMixin, APIView):
     """
-    Retrieve player stats for a specific competition.
+    Retrieve player career stats for a specific competition.
     """
+    cache_models = (Player, vote_scope(Player), Competition, PlayerCareerStats)
 
     def get(self, request, player_id, competition_id, *args, **kwargs):
         try:
-            player = Player.objects.get(id=player_id)
-            competition = Competition.objects.get(id=competition_id)
-            stats = Season.objects.filter(player=player, competition=competition).first()
-
-            if not stats:
-                return Response({"error": "No stats found for this player in this competition."},
-                                status=status.HTTP_404_NOT_FOUND)
-
-            return Response({
-                "player": PlayerSerializer(player).data,
-                "competition": competition.name
-            }, status=status.HTTP_200_OK)
+            stats = PlayerCareerStats.objects.select_related("player", "competition").get(
+                player_id=player_id, competition_id=competition_id
+            )
+        except PlayerCareerStats.DoesNotExist:
+            if not (Player.objects.filter(id=player_id).exists()
+                    and Competition.objects.filter(id=competition_id).exists()):
+                return Response({"error": "Player or Competition not found."}, status=status.HTTP_404_NOT_FOUND)
+            return Response({"error": "No stats found for this player in this competition."},
+                            status=status.HTTP_404_NOT_FOUND)
 
-        except (Player.DoesNotExist, Competition.DoesNotExist):
-            return Response({"error": "Player or Competition not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            "player": PlayerSerializer(stats.player).data,
+            "competition": stats.competition.name,
+            "stats": CareerStatsSerializer(stats).data,
+        }, status=status.HTTP_200_OK)
 
 
-class ManagerCompetitionStatsView(APIView):
+class ManagerCompetitionStatsView(CachedResponseMixin, APIView):
     """
-    Retrieve manager stats for a specific competition.
+    Retrieve squad totals from the seasons a manager oversaw in a competition.
     Example: GET /managers/1/competition/5/
     """
+    cache_models = (Manager, vote_scope(Manager), Competition, Season)
 
     def get(self, request, manager_id, competition_id, *args, **kwargs):
         try:
             manager = Manager.objects.get(id=manager_id)
             competition = Competition.objects.get(id=competition_id)
-
-            # Fetch the stats for the manager in the specified competition
-            stats = Season.objects.filter(manager=manager, competition=competition).first()
-
-            if not stats:
-                return Response(
-                    {"error": "No stats found for this manager in this competition."},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-
-            return Response({
-                "manager": ManagerSerializer(manager).data,
-                "competition": competition.name,
-                "stats": {
-                    "matches": stats.matches,
-                    "wins": stats.wins,
-                    "draws": stats.draws,
-                    "losses": stats.losses,
-                    "points": stats.points
-                }
-            }, status=status.HTTP_200_OK)
-
         except (Manager.DoesNotExist, Competition.DoesNotExist):
             return Response(
                 {"error": "Manager or Competition not found."},
                 status=status.HTTP_404_NOT_FOUND
             )
+
+        stats = manager_stats([manager.id], competition_id=competition.id)[manager.id]
+        if not stats["seasons"]:
+            return Response(
+                {"error": "No stats found for this manager in this competition."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response({
+            "manager": ManagerSerializer(manager).data,
+            "competition": competition.name,
+            "stats": stats,
+        }, status=status.HTTP_200_OK)
+
+
+# ==============================
+# 📈 METRICS
+# ==============================
+class CacheMetricsView(APIView):
+    """
+    Response cache hit/miss counters for this process.
+    """
+
+    def get(self, request, *args, **kwargs):
+        data = cache_metrics.snapshot()
+        data["backend"] = type(response_cache()).__name__
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class RequestMetricsView(APIView):
+    """
+    Per-endpoint latency, SQL and serializer histograms for this process
+    over the last REQUEST_METRICS["WINDOW"] seconds.
+    """
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_request_metrics().snapshot(), status=status.HTTP_200_OK)
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class ChelseaConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'chelsea'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import signals  # noqa: F401
+        from .instrumentation import install_execute_wrapper
+
+        connection_created.connect(install_execute_wrapper, dispatch_uid="chelsea-request-metrics")
@@ -0,0 +1,299 @@
+"""
+Endpoint benchmark suite.
+
+Every named route in chelsea/api/urls.py has a request recipe in ENDPOINTS,
+filled in from a sample of the current data (the most voted player, one of
+their seasons' competitions, ...). Each endpoint is measured in three
+passes so the instrumentation doesn't skew the timings:
+
+- one request with a query-counting execute wrapper for the SQL count,
+- one request under tracemalloc for the peak Python memory,
+- `requests` timed requests (optionally concurrent) for throughput and
+  latency percentiles.
+
+GET requests get a unique cache-busting parameter unless cache="warm", so
+by default the numbers measure the views, not the response cache.
+"""
+import json
+import platform
+import resource
+import subprocess
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import django
+from django.db import connection
+from django.test import Client
+from django.urls import URLPattern, URLResolver, reverse
+
+from .api import urls as api_urls
+from .models import Player, Manager, Season, Competition, Vote
+
+Request = namedtuple("Request", "method kwargs params data first_chunk", defaults=(None, None, None, False))
+
+
+def get(kwargs=None, params=None, first_chunk=False):
+    return Request("get", kwargs, params, None, first_chunk)
+
+
+def post(data):
+    return Request("post", None, None, data)
+
+
+def patch(data):
+    return Request("patch", None, None, data)
+
+
+# Route name -> function of the data sample returning the Request to send.
+ENDPOINTS = {
+    "api_home": lambda s: get(),
+    "api-root": lambda s: get(),
+    "player-list": lambda s: get(params={"page_size": 50}),
+    "player-detail": lambda s: get({"pk": s["player"]}),
+    "player-get-by-name": lambda s: get(params={"name": s["player_name"]}),
+    "get-player-by-name": lambda s: get(params={"name": s["player_name"]}),
+    "player-search": lambda s: get(params={"q": s["player_name"][:4]}),
+    "player-resolve": lambda s: post({"names": s["player_names"]}),
+    "player-rank": lambda s: get({"pk": s["player"]}, params={"k": 5}),
+    "player-bulk": lambda s: patch([{"id": s["player"], "age": s["player_age"]}]),
+    "manager-list": lambda s: get(params={"page_size": 50}),
+    "manager-detail": lambda s: get({"pk": s["manager"]}),
+    "manager-get-by-name": lambda s: get(params={"name": s["manager_name"]}),
+    "get-manager-by-name": lambda s: get(params={"name": s["manager_name"]}),
+    "manager-search": lambda s: get(params={"q": s["manager_name"][:4]}),
+    "manager-resolve": lambda s: post({"names": s["manager_names"]}),
+    "manager-rank": lambda s: get({"pk": s["manager"]}, params={"k": 5}),
+    "season-list": lambda s: get(params={"page_size": 50}),
+    "season-detail": lambda s: get({"pk": s["season"]}),
+    "season-bulk": lambda s: patch([{"id": s["season"], "goals": s["season_goals"]}]),
+    "competition-list": lambda s: get(),
+    "competition-detail": lambda s: get({"pk": s["competition"]}),
+    "cast-vote": lambda s: post({"player_id": s["player"]}),
+    "vote-comparison": lambda s: post(
+        {"player1_id": s["player"], "player2_id": s["player2"], "vote_for": s["player2"]}
+    ),
+    "best-players": lambda s: get(params={"manager_id": s["manager"]}),
+    "top-voted-player": lambda s: get(),
+    "best-manager": lambda s: get(),
+    "trending": lambda s: get(params={"window": "7d"}),
+    "leaderboard-stream": lambda s: get(first_chunk=True),
+    "async-cast-vote": lambda s: post({"player_id": s["player"]}),
+    "async-vote-comparison": lambda s: post(
+        {"player1_id": s["player"], "player2_id": s["player2"], "vote_for": s["player2"]}
+    ),
+    "async-best-players": lambda s: get(params={"manager_id": s["manager"]}),
+    "async-top-voted-player": lambda s: get(),
+    "async-best-manager": lambda s: get(),
+    "async-trending": lambda s: get(params={"window": "7d"}),
+    "compare-players": lambda s: get(params={"ids": ",".join(map(str, s["players"][:10]))}),
+    "compare-managers": lambda s: get(params={"ids": ",".join(map(str, s["managers"][:10]))}),
+    "player-competition-stats": lambda s: get({"player_id": s["player"], "competition_id": s["competition"]}),
+    "manager-competition-stats": lambda s: get({"manager_id": s["manager"], "competition_id": s["competition"]}),
+    "export-seasons": lambda s: get(params={"player": s["player"], "format": "csv"}),
+    "export-votes": lambda s: get(params={"player": s["player"], "year_from": s["year"]}),
+    "cache-metrics": lambda s: get(),
+    "request-metrics": lambda s: get(),
+}
+
+
+def route_names(patterns=None):
+    """
+    Named routes of chelsea/api/urls.py in declaration order, router included.
+    """
+    names = []
+    for pattern in api_urls.urlpatterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            names.extend(route_names(pattern.url_patterns))
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.append(pattern.name)
+    return list(dict.fromkeys(names))
+
+
+def data_sample():
+    """
+    Ids and names the request recipes are filled from. Raises ValueError if
+    the database lacks the rows to build them.
+    """
+    season = Season.objects.select_related("player").order_by("-player__vote_count", "id").first()
+    manager = Season.objects.filter(manager__isnull=False).values_list("manager_id", flat=True).first()
+    if season is None or manager is None:
+        raise ValueError("The benchmark needs at least one season with a manager; run seed_synthetic first.")
+
+    player = season.player
+    player2 = (Player.objects.filter(position=player.position).exclude(pk=player.pk)
+               .values_list("pk", flat=True).first())
+    players = list(Player.objects.order_by("-vote_count", "id").values_list("pk", "name")[:500])
+    managers = list(Manager.objects.order_by("-vote_count", "id").values_list("pk", "name")[:500])
+    return {
+        "player": player.pk,
+        "player2": player2 or player.pk,
+        "player_name": player.name,
+        "player_age": player.age,
+        "players": [pk for pk, _ in players],
+        "player_names": [name for _, name in players],
+        "manager": manager,
+        "manager_name": Manager.objects.values_list("name", flat=True).get(pk=manager),
+        "managers": [pk for pk, _ in managers],
+        "manager_names": [name for _, name in managers],
+        "season": season.pk,
+        "season_goals": season.goals,
+        "competition": season.competition_id,
+        "year": datetime.now(timezone.utc).year,
+    }
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class EndpointBenchmark:
+    def __init__(self, name, request, requests=50, concurrency=1, cache="cold"):
+        self.name = name
+        self.request = request
+        self.path = reverse(name, kwargs=request.kwargs)
+        self.requests = requests
+        self.concurrency = concurrency
+        self.bust_cache = cache == "cold" and request.method == "get"
+        self._local = threading.local()
+        self._counter = 0
+        self._counter_lock = threading.Lock()
+
+    def call(self):
+        """
+        Send the request, read the whole body, return the status code.
+        """
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = Client(raise_request_exception=False)
+
+        if self.request.method in ("post", "patch"):
+            response = getattr(client, self.request.method)(
+                self.path, json.dumps(self.request.data), content_type="application/json"
+            )
+        else:
+            params = dict(self.request.params or {})
+            if self.bust_cache:
+                with self._counter_lock:
+                    self._counter += 1
+                    params["_bench"] = self._counter
+            response = client.get(self.path, params)
+
+        if response.streaming:
+            content = iter(response.streaming_content)
+            if self.request.first_chunk:
+                next(content, None)
+            else:
+                for _ in content:
+                    pass
+        response.close()
+        return response.status_code
+
+    def _timed(self, _):
+        started = time.perf_counter()
+        status_code = self.call()
+        return time.perf_counter() - started, status_code
+
+    def run(self):
+        status_code = self.call()  # warm-up
+
+        queries = []
+        with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+            self.call()
+
+        tracemalloc.start()
+        try:
+            self.call()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        started = time.perf_counter()
+        if self.concurrency > 1:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                results = list(pool.map(self._timed, range(self.requests)))
+        else:
+            results = [self._timed(i) for i in range(self.requests)]
+        wall = time.perf_counter() - started
+
+        latencies = sorted(latency for latency, _ in results)
+        return {
+            "method": self.request.method.upper(),
+            "path": self.path,
+            "status": status_code,
+            "errors": sum(code >= 400 for _, code in results),
+            "requests": self.requests,
+            "throughput_rps": round(self.requests / wall, 1),
+            "latency_ms": {
+                f"p{pct}": round(percentile(latencies, pct) * 1000, 2) for pct in (50, 90, 95, 99)
+            } | {"max": round(latencies[-1] * 1000, 2)},
+            "sql_queries": len(queries),
+            "peak_memory_kb": round(peak / 1024, 1),
+        }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(requests=50, concurrency=1, cache="cold", only=None, log=None):
+    """
+    Benchmark every route (or those in `only`) and return the report dict.
+    """
+    log = log or (lambda message: None)
+    sample = data_sample()
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "database": {"vendor": connection.vendor, "name": str(connection.settings_dict["NAME"])},
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "options": {"requests": requests, "concurrency": concurrency, "cache": cache},
+            "rows": {model.__name__: model.objects.count() for model in (Player, Manager, Season, Competition, Vote)},
+        },
+        "endpoints": {},
+        "skipped": {},
+    }
+
+    for name in route_names():
+        if only and name not in only:
+            continue
+        if name not in ENDPOINTS:
+            report["skipped"][name] = "no request recipe in chelsea.benchmark.ENDPOINTS"
+            continue
+        result = EndpointBenchmark(name, ENDPOINTS[name](sample), requests, concurrency, cache).run()
+        report["endpoints"][name] = result
+        log(f"{name:<28}{result['status']:>4}{result['throughput_rps']:>10,.1f} req/s"
+            f"{result['latency_ms']['p99']:>10.1f} ms p99{result['sql_queries']:>5} queries"
+            f"{result['peak_memory_kb']:>10,.0f} KB")
+
+    report["meta"]["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return report
+
+
+def compare_reports(before, after):
+    """
+    One line per endpoint present in both reports: throughput and p99 change.
+    """
+    lines = []
+    for name, new in after["endpoints"].items():
+        old = before["endpoints"].get(name)
+        if old is None:
+            continue
+        rps = (new["throughput_rps"] - old["throughput_rps"]) / old["throughput_rps"] * 100 if old["throughput_rps"] else 0
+        p99_old, p99_new = old["latency_ms"]["p99"], new["latency_ms"]["p99"]
+        lines.append(
+            f"{name:<28}{old['throughput_rps']:>9,.1f} -> {new['throughput_rps']:>9,.1f} req/s ({rps:+.0f}%)"
+            f"{p99_old:>9.1f} -> {p99_new:>8.1f} ms p99"
+            f"{old['sql_queries']:>4} -> {new['sql_queries']} queries"
+        )
+    return lines
@@ -0,0 +1,322 @@
+"""
+Response cache plumbing shared by the API views.
+
+Cached responses live in the "responses" alias of settings.CACHES, which can
+be Django's LocMemCache (in-process LRU with TTL and MAX_ENTRIES), Django's
+RedisCache, or LocalRedisCache below: the RedisCache code path backed by an
+in-process stand-in for redis-py, so the Redis wiring is testable offline.
+
+Keys embed a version counter per model the response depends on. Writes bump
+the counters (see chelsea.signals), so stale entries are simply never read
+again and age out through the TTL/LRU instead of being deleted. Each bump
+also records the time of the write, which the views send as Last-Modified.
+Votes only move the vote_count columns, so they bump a separate counter,
+vote_scope(model), and responses that show names but no vote counts depend
+on name_scope(model) instead of the whole model.
+
+The counters live in the same alias as the responses, so they are only as
+shared as the backend. With LocMemCache (the default) each worker process
+has its own: a write bumps the counters of the worker that handled it, and
+the other workers keep serving their cached responses until the TTL
+expires. Deployments running more than one worker should set
+RESPONSE_CACHE_BACKEND=redis, so that every worker sees every bump.
+"""
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache, RedisCacheClient, RedisSerializer
+
+RESPONSE_CACHE_ALIAS = "responses"
+VERSION_KEY = "version:{}"
+MODIFIED_KEY = "modified:{}"
+
+
+def response_cache():
+    return caches[RESPONSE_CACHE_ALIAS]
+
+
+# ==============================
+# 🔢 PER-MODEL DATA VERSIONS
+# ==============================
+def vote_scope(model):
+    """
+    Version scope of the model's vote counters, bumped by every committed
+    vote in place of the model's own version.
+    """
+    return f"{model._meta.label_lower}.votes"
+
+
+def name_scope(model):
+    """
+    Version scope of the model's names, bumped by row writes only (rows
+    created, edited or deleted), never by votes.
+    """
+    return f"{model._meta.label_lower}.names"
+
+
+def _label(scope):
+    # A scope is a model class or one of the strings built above.
+    return scope if isinstance(scope, str) else scope._meta.label_lower
+
+
+def _version_key(model):
+    return VERSION_KEY.format(_label(model))
+
+
+def _modified_key(model):
+    return MODIFIED_KEY.format(_label(model))
+
+
+def _initial_version():
+    # Seeding from the clock means an evicted counter never restarts at a
+    # value that older cache entries were stored under.
+    return time.time_ns() // 1000
+
+
+def get_versions(models):
+    """
+    Return {model: version} for the given models in one cache round trip.
+    """
+    cache = response_cache()
+    keys = {_version_key(model): model for model in models}
+    found = cache.get_many(keys)
+    versions = {}
+    for key, model in keys.items():
+        if key not in found:
+            cache.add(key, _initial_version(), timeout=None)
+            found[key] = cache.get(key)
+        versions[model] = found[key]
+    return versions
+
+
+def get_data_state(models):
+    """
+    Return ({model: version}, last write time as a Unix timestamp) for the
+    given models in one cache round trip. A model with no recorded write
+    time (never written, or evicted) counts as written now.
+    """
+    cache = response_cache()
+    version_keys = {_version_key(model): model for model in models}
+    modified_keys = [_modified_key(model) for model in models]
+    found = cache.get_many([*version_keys, *modified_keys])
+
+    versions = {}
+    for key, model in version_keys.items():
+        if key not in found:
+            cache.add(key, _initial_version(), timeout=None)
+            found[key] = cache.get(key)
+        versions[model] = found[key]
+
+    last_modified = 0
+    for key in modified_keys:
+        if key not in found:
+            cache.add(key, int(time.time()), timeout=None)
+            found[key] = cache.get(key) or int(time.time())
+        last_modified = max(last_modified, found[key])
+    return versions, last_modified
+
+
+def bump_version(*models):
+    """
+    Invalidate every cached response that depends on one of the models
+    (model classes or the scopes above). Returns {model: new version}.
+    """
+    cache = response_cache()
+    versions = {}
+    now = int(time.time())
+    for model in models:
+        key = _version_key(model)
+        try:
+            versions[model] = cache.incr(key)
+        except ValueError:
+            cache.add(key, _initial_version(), timeout=None)
+            versions[model] = cache.get(key)
+    cache.set_many({_modified_key(model): now for model in models}, timeout=None)
+    return versions
+
+
+# ==============================
+# 🔤 PER-MODEL NAME VERSIONS
+# ==============================
+def get_name_version(model):
+    """
+    Return the version of the model's names, which the in-memory name
+    indexes (chelsea.search) are keyed on.
+    """
+    scope = name_scope(model)
+    return get_versions([scope])[scope]
+
+
+def bump_name_version(*models):
+    """
+    Mark the models' names as changed (rows created, renamed or deleted).
+    """
+    bump_version(*(name_scope(model) for model in models))
+
+
+# ==============================
+# 📈 HIT / MISS METRICS
+# ==============================
+class CacheMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def record(self, view_name, hit):
+        with self._lock:
+            (self.hits if hit else self.misses)[view_name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            views = sorted(set(self.hits) | set(self.misses))
+            hits, misses = sum(self.hits.values()), sum(self.misses.values())
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+                "views": {
+                    name: {"hits": self.hits[name], "misses": self.misses[name]} for name in views
+                },
+            }
+
+    def reset(self):
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+
+
+metrics = CacheMetrics()
+
+
+# ==============================
+# 🧪 LOCAL REDIS STAND-IN
+# ==============================
+class LocalRedis:
+    """
+    Thread-safe in-process implementation of the redis-py commands used by
+    Django's RedisCacheClient. Values are stored exactly as a real server
+    would return them: ints as ints, everything else as bytes.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data = {}
+        self._expires = {}
+
+    @classmethod
+    def shared(cls, name):
+        with cls._instances_lock:
+            return cls._instances.setdefault(name, cls())
+
+    def _alive(self, key):
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def get(self, key):
+        with self._lock:
+            return self._data[key] if self._alive(key) else None
+
+    def mget(self, keys):
+        with self._lock:
+            return [self._data[key] if self._alive(key) else None for key in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        with self._lock:
+            if nx and self._alive(key):
+                return None
+            self._data[key] = value
+            self._expires.pop(key, None)
+            if ex is not None:
+                self._expires[key] = time.monotonic() + ex
+            return True
+
+    def mset(self, mapping):
+        for key, value in mapping.items():
+            self.set(key, value)
+        return True
+
+    def exists(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._alive(key))
+
+    def delete(self, *keys):
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self._alive(key):
+                    removed += 1
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
+            return removed
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            value = int(self._data[key]) + amount if self._alive(key) else amount
+            self._data[key] = value
+            return value
+
+    def expire(self, key, seconds):
+        with self._lock:
+            if not self._alive(key):
+                return False
+            self._expires[key] = time.monotonic() + seconds
+            return True
+
+    def persist(self, key):
+        with self._lock:
+            return self._expires.pop(key, None) is not None and self._alive(key)
+
+    def flushdb(self):
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            return True
+
+    def pipeline(self):
+        return _LocalPipeline(self)
+
+
+class _LocalPipeline:
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        with self._client._lock:
+            results = [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in self._commands]
+        self._commands = []
+        return results
+
+
+class LocalRedisCacheClient(RedisCacheClient):
+    def __init__(self, servers, serializer=None, **options):
+        self._servers = servers
+        self._serializer = serializer or RedisSerializer()
+
+    def get_client(self, key=None, *, write=False):
+        return LocalRedis.shared(self._servers[0])
+
+
+class LocalRedisCache(RedisCache):
+    """
+    RedisCache wired to LocalRedis, for running the Redis code path offline.
+    """
+
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        self._class = LocalRedisCacheClient
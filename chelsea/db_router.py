@@ -0,0 +1,131 @@
+"""
+Read-replica routing.
+
+Settings can define replica aliases next to "default" (see
+DATABASE_REPLICA_URLS in app/settings.py). ReplicaRouter sends every write
+to "default", the primary, and a read to a random replica only when the
+current request allows it:
+
+- ReplicaRoutingMiddleware (chelsea/middleware.py) allows it for
+  GET/HEAD/OPTIONS requests (leaderboards, comparisons, stats,
+  list/retrieve, exports), unless the client wrote within the last
+  STICKY_SECONDS: every unsafe request sets a cookie that keeps that
+  client's reads on the primary meanwhile, so clients read their own
+  writes despite replication lag;
+- inside a request, the first write and any open transaction on the
+  primary pin the remaining reads to it;
+- CachedResponseMixin still reads from the replicas when the data was
+  written in the last STICKY_SECONDS, but such an answer may predate the
+  new data versions (replica_may_lag). It gets no validators and is cached
+  for STICKY_SECONDS only, for requests that may read from a replica
+  anyway (may_read_replica); sticky clients never see it.
+
+Outside requests (management commands, the vote buffer's flush thread)
+everything runs on the primary. Without replicas the router always
+answers "default".
+"""
+import contextvars
+import random
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS, connections
+
+DEFAULTS = {
+    "STICKY_SECONDS": 5.0,
+    "COOKIE": "chelsea_primary_until",
+}
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def routing_settings():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "REPLICA_ROUTING", {}))
+    return config
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+class RoutingState:
+    """
+    Whether the current request may still read from a replica.
+    """
+    __slots__ = ("use_replica", "wrote", "read_replica")
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+        self.read_replica = False
+
+
+_state = contextvars.ContextVar("chelsea_db_routing", default=None)
+
+
+def begin_request(use_replica):
+    state = RoutingState(use_replica)
+    _state.set(state)
+    return state
+
+
+def may_read_replica():
+    """
+    Whether the current request may read from a replica, and so may be
+    answered with data read from one.
+    """
+    state = _state.get()
+    return state is not None and state.use_replica
+
+
+def replica_may_lag(last_modified):
+    """
+    Whether the current request read from a replica that may not have
+    caught up with data written at `last_modified` (a Unix timestamp in
+    whole seconds) yet.
+    """
+    state = _state.get()
+    return (
+        state is not None and state.read_replica
+        and last_modified >= time.time() - routing_settings()["STICKY_SECONDS"] - 1
+    )
+
+
+def _end_request(**kwargs):
+    _state.set(None)
+
+
+# Cleared when the response is closed, after a streaming body has been read.
+request_finished.connect(_end_request, dispatch_uid="chelsea-db-routing-end")
+
+
+class ReplicaRouter:
+    def __init__(self, replicas=None):
+        self.replicas = replica_aliases() if replicas is None else list(replicas)
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replica or not self.replicas:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        state.read_replica = True
+        return random.choice(self.replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.use_replica = False
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication. The test runner
+        # mirrors them onto the primary's test database.
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,430 @@
+"""
+Streaming bulk import of players, managers and seasons.
+
+Records flow through a generator pipeline (read -> validate -> chunk ->
+upsert), so memory use depends on the chunk size and the number of
+players/managers/competitions, never on the size of the input file.
+Rows are validated with the API serializers, related names are resolved
+through in-memory name -> id maps, and each chunk is written with a single
+bulk_create(update_conflicts=True) keyed on the model's unique constraint.
+
+Importer.write() applies the same validation to a batch of API rows (the
+/api/<rows>/bulk/ endpoints): one many=True serializer, name maps limited
+to the batch's names, and one bulk_create or bulk_update in a transaction.
+"""
+import csv
+import json
+import re
+from itertools import islice
+from pathlib import Path
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from .aggregates import refresh_career_stats
+from .cache import bump_name_version, bump_version
+from .models import Player, Manager, Season, Competition
+from .api.serializers import PlayerSerializer, ManagerSerializer, SeasonSerializer, TimedListSerializer
+
+
+def read_records(path, fmt=None):
+    """
+    Yield (line number, dict) pairs from a CSV or NDJSON file.
+    Empty CSV cells are dropped so model defaults apply. An NDJSON line that
+    isn't valid JSON yields a ValidationError in place of the dict, so
+    Importer.run() rejects it like any other invalid row.
+    """
+    path = Path(path)
+    fmt = fmt or ("csv" if path.suffix.lower() == ".csv" else "ndjson")
+    with open(path, newline="", encoding="utf-8") as fh:
+        if fmt == "csv":
+            for line_no, row in enumerate(csv.DictReader(fh), start=2):
+                yield line_no, {key: value for key, value in row.items() if value not in ("", None)}
+        else:
+            for line_no, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as exc:
+                    record = serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [f"Invalid JSON: {exc}"]})
+                yield line_no, record
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+RATIO = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+
+
+def parse_ratio(value):
+    """
+    Legacy "successful/attempted" strings ("2/5") -> (successful, attempted).
+    A bare number counts as that many successful attempts. Returns None if
+    the value is neither.
+    """
+    value = str(value).strip()
+    match = RATIO.match(value)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    if value.isdigit():
+        return int(value), int(value)
+    return None
+
+
+def name_map(model, names=None):
+    """
+    {casefolded name: pk} of every row, or only of the rows named in `names`
+    (one query either way, served by the LOWER(name) indexes).
+    """
+    queryset = model.objects.all()
+    if names is not None:
+        queryset = queryset.alias(name_lower=Lower("name")).filter(name_lower__in={name.lower() for name in names})
+    return {name.casefold(): pk for pk, name in queryset.values_list("pk", "name")}
+
+
+class BulkListSerializer(TimedListSerializer):
+    """
+    many=True validation that keeps the rows which pass: after is_valid(),
+    `rows` holds (instance, validated data) or None per input row, aligned
+    with `errors`. For updates `instance` is a {pk: instance} dict and every
+    row names its pk in "id".
+    """
+
+    def to_internal_value(self, data):
+        self.rows = []
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        try:
+            self.child.instance = self.get_row_instance(data)
+            validated = super().run_child_validation(data)
+        except serializers.ValidationError:
+            self.rows.append(None)
+            raise
+        self.rows.append((self.child.instance, validated))
+        return validated
+
+    def get_row_instance(self, data):
+        if self.instance is None:
+            return None
+        pk = data.get("id") if isinstance(data, dict) else None
+        if not isinstance(pk, int) or pk not in self.instance:
+            raise serializers.ValidationError({"id": ["A valid id of an existing row is required."]})
+        return self.instance[pk]
+
+
+# ==============================
+# 📌 IMPORT SERIALIZERS
+# ==============================
+class PlayerImportSerializer(PlayerSerializer):
+    """
+    PlayerSerializer rules, also accepting the legacy "take_ons" and
+    "aerial_duels_won" columns holding "successful/attempted" strings.
+    """
+    LEGACY_RATIOS = {
+        "take_ons": ("take_ons_successful", "take_ons_attempted"),
+        "aerial_duels_won": ("aerial_duels_won", "aerial_duels_attempted"),
+    }
+
+    class Meta(PlayerSerializer.Meta):
+        # Existing names are updated, not rejected (Importer.write checks them per batch).
+        extra_kwargs = {"name": {"validators": []}}
+        list_serializer_class = BulkListSerializer
+
+    def to_internal_value(self, data):
+        if not isinstance(data, dict):
+            return super().to_internal_value(data)  # rejected there as "Invalid data"
+        data = dict(data)
+        for column, (successful, attempted) in self.LEGACY_RATIOS.items():
+            value = data.get(column)
+            if not isinstance(value, str) or "/" not in value:
+                continue
+            ratio = parse_ratio(value)
+            if ratio is None:
+                raise serializers.ValidationError({column: [f"Expected 'successful/attempted', got '{value}'."]})
+            del data[column]
+            data.setdefault(successful, ratio[0])
+            data.setdefault(attempted, ratio[1])
+        return super().to_internal_value(data)
+
+
+class SeasonImportSerializer(SeasonSerializer):
+    """
+    SeasonSerializer rules, with related rows given by name and resolved by
+    the importer instead of one query per row.
+    """
+    player = serializers.CharField()
+    manager = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    competition = serializers.CharField()
+
+    class Meta(SeasonSerializer.Meta):
+        validators = []
+        list_serializer_class = BulkListSerializer
+
+
+# ==============================
+# 📥 IMPORTERS
+# ==============================
+class Importer:
+    model = None
+    serializer_class = None
+    unique_fields = ()
+
+    def __init__(self, records=None):
+        self.update_fields = [
+            field.name for field in self.model._meta.concrete_fields
+            if field.editable and not field.primary_key and field.name not in self.unique_fields
+        ]
+
+    def validate(self, record):
+        """
+        Return an unsaved model instance, or raise serializers.ValidationError.
+        """
+        serializer = self.serializer_class(data=record)
+        serializer.is_valid(raise_exception=True)
+        return self.model(**self.resolve(serializer.validated_data))
+
+    def resolve(self, data):
+        return data
+
+    def bump_versions(self):
+        """
+        Invalidate the cached responses and, for players and managers, the
+        name index (bulk writes send no post_save signals).
+        """
+        bump_version(self.model)
+        if self.model in (Player, Manager):
+            bump_name_version(self.model)
+
+    def key(self, instance):
+        return tuple(getattr(instance, field) for field in self.unique_fields)
+
+    def upsert(self, instances):
+        # ON CONFLICT cannot touch the same row twice in one statement.
+        unique = list({self.key(instance): instance for instance in instances}.values())
+        self.model.objects.bulk_create(
+            unique,
+            update_conflicts=True,
+            unique_fields=self.unique_fields,
+            update_fields=self.update_fields,
+        )
+        return len(unique)
+
+    def run(self, records, chunk_size=1000, on_error=None):
+        """
+        Validate and upsert (line number, dict) records chunk by chunk.
+        Returns (rows written, rows rejected).
+        """
+        written = rejected = 0
+
+        def valid_instances():
+            nonlocal rejected
+            for line_no, record in records:
+                try:
+                    if isinstance(record, serializers.ValidationError):
+                        raise record
+                    yield self.validate(record)
+                except serializers.ValidationError as exc:
+                    rejected += 1
+                    if on_error is not None:
+                        on_error(line_no, exc.detail)
+
+        for chunk in chunked(valid_instances(), chunk_size):
+            with transaction.atomic():
+                written += self.upsert(chunk)
+        if written:
+            self.bump_versions()
+        return written, rejected
+
+    # Batch writes (API)
+
+    def apply(self, instance, data):
+        """
+        Copy validated row data onto an existing instance.
+        """
+        for field, value in data.items():
+            setattr(instance, field, value)
+        return instance
+
+    def conflicts(self, instances):
+        """
+        Rows clashing on `unique_fields` with each other or with other stored
+        rows: {index: message}, found with one query.
+        """
+        attnames = [self.model._meta.get_field(field).attname for field in self.unique_fields]
+        keys, clashes = {}, {}
+        for index, instance in instances.items():
+            key = self.key(instance)
+            if key in keys:
+                clashes[index] = f"Duplicates row {keys[key]} of this batch."
+            else:
+                keys[key] = index
+        if keys:
+            lookup = Q()
+            for key in keys:
+                lookup |= Q(**dict(zip(attnames, key)))
+            for row in self.model.objects.filter(lookup).values("pk", *attnames):
+                index = keys[tuple(row[attname] for attname in attnames)]
+                if row["pk"] != instances[index].pk:
+                    clashes[index] = f"Another row already has this {', '.join(self.unique_fields)}."
+        return clashes
+
+    def after_write(self, instances):
+        pass
+
+    def write(self, records, update=False, atomic=False, max_rows=None):
+        """
+        Validate a list of rows with one many=True serializer and write the
+        valid ones in one transaction: bulk_create, or with update=True
+        bulk_update of the rows named by their "id".
+
+        Returns (ids written, [{"index": i, "errors": {...}}, ...]). With
+        atomic=True nothing is written if any row is invalid. Raises
+        serializers.ValidationError if `records` isn't a list of at most
+        `max_rows` rows.
+        """
+        instances = None
+        if update and isinstance(records, list):
+            ids = [record.get("id") for record in records if isinstance(record, dict)]
+            instances = self.model.objects.in_bulk([pk for pk in ids if isinstance(pk, int)])
+        serializer = self.serializer_class(data=records, instance=instances, many=True, partial=update,
+                                           allow_empty=False, max_length=max_rows)
+        if not serializer.is_valid() and not isinstance(serializer.errors, list):
+            raise serializers.ValidationError(serializer.errors)
+
+        errors, valid, fields = {}, {}, set()
+        for index, row in enumerate(serializer.rows):
+            if row is None:
+                errors[index] = serializer.errors[index]
+                continue
+            instance, data = row
+            try:
+                data = self.resolve(dict(data))
+            except serializers.ValidationError as exc:
+                errors[index] = exc.detail
+                continue
+            fields.update(data)
+            valid[index] = self.apply(instance, data) if update else self.model(**data)
+        for index, message in self.conflicts(valid).items():
+            errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+            del valid[index]
+
+        errors = [{"index": index, "errors": errors[index]} for index in sorted(errors)]
+        if not valid or (atomic and errors):
+            return [], errors
+        with transaction.atomic():
+            if update:
+                if fields:
+                    self.model.objects.bulk_update(valid.values(), sorted(fields))
+            else:
+                self.model.objects.bulk_create(valid.values())
+            self.after_write(valid.values())
+            transaction.on_commit(self.bump_versions)
+        return [instance.pk for instance in valid.values()], errors
+
+
+class PlayerImporter(Importer):
+    model = Player
+    serializer_class = PlayerImportSerializer
+    unique_fields = ("name",)
+
+
+class ManagerImporter(Importer):
+    """
+    Manager names carry no unique constraint, so rows are matched against an
+    in-memory name map and split into bulk_update / bulk_create.
+    """
+    model = Manager
+    serializer_class = ManagerSerializer
+    unique_fields = ("name",)
+
+    def __init__(self, records=None):
+        super().__init__(records)
+        self.managers = name_map(Manager)
+
+    def upsert(self, instances):
+        unique = {instance.name.casefold(): instance for instance in instances}
+        existing, new = [], []
+        for folded, instance in unique.items():
+            if folded in self.managers:
+                instance.pk = self.managers[folded]
+                existing.append(instance)
+            else:
+                new.append(instance)
+        Manager.objects.bulk_update(existing, self.update_fields)
+        for instance in Manager.objects.bulk_create(new):
+            if instance.pk is not None:
+                self.managers[instance.name.casefold()] = instance.pk
+        return len(unique)
+
+
+class SeasonImporter(Importer):
+    model = Season
+    serializer_class = SeasonImportSerializer
+    unique_fields = ("player", "competition", "year")
+
+    def __init__(self, records=None):
+        """
+        `records` (a list of rows) limits the name maps to the names those
+        rows use; a streamed import's names aren't known upfront.
+        """
+        super().__init__(records)
+
+        def names(field):
+            if records is None:
+                return None
+            return {record[field] for record in records if isinstance(record, dict) and isinstance(record.get(field), str)}
+
+        self.players = name_map(Player, names("player"))
+        self.managers = name_map(Manager, names("manager"))
+        self.competitions = name_map(Competition, names("competition"))
+        self.stale_players = set()
+
+    def resolve(self, data):
+        errors = {}
+        for field, ids in (("player", self.players), ("competition", self.competitions),
+                           ("manager", self.managers)):
+            if field not in data:
+                continue
+            name = data.pop(field)
+            if not name:
+                data[f"{field}_id"] = None
+                continue
+            try:
+                data[f"{field}_id"] = ids[name.casefold()]
+            except KeyError:
+                errors[field] = [f"Unknown {field} '{name}'."]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return data
+
+    def key(self, instance):
+        return instance.player_id, instance.competition_id, instance.year
+
+    def apply(self, instance, data):
+        # Moving a season to another player changes both players' careers.
+        self.stale_players.add(instance.player_id)
+        return super().apply(instance, data)
+
+    def after_write(self, instances):
+        refresh_career_stats(self.stale_players | {instance.player_id for instance in instances})
+
+    def upsert(self, instances):
+        # bulk_create sends no signals, so refresh the career aggregates here.
+        written = super().upsert(instances)
+        refresh_career_stats({instance.player_id for instance in instances})
+        return written
+
+
+IMPORTERS = {
+    "players": PlayerImporter,
+    "managers": ManagerImporter,
+    "seasons": SeasonImporter,
+}
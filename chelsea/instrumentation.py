@@ -0,0 +1,281 @@
+"""
+Per-request SQL and timing instrumentation.
+
+RequestMetricsMiddleware (chelsea/middleware.py) opens a RequestTimings
+for every request and stores it in a context variable, which follows the
+request into sync_to_async threads. Everything else only reads it:
+
+- execute_wrapper(), installed on every database connection when it is
+  opened, counts the queries and their time, and logs the ones slower than
+  SLOW_QUERY_MS together with the view that ran them;
+- timed_serialization() wraps the `.data` of the API serializers;
+- the middleware adds the view time and the total, emits the
+  Server-Timing header and the log line, and feeds get_request_metrics().
+
+RequestMetrics keeps a rolling latency histogram per endpoint over the
+last WINDOW seconds, split into SLOTS ring slots so old traffic ages out
+without any background work. Outside a request (management commands,
+background threads) the hooks cost one context variable lookup.
+"""
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger("chelsea.requests")
+slow_query_logger = logging.getLogger("chelsea.requests.slow_queries")
+
+DEFAULTS = {
+    "ENABLED": True,
+    "SLOW_QUERY_MS": 100.0,
+    "SERVER_TIMING": True,
+    "WINDOW": 300,
+    "SLOTS": 10,
+}
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open.
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_current = contextvars.ContextVar("chelsea_request_timings", default=None)
+
+
+def metrics_settings():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "REQUEST_METRICS", {}))
+    return config
+
+
+# ==============================
+# ⏱️ PER-REQUEST TIMINGS
+# ==============================
+class RequestTimings:
+    __slots__ = ("started", "view_started", "view_name", "slow_query", "queries", "db", "serializer", "view")
+
+    def __init__(self, slow_query):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_name = None
+        self.slow_query = slow_query
+        self.queries = 0
+        self.db = 0.0
+        self.serializer = 0.0
+        self.view = 0.0
+
+    def server_timing(self, total):
+        return (
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries", '
+            f"serialize;dur={self.serializer * 1000:.2f}, "
+            f"view;dur={self.view * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+
+
+def current_timings():
+    return _current.get()
+
+
+def start_request(slow_query):
+    """
+    Make a new RequestTimings current; returns it with the token that
+    end_request() needs.
+    """
+    timings = RequestTimings(slow_query)
+    return timings, _current.set(timings)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+@contextmanager
+def track_request(slow_query):
+    timings, token = start_request(slow_query)
+    try:
+        yield timings
+    finally:
+        end_request(token)
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    """
+    Database execute wrapper timing each query of the current request.
+    """
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        timings.queries += 1
+        timings.db += elapsed
+        if elapsed >= timings.slow_query:
+            slow_query_logger.warning(
+                "Slow query (%.1f ms) in %s: %s", elapsed * 1000, timings.view_name or "-", sql,
+                extra={"view_name": timings.view_name, "duration_ms": round(elapsed * 1000, 2), "sql": sql},
+            )
+
+
+def install_execute_wrapper(sender, connection, **kwargs):
+    """
+    connection_created receiver adding execute_wrapper to new connections.
+    """
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+@contextmanager
+def timed_serialization():
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.serializer += time.perf_counter() - started
+
+
+# ==============================
+# 📊 ROLLING HISTOGRAMS
+# ==============================
+class _Slot:
+    __slots__ = ("epoch", "buckets", "count", "errors", "total", "max", "queries", "max_queries", "db", "serializer")
+
+    def __init__(self, epoch):
+        self.epoch = epoch
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.queries = 0
+        self.max_queries = 0
+        self.db = 0.0
+        self.serializer = 0.0
+
+
+class RollingHistogram:
+    """
+    Latency histogram of one endpoint over the last `window` seconds.
+    Not locked: RequestMetrics serializes access.
+    """
+
+    def __init__(self, window=300, slots=10):
+        self.slot_seconds = window / slots
+        self._slots = [None] * slots
+
+    def _epoch(self, now):
+        return int(now // self.slot_seconds)
+
+    def record(self, now, total_ms, queries, db_ms, serializer_ms, error):
+        epoch = self._epoch(now)
+        index = epoch % len(self._slots)
+        slot = self._slots[index]
+        if slot is None or slot.epoch != epoch:
+            slot = self._slots[index] = _Slot(epoch)
+        slot.buckets[bisect.bisect_left(BUCKETS_MS, total_ms)] += 1
+        slot.count += 1
+        slot.errors += error
+        slot.total += total_ms
+        slot.max = max(slot.max, total_ms)
+        slot.queries += queries
+        slot.max_queries = max(slot.max_queries, queries)
+        slot.db += db_ms
+        slot.serializer += serializer_ms
+
+    def snapshot(self, now):
+        oldest = self._epoch(now) - len(self._slots)
+        live = [slot for slot in self._slots if slot is not None and slot.epoch > oldest]
+        count = sum(slot.count for slot in live)
+        if not count:
+            return None
+        buckets = [sum(column) for column in zip(*(slot.buckets for slot in live))]
+        maximum = max(slot.max for slot in live)
+
+        def percentile(pct):
+            # Upper bound of the bucket holding the percentile, capped at the max seen.
+            rank, seen = pct / 100 * count, 0
+            for bound, n in zip(BUCKETS_MS, buckets):
+                seen += n
+                if seen >= rank:
+                    return min(bound, round(maximum, 2))
+            return round(maximum, 2)
+
+        return {
+            "count": count,
+            "errors": sum(slot.errors for slot in live),
+            "latency_ms": {
+                "mean": round(sum(slot.total for slot in live) / count, 2),
+                "p50": percentile(50),
+                "p90": percentile(90),
+                "p99": percentile(99),
+                "max": round(maximum, 2),
+                "buckets": {
+                    **{f"le_{bound}": n for bound, n in zip(BUCKETS_MS, buckets)},
+                    "inf": buckets[-1],
+                },
+            },
+            "queries": {
+                "mean": round(sum(slot.queries for slot in live) / count, 2),
+                "max": max(slot.max_queries for slot in live),
+            },
+            "db_ms": {"mean": round(sum(slot.db for slot in live) / count, 2)},
+            "serializer_ms": {"mean": round(sum(slot.serializer for slot in live) / count, 2)},
+        }
+
+
+class RequestMetrics:
+    """
+    Rolling histograms per endpoint ("METHOD route-name") for this process.
+    """
+
+    def __init__(self, window=300, slots=10):
+        self.window = window
+        self.slots = slots
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, timings, total, status_code):
+        now = time.monotonic()
+        with self._lock:
+            histogram = self._endpoints.get(endpoint)
+            if histogram is None:
+                histogram = self._endpoints[endpoint] = RollingHistogram(self.window, self.slots)
+            histogram.record(
+                now, total * 1000, timings.queries, timings.db * 1000, timings.serializer * 1000,
+                status_code >= 500,
+            )
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            endpoints = {name: histogram.snapshot(now) for name, histogram in sorted(self._endpoints.items())}
+        return {
+            "window_seconds": self.window,
+            "endpoints": {name: data for name, data in endpoints.items() if data is not None},
+        }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+_request_metrics = None
+_request_metrics_lock = threading.Lock()
+
+
+def get_request_metrics():
+    global _request_metrics
+    if _request_metrics is None:
+        with _request_metrics_lock:
+            if _request_metrics is None:
+                config = metrics_settings()
+                _request_metrics = RequestMetrics(window=config["WINDOW"], slots=config["SLOTS"])
+    return _request_metrics
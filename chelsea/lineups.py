@@ -0,0 +1,75 @@
+from django.db.models import Case, F, IntegerField, Value, When, Window
+from django.db.models.functions import RowNumber
+
+from .models import Player
+
+POSITION_ORDER = ("GK", "DEF", "MID", "FWD")
+DEFAULT_FORMATION = "4-3-3"
+
+
+def _formation_lines(formation):
+    try:
+        lines = [int(part) for part in formation.strip().split("-")]
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid formation '{formation}'. Expected something like '4-3-3'.")
+
+    if len(lines) < 3 or min(lines) < 1 or sum(lines) != 10:
+        raise ValueError(f"Invalid formation '{formation}'. Outfield lines must add up to 10 players.")
+    return lines
+
+
+def normalize_formation(formation):
+    """
+    Canonical form of a formation string, e.g. " 4-03-3 " -> "4-3-3".
+    Raises ValueError like parse_formation().
+    """
+    return "-".join(map(str, _formation_lines(formation)))
+
+
+def parse_formation(formation):
+    """
+    Map a formation string to the number of players per position code.
+    The first line is the defence, the last the attack and everything in
+    between counts as midfield, e.g. "4-2-3-1" -> 1 GK, 4 DEF, 5 MID, 1 FWD.
+    """
+    lines = _formation_lines(formation)
+    return {"GK": 1, "DEF": lines[0], "MID": sum(lines[1:-1]), "FWD": lines[-1]}
+
+
+def ranked_players(formation=DEFAULT_FORMATION):
+    """
+    Queryset of the most voted players for each slot of the formation,
+    ranked per position in a single query. Unordered; see best_xi().
+    """
+    slots = parse_formation(formation)
+    return (
+        Player.objects.filter(position__in=slots)
+        .annotate(
+            slot=Window(
+                RowNumber(),
+                partition_by=F("position"),
+                order_by=(F("vote_count").desc(), F("id").asc()),
+            ),
+            slot_limit=Case(
+                *(When(position=position, then=Value(n)) for position, n in slots.items()),
+                output_field=IntegerField(),
+            ),
+        )
+        .filter(slot__lte=F("slot_limit"))
+    )
+
+
+def _lineup_order(player):
+    return POSITION_ORDER.index(player.position), player.slot
+
+
+def best_xi(formation=DEFAULT_FORMATION):
+    """
+    Return the most voted players for each slot of the formation, ordered
+    GK, DEF, MID, FWD.
+    """
+    return sorted(ranked_players(formation), key=_lineup_order)
+
+
+async def abest_xi(formation=DEFAULT_FORMATION):
+    return sorted([player async for player in ranked_players(formation)], key=_lineup_order)
@@ -0,0 +1,254 @@
+"""
+Live leaderboard updates for Server-Sent Events subscribers.
+
+One LeaderboardBroadcaster per process recomputes the leaderboards (top
+voted players and managers, and the default best XI) at most once per
+INTERVAL, and only when the Player/Manager data or vote-counter versions
+(see chelsea.cache) have moved. Each change is diffed against the previous
+state, encoded once, and pushed to every subscriber's queue, so database
+load depends on the vote rate and the interval, never on the number of
+open streams.
+
+A new subscriber first receives a full "snapshot" event, then "delta"
+events listing only the rows whose rank or vote count changed. A
+subscriber that falls QUEUE_SIZE events behind has its backlog replaced
+by a fresh snapshot.
+"""
+import asyncio
+import json
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from .cache import get_versions, vote_scope
+from .lineups import DEFAULT_FORMATION, best_xi
+from .models import Player, Manager
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "INTERVAL": 1.0,
+    "SIZE": 10,
+    "HEARTBEAT": 15.0,
+    "QUEUE_SIZE": 100,
+}
+
+
+def live_settings():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "LIVE_LEADERBOARD", {}))
+    return config
+
+
+def format_event(name, seq, data):
+    return f"id: {seq}\nevent: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def diff_ranking(old, new):
+    """
+    Compare two rankings ({id: entry} with "rank" and "votes") and return
+    (changed entries, removed ids). Changed entries carry the previous rank
+    and the vote increment.
+    """
+    changed = []
+    for pk, entry in new.items():
+        before = old.get(pk)
+        if before is not None and before["rank"] == entry["rank"] and before["votes"] == entry["votes"]:
+            continue
+        changed.append({
+            **entry,
+            "previous_rank": before["rank"] if before else None,
+            "votes_delta": entry["votes"] - (before["votes"] if before else 0),
+        })
+    removed = sorted(pk for pk in old if pk not in new)
+    return changed, removed
+
+
+# ==============================
+# 📡 SUBSCRIBERS
+# ==============================
+class Subscriber:
+    """
+    Bounded event queue read by one blocking (WSGI) stream.
+    """
+
+    def __init__(self, maxsize):
+        self._queue = queue.Queue(maxsize)
+
+    def deliver(self, event, snapshot):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._queue.mutex:
+                self._queue.queue.clear()
+            self._queue.put_nowait(snapshot())
+
+    def get(self, timeout):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AsyncSubscriber:
+    """
+    Bounded event queue read by one stream on an event loop (ASGI).
+    """
+
+    def __init__(self, maxsize):
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize)
+
+    def _put(self, event, snapshot):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(snapshot())
+
+    def deliver(self, event, snapshot):
+        self._loop.call_soon_threadsafe(self._put, event, snapshot)
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+# ==============================
+# 📢 BROADCASTER
+# ==============================
+class LeaderboardBroadcaster:
+    def __init__(self, interval=1.0, size=10, queue_size=100):
+        self.interval = interval
+        self.size = size
+        self.queue_size = queue_size
+
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._versions = None
+        self._state = None
+        self._seq = 0
+
+    # --- computation ------------------------------------------------------
+
+    def _ranking(self, model):
+        rows = model.objects.order_by("-vote_count", "id").values_list("id", "name", "vote_count")[:self.size]
+        return {
+            pk: {"id": pk, "name": name, "votes": votes, "rank": rank}
+            for rank, (pk, name, votes) in enumerate(rows, start=1)
+        }
+
+    def _compute(self):
+        return {
+            "players": self._ranking(Player),
+            "managers": self._ranking(Manager),
+            "best_xi": [
+                {"id": player.id, "name": player.name, "position": player.position, "votes": player.vote_count}
+                for player in best_xi(DEFAULT_FORMATION)
+            ],
+        }
+
+    def _snapshot_event(self):
+        state = self._state
+        return format_event("snapshot", self._seq, {
+            "players": list(state["players"].values()),
+            "managers": list(state["managers"].values()),
+            "formation": DEFAULT_FORMATION,
+            "best_xi": state["best_xi"],
+        })
+
+    def refresh(self):
+        """
+        Recompute the leaderboards if the data changed since the last call and
+        push the delta to every subscriber. Returns True if anything changed.
+        """
+        with self._lock:
+            versions = get_versions([Player, Manager, vote_scope(Player), vote_scope(Manager)])
+            if versions == self._versions:
+                return False
+            state = self._compute()
+            self._versions = versions
+            previous, self._state = self._state, state
+            if previous is None:
+                return True
+
+            delta = {}
+            for key in ("players", "managers"):
+                changed, removed = diff_ranking(previous[key], state[key])
+                if changed:
+                    delta[key] = changed
+                if removed:
+                    delta[f"{key}_removed"] = removed
+            if state["best_xi"] != previous["best_xi"]:
+                delta["best_xi"] = state["best_xi"]
+            if not delta:
+                return False
+
+            self._seq += 1
+            event = format_event("delta", self._seq, delta)
+            for subscriber in self._subscribers:
+                subscriber.deliver(event, self._snapshot_event)
+            return True
+
+    # --- subscriptions ----------------------------------------------------
+
+    def subscribe(self, subscriber):
+        """
+        Register a Subscriber / AsyncSubscriber and return the snapshot event
+        it should be sent first.
+        """
+        self.refresh()
+        with self._lock:
+            self._subscribers.add(subscriber)
+            snapshot = self._snapshot_event()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="live-leaderboard", daemon=True)
+                self._thread.start()
+        return snapshot
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            if not self._subscribers:
+                self._wakeup.set()
+
+    def _run(self):
+        try:
+            while True:
+                self._wakeup.wait(self.interval)
+                self._wakeup.clear()
+                with self._lock:
+                    if not self._subscribers:
+                        self._thread = None
+                        return
+                close_old_connections()
+                try:
+                    self.refresh()
+                except Exception:
+                    logger.exception("Live leaderboard refresh failed")
+        finally:
+            connection.close()
+
+
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_broadcaster():
+    global _broadcaster
+    if _broadcaster is None:
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                config = live_settings()
+                _broadcaster = LeaderboardBroadcaster(
+                    interval=config["INTERVAL"], size=config["SIZE"], queue_size=config["QUEUE_SIZE"]
+                )
+    return _broadcaster
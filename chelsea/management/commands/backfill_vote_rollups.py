@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chelsea.rollups import backfill_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the hourly/daily vote rollups from the Vote table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="Only rebuild buckets from this date (YYYY-MM-DD, UTC) onwards.")
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            try:
+                since = datetime.strptime(options["since"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            except ValueError:
+                raise CommandError("--since must be a date in YYYY-MM-DD format.")
+        buckets = backfill_rollups(since)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {buckets} vote rollup buckets."))
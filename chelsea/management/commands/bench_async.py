@@ -0,0 +1,147 @@
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from chelsea.models import Player
+
+# name -> (method, sync url name, async url name)
+ENDPOINTS = {
+    "vote": ("post", "cast-vote", "async-cast-vote"),
+    "best-players": ("get", "best-players", "async-best-players"),
+    "top-voted-player": ("get", "top-voted-player", "async-top-voted-player"),
+    "best-manager": ("get", "best-manager", "async-best-manager"),
+    "trending": ("get", "trending", "async-trending"),
+}
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests/sec and latency of the sync (WSGI handler, one thread per "
+        "concurrent request) and async (ASGI handler, one event loop) voting and "
+        "leaderboard views under concurrent load. Requests go through Django's in-process "
+        "test Client/AsyncClient, so the numbers cover the handlers, views and database but "
+        "no server, sockets or HTTP parsing; compare deployments with a load generator "
+        "against runserver/uvicorn instead. Votes are written to the configured "
+        "database, so run it against a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), action="append",
+                            help="Endpoint to benchmark (repeatable). Defaults to all.")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--sync-workers", type=int,
+                            help="Threads serving the sync runs, i.e. the number of sync workers "
+                                 "(defaults to --concurrency).")
+        parser.add_argument("--db-latency", type=float, default=0.0,
+                            help="Milliseconds added to every SQL query, to mimic a remote database.")
+        parser.add_argument("--cached", action="store_true",
+                            help="Let the sync leaderboards use the response cache (off by default, "
+                                 "since the async views read the database on every request).")
+
+    def handle(self, *args, **options):
+        player_id = Player.objects.values_list("pk", flat=True).first()
+        if player_id is None:
+            raise CommandError("No players in the database; load or seed some first.")
+        if options["db_latency"]:
+            self.add_db_latency(options["db_latency"] / 1000)
+
+        # The test clients send "Host: testserver", as under the test runner;
+        # all their votes come from one client, so the rate limits are lifted.
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], RATE_LIMIT={"ENABLED": False}):
+            self.run_all(options, player_id)
+
+    def run_all(self, options, player_id):
+        self.stdout.write(
+            f"{options['requests']} requests per run, concurrency {options['concurrency']}, "
+            f"{options['sync_workers'] or options['concurrency']} sync workers"
+        )
+        self.stdout.write(f"{'endpoint':<18}{'mode':<7}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for name in options["endpoint"] or ENDPOINTS:
+            method, sync_name, async_name = ENDPOINTS[name]
+            payload = {"player_id": player_id} if method == "post" else None
+            bust_cache = method == "get" and not options["cached"]
+            for mode, url_name in (("sync", sync_name), ("async", async_name)):
+                run = self.run_sync if mode == "sync" else self.run_async
+                wall, latencies, errors = run(method, reverse(url_name), payload, bust_cache, options)
+                latencies.sort()
+                self.stdout.write(
+                    f"{name:<18}{mode:<7}{len(latencies) / wall:>9,.0f}"
+                    f"{statistics.median(latencies) * 1000:>9.1f}{percentile(latencies, 99) * 1000:>9.1f}"
+                    f"{errors:>8}"
+                )
+
+    @staticmethod
+    def add_db_latency(seconds):
+        def delay(execute, sql, params, many, context):
+            time.sleep(seconds)
+            return execute(sql, params, many, context)
+
+        def install(sender, connection, **kwargs):
+            connection.execute_wrappers.append(delay)
+
+        connection_created.connect(install, weak=False)
+
+    @staticmethod
+    def request_kwargs(method, payload, bust_cache, i):
+        if method == "post":
+            return {"data": payload, "content_type": "application/json"}
+        # A unique query string makes every sync request a response-cache miss.
+        return {"data": {"_": i}} if bust_cache else {}
+
+    def run_sync(self, method, url, payload, bust_cache, options):
+        # `concurrency` client threads share `sync_workers` worker slots, so the
+        # latency includes the wait for a free worker, as behind gunicorn.
+        local = threading.local()
+        workers = threading.Semaphore(options["sync_workers"] or options["concurrency"])
+        latencies, errors = [], 0
+
+        def one(i):
+            client = getattr(local, "client", None) or Client(raise_request_exception=False)
+            local.client = client
+            started = time.perf_counter()
+            with workers:
+                response = getattr(client, method)(url, **self.request_kwargs(method, payload, bust_cache, i))
+            return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            for latency, status_code in pool.map(one, range(options["requests"])):
+                latencies.append(latency)
+                errors += status_code >= 400
+        return time.perf_counter() - started, latencies, errors
+
+    def run_async(self, method, url, payload, bust_cache, options):
+        async def main():
+            client = AsyncClient(raise_request_exception=False)
+            gate = asyncio.Semaphore(options["concurrency"])
+
+            async def one(i):
+                # ASGI servers give each request its own thread-sensitive context
+                # (see ASGIHandler.__call__); the test client doesn't.
+                async with gate, ThreadSensitiveContext():
+                    started = time.perf_counter()
+                    response = await getattr(client, method)(url, **self.request_kwargs(method, payload, False, i))
+                    return time.perf_counter() - started, response.status_code
+
+            started = time.perf_counter()
+            results = await asyncio.gather(*(one(i) for i in range(options["requests"])))
+            return time.perf_counter() - started, results
+
+        wall, results = asyncio.run(main())
+        return wall, [latency for latency, _ in results], sum(code >= 400 for _, code in results)
@@ -0,0 +1,78 @@
+import gzip
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from chelsea.api.renderers import MessagePackRenderer, ORJSONRenderer, msgpack
+from chelsea.benchmark import data_sample
+from chelsea.middleware import CompressionMiddleware, brotli
+
+# The largest responses: name -> (url name, query parameters)
+ENDPOINTS = {
+    "season-list": ("season-list", lambda s: {"page_size": 500}),
+    "player-list": ("player-list", lambda s: {"page_size": 500}),
+    "player-list-expanded": ("player-list", lambda s: {"page_size": 100, "expand": "seasons"}),
+    "manager-list": ("manager-list", lambda s: {"page_size": 500}),
+    "compare-players": ("compare-players", lambda s: {"ids": ",".join(map(str, s["players"][:10]))}),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the payloads of the largest endpoints with DRF's stdlib JSONRenderer, the orjson "
+        "renderer and (if msgpack is installed) MessagePack, and report the render time and "
+        "the bytes on the wire raw, gzipped and brotli-compressed (if brotli is installed)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), action="append",
+                            help="Endpoint to benchmark (repeatable). Defaults to all.")
+        parser.add_argument("--repeat", type=int, default=50, help="Renders timed per renderer.")
+
+    def handle(self, *args, **options):
+        try:
+            sample = data_sample()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        renderers = {"json": JSONRenderer(), "orjson": ORJSONRenderer()}
+        if msgpack is not None:
+            renderers["msgpack"] = MessagePackRenderer()
+        config = {**CompressionMiddleware.defaults, **getattr(settings, "COMPRESSION", {})}
+
+        self.stdout.write(f"{'endpoint':<22}{'renderer':<9}{'render ms':>10}{'bytes':>11}{'gzip':>10}"
+                          f"{'br' if brotli is not None else '':>10}")
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for name in options["endpoint"] or ENDPOINTS:
+                url_name, params = ENDPOINTS[name]
+                data = self.payload(reverse(url_name), params(sample))
+                for label, renderer in renderers.items():
+                    self.stdout.write(f"{name:<22}{label:<9}"
+                                      + self.measure(renderer, data, options["repeat"], config))
+
+    @staticmethod
+    def payload(path, params):
+        """
+        The view's response data, before rendering.
+        """
+        # A unique parameter skips the response cache, which stores rendered bytes.
+        response = Client(raise_request_exception=False).get(path, {**params, "_bench": time.time_ns()})
+        if response.status_code != 200 or not hasattr(response, "data"):
+            raise CommandError(f"GET {path} returned {response.status_code}.")
+        return response.data
+
+    @staticmethod
+    def measure(renderer, data, repeat, config):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            content = renderer.render(data)
+        elapsed_ms = (time.perf_counter() - started) / repeat * 1000
+
+        gzipped = len(gzip.compress(content, compresslevel=config["GZIP_LEVEL"], mtime=0))
+        brotlied = f"{len(brotli.compress(content, quality=config['BROTLI_QUALITY'])):>10,}" if brotli else ""
+        return f"{elapsed_ms:>10.2f}{len(content):>11,}{gzipped:>10,}{brotlied}"
@@ -0,0 +1,62 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from chelsea.benchmark import ENDPOINTS, compare_reports, run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every endpoint in chelsea/api/urls.py against the configured database and "
+        "write throughput, latency percentiles, SQL query counts and peak memory to a JSON "
+        "report. Vote endpoints write real votes, so use a scratch (e.g. seed_synthetic) database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Timed requests per endpoint.")
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument("--cache", choices=["cold", "warm"], default="cold",
+                            help="cold: every GET misses the response cache; warm: responses may be cached.")
+        parser.add_argument("--endpoint", action="append", choices=sorted(ENDPOINTS),
+                            help="Route name to benchmark (repeatable). Defaults to all.")
+        parser.add_argument("--output", help="Report path. Defaults to var/benchmarks/<timestamp>.json.")
+        parser.add_argument("--compare", help="Earlier report to compare this run against.")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["compare"]:
+            try:
+                baseline = json.loads(Path(options["compare"]).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read {options['compare']}: {exc}")
+
+        # Run as in production (DEBUG would log every query) and accept the
+        # test client's "Host: testserver", as the test runner does. Every
+        # vote comes from one client, so the vote rate limits are lifted.
+        with override_settings(DEBUG=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                               RATE_LIMIT={"ENABLED": False}):
+            try:
+                report = run_benchmark(
+                    requests=options["requests"], concurrency=options["concurrency"], cache=options["cache"],
+                    only=options["endpoint"], log=self.stdout.write,
+                )
+            except ValueError as exc:
+                raise CommandError(str(exc))
+
+        for name, reason in report["skipped"].items():
+            self.stderr.write(f"skipped {name}: {reason}")
+
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = Path(options["output"] or Path(settings.BASE_DIR) / "var" / "benchmarks" / f"{stamp}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Report written to {output}"))
+
+        if baseline is not None:
+            self.stdout.write(f"Compared with {options['compare']}:")
+            for line in compare_reports(baseline, report):
+                self.stdout.write(line)
@@ -0,0 +1,18 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from chelsea.vote_buffer import buffer_settings, recover_spool
+
+
+class Command(BaseCommand):
+    help = "Replay vote spool files left behind by stopped or crashed workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--spool-dir", help="Defaults to settings.VOTE_BUFFER['SPOOL_DIR'].")
+
+    def handle(self, *args, **options):
+        config = buffer_settings()
+        spool_dir = Path(options["spool_dir"] or config["SPOOL_DIR"])
+        stored = recover_spool(spool_dir, config["BATCH_SIZE"])
+        self.stdout.write(self.style.SUCCESS(f"Replayed {stored} spooled votes from {spool_dir}."))
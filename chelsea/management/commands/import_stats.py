@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chelsea.importers import IMPORTERS, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream a CSV or NDJSON file of players, managers or seasons into the database. "
+        "Rows are validated with the API serializers and upserted in chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "ndjson"],
+                            help="Input format. Defaults to csv for *.csv files, ndjson otherwise.")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--max-errors", type=int, default=20,
+                            help="Number of rejected rows to print before going quiet.")
+
+    def handle(self, *args, **options):
+        kind, path = options["kind"], options["path"]
+        printed = 0
+
+        def on_error(line_no, detail):
+            nonlocal printed
+            if printed < options["max_errors"]:
+                self.stderr.write(f"line {line_no}: {detail}")
+            printed += 1
+
+        started = time.perf_counter()
+        try:
+            written, rejected = IMPORTERS[kind]().run(
+                read_records(path, options["format"]), chunk_size=options["chunk_size"], on_error=on_error
+            )
+        except FileNotFoundError:
+            raise CommandError(f"File not found: {path}")
+        elapsed = time.perf_counter() - started
+
+        rate = (written + rejected) / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {written} {kind} ({rejected} rejected) in {elapsed:.2f}s, {rate:,.0f} rows/sec."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from chelsea.aggregates import refresh_career_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute every player's career aggregates from the Season table."
+
+    def handle(self, *args, **options):
+        rows = refresh_career_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} career stats rows."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from chelsea.votes import reconcile_vote_counts
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalized player/manager vote counters from the Vote table."
+
+    def handle(self, *args, **options):
+        players, managers = reconcile_vote_counts()
+        self.stdout.write(self.style.SUCCESS(
+            f"Vote counters reconciled ({players} players and {managers} managers corrected)."
+        ))
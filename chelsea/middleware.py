@@ -0,0 +1,218 @@
+import gzip
+import logging
+import re
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+from .cache import response_cache
+from .db_router import SAFE_METHODS, begin_request, replica_aliases, routing_settings
+from .instrumentation import current_timings, end_request, get_request_metrics, logger, metrics_settings, start_request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class RequestMetricsMiddleware:
+    """
+    Time every request (SQL queries and DB time, serializer time, view time)
+    and report it in a Server-Timing header, a "chelsea.requests" log line
+    and the per-endpoint histograms of /metrics/requests/.
+
+    Place it first in MIDDLEWARE so "total" covers the other middleware.
+    The view time runs from process_view until the response comes back, so
+    it includes DRF's response rendering. Handles sync and async requests
+    natively; see chelsea.instrumentation.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = metrics_settings()
+        if not config["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_query = config["SLOW_QUERY_MS"] / 1000
+        self.server_timing = config["SERVER_TIMING"]
+        self.metrics = get_request_metrics()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings, token = start_request(self.slow_query)
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings, token = start_request(self.slow_query)
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        return self.finish(request, response, timings)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = current_timings()
+        if timings is not None:
+            timings.view_name = request.resolver_match.view_name
+            timings.view_started = time.perf_counter()
+
+    def finish(self, request, response, timings):
+        now = time.perf_counter()
+        total = now - timings.started
+        if timings.view_started is not None:
+            timings.view = now - timings.view_started
+        endpoint = f"{request.method} {timings.view_name or 'unresolved'}"
+
+        if self.server_timing:
+            response["Server-Timing"] = timings.server_timing(total)
+        self.metrics.record(endpoint, timings, total, response.status_code)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "%s %s %s %.1fms queries=%d db=%.1fms serialize=%.1fms view=%.1fms",
+                request.method, request.path, response.status_code, total * 1000, timings.queries,
+                timings.db * 1000, timings.serializer * 1000, timings.view * 1000,
+                extra={
+                    "method": request.method,
+                    "path": request.path,
+                    "view_name": timings.view_name,
+                    "status": response.status_code,
+                    "total_ms": round(total * 1000, 2),
+                    "view_ms": round(timings.view * 1000, 2),
+                    "db_ms": round(timings.db * 1000, 2),
+                    "queries": timings.queries,
+                    "serializer_ms": round(timings.serializer * 1000, 2),
+                },
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Brotli (when installed) or gzip for responses of at least MIN_SIZE bytes,
+    as the client's Accept-Encoding allows. Streaming responses (exports,
+    the SSE leaderboard) are left alone so they keep flushing row by row.
+
+    Compressed responses get a weak ETag, as with Django's GZipMiddleware;
+    CachedResponseMixin compares If-None-Match weakly, so they still
+    revalidate to 304.
+
+    A strong ETag identifies the exact body (see CachedResponseMixin), so
+    the compressed body is kept in the response cache under it; cache hits
+    are then sent without being compressed again on every request.
+    """
+    sync_capable = True
+    async_capable = True
+    accepts = re.compile(r"\b(br|gzip)\b(?!\s*;\s*q=0(?:\.0*)?\s*(?:,|$))")
+    defaults = {"MIN_SIZE": 1024, "GZIP_LEVEL": 6, "BROTLI_QUALITY": 4}
+
+    def __init__(self, get_response):
+        config = {**self.defaults, **getattr(settings, "COMPRESSION", {})}
+        self.min_size = config["MIN_SIZE"]
+        self.gzip_level = config["GZIP_LEVEL"]
+        self.brotli_quality = config["BROTLI_QUALITY"]
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def choose_encoding(self, request):
+        offered = set(self.accepts.findall(request.META.get("HTTP_ACCEPT_ENCODING", "")))
+        if "br" in offered and brotli is not None:
+            return "br"
+        return "gzip" if "gzip" in offered else None
+
+    def compress(self, request, response):
+        if response.streaming or response.has_header("Content-Encoding") or len(response.content) < self.min_size:
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = self.choose_encoding(request)
+        if encoding is None:
+            return response
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            cache, key = response_cache(), f"compressed:{encoding}:{etag}"
+            content = cache.get(key)
+            if content is None:
+                content = self.encode(response.content, encoding)
+                cache.set(key, content)
+        else:
+            content = self.encode(response.content, encoding)
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response["Content-Length"] = str(len(content))
+        response["Content-Encoding"] = encoding
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
+
+    def encode(self, content, encoding):
+        if encoding == "br":
+            return brotli.compress(content, quality=self.brotli_quality)
+        return gzip.compress(content, compresslevel=self.gzip_level, mtime=0)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe requests read from the replicas (see chelsea.db_router) and
+    keep a client's reads on the primary for STICKY_SECONDS after each of
+    its unsafe requests, through a cookie. Does nothing without replicas.
+    Place it before anything that queries the database.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        config = routing_settings()
+        self.sticky_seconds = config["STICKY_SECONDS"]
+        self.cookie = config["COOKIE"]
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self.begin(request)
+        return self.finish(request, self.get_response(request), state)
+
+    async def __acall__(self, request):
+        state = self.begin(request)
+        return self.finish(request, await self.get_response(request), state)
+
+    def is_sticky(self, request):
+        try:
+            return float(request.COOKIES.get(self.cookie, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def begin(self, request):
+        return begin_request(use_replica=request.method in SAFE_METHODS and not self.is_sticky(request))
+
+    def finish(self, request, response, state):
+        if state.wrote or request.method not in SAFE_METHODS:
+            response.set_cookie(self.cookie, f"{time.time() + self.sticky_seconds:.3f}",
+                                max_age=max(int(self.sticky_seconds), 1), httponly=True, samesite="Lax")
+        return response
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.6 on 2025-03-04 21:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_vote_counts(apps, schema_editor):
+    Vote = apps.get_model('chelsea', 'Vote')
+    for model_name, field in (('Player', 'player'), ('Manager', 'manager')):
+        model = apps.get_model('chelsea', model_name)
+        votes = (
+            Vote.objects.filter(**{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        model.objects.update(vote_count=Coalesce(Subquery(votes), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chelsea', '0004_season_ground_duels_won_pct_season_recoveries_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='manager',
+            name='vote_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='vote_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_vote_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chelsea', '0005_player_manager_vote_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vote',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:06
+
+from collections import Counter, defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of the career aggregate as of this migration, so later changes to
+# chelsea.aggregates or the models can't alter what it does.
+SUM_FIELDS = ('goals', 'assists', 'matches', 'minutes_played', 'tackles', 'recoveries')
+PER_90_FIELDS = ('goals', 'assists', 'tackles', 'recoveries')
+
+
+def backfill_career_stats(apps, schema_editor):
+    Season = apps.get_model('chelsea', 'Season')
+    PlayerCareerStats = apps.get_model('chelsea', 'PlayerCareerStats')
+
+    def build(totals):
+        minutes = totals['minutes_played']
+        return PlayerCareerStats(
+            player_id=totals['player_id'],
+            competition_id=totals['competition_id'],
+            seasons=totals['seasons'],
+            ground_duels_won_pct=round(totals['weighted_duels'] / minutes, 2) if minutes else 0,
+            **{field: totals[field] for field in SUM_FIELDS},
+            **{f'{field}_per_90': round(totals[field] * 90 / minutes, 3) if minutes else 0
+               for field in PER_90_FIELDS},
+        )
+
+    groups = (
+        Season.objects.order_by()
+        .values('player_id', 'competition_id')
+        .annotate(
+            seasons=models.Count('id'),
+            weighted_duels=models.Sum(
+                models.F('ground_duels_won_pct') * models.F('minutes_played'), output_field=models.FloatField()
+            ),
+            **{field: models.Sum(field) for field in SUM_FIELDS},
+        )
+    )
+    rows = []
+    careers = defaultdict(Counter)
+    for group in groups:
+        group['weighted_duels'] = group['weighted_duels'] or 0
+        rows.append(build(group))
+        career = careers[group['player_id']]
+        for field in ('seasons', 'weighted_duels', *SUM_FIELDS):
+            career[field] += group[field]
+    for player_id, career in careers.items():
+        rows.append(build({**career, 'player_id': player_id, 'competition_id': None}))
+    PlayerCareerStats.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chelsea', '0006_vote_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerCareerStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seasons', models.IntegerField(default=0)),
+                ('goals', models.IntegerField(default=0)),
+                ('assists', models.IntegerField(default=0)),
+                ('matches', models.IntegerField(default=0)),
+                ('minutes_played', models.IntegerField(default=0)),
+                ('tackles', models.IntegerField(default=0)),
+                ('recoveries', models.IntegerField(default=0)),
+                ('ground_duels_won_pct', models.FloatField(default=0)),
+                ('goals_per_90', models.FloatField(default=0)),
+                ('assists_per_90', models.FloatField(default=0)),
+                ('tackles_per_90', models.FloatField(default=0)),
+                ('recoveries_per_90', models.FloatField(default=0)),
+                ('competition', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='career_stats', to='chelsea.competition')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='career_stats', to='chelsea.player')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('player', 'competition'), name='unique_career_stats_per_player_and_competition'), models.UniqueConstraint(condition=models.Q(('competition__isnull', True)), fields=('player',), name='unique_career_totals_per_player')],
+            },
+        ),
+        migrations.RunPython(backfill_career_stats, migrations.RunPython.noop),
+    ]
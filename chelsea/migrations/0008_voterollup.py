@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chelsea', '0007_playercareerstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoteRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('manager', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='vote_rollups', to='chelsea.manager')),
+                ('player', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='vote_rollups', to='chelsea.player')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('player__isnull', False)), fields=('granularity', 'bucket', 'player'), name='unique_player_vote_rollup'), models.UniqueConstraint(condition=models.Q(('manager__isnull', False)), fields=('granularity', 'bucket', 'manager'), name='unique_manager_vote_rollup')],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:09
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chelsea', '0008_voterollup'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vote',
+            name='manager',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='chelsea.manager'),
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='player',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='chelsea.player'),
+        ),
+        migrations.AddIndex(
+            model_name='manager',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='manager_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='player_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['position'], name='player_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='season',
+            index=models.Index(fields=['competition', 'year'], name='season_competition_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='season',
+            index=models.Index(fields=['manager', 'competition'], name='season_manager_comp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['player', 'timestamp'], name='vote_player_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['manager', 'timestamp'], name='vote_manager_timestamp_idx'),
+        ),
+    ]
@@ -0,0 +1,130 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:35
+
+import re
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+RATIO = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+
+
+def parse_ratio(value):
+    """
+    "successful/attempted" -> (successful, attempted), the importer's rule
+    (chelsea.importers.parse_ratio): a bare number counts as that many
+    successful attempts, a blank as nothing attempted. Returns None for
+    anything else, including more successes than attempts.
+    """
+    value = str(value or "").strip()
+    match = RATIO.match(value)
+    if match:
+        successful, attempted = int(match.group(1)), int(match.group(2))
+        return (successful, attempted) if successful <= attempted else None
+    if value.isdigit():
+        return int(value), int(value)
+    return (0, 0) if not value else None
+
+
+def split_duel_strings(apps, schema_editor):
+    Player = apps.get_model("chelsea", "Player")
+    players = list(Player.objects.only("take_ons", "aerial_duels_won"))
+    invalid = []
+    for player in players:
+        take_ons, aerial_duels = parse_ratio(player.take_ons), parse_ratio(player.aerial_duels_won)
+        if take_ons is None or aerial_duels is None:
+            invalid.append(f"#{player.pk}: take_ons={player.take_ons!r}, aerial_duels_won={player.aerial_duels_won!r}")
+            continue
+        player.take_ons_successful, player.take_ons_attempted = take_ons
+        player.aerial_duels_won_count, player.aerial_duels_attempted = aerial_duels
+    if invalid:
+        raise ValueError(
+            f"{len(invalid)} player(s) have duel stats that aren't 'successful/attempted' with "
+            f"successful <= attempted; fix them and migrate again:\n" + "\n".join(invalid[:20])
+        )
+    Player.objects.bulk_update(
+        players,
+        ["take_ons_successful", "take_ons_attempted", "aerial_duels_won_count", "aerial_duels_attempted"],
+        batch_size=1000,
+    )
+
+
+def join_duel_strings(apps, schema_editor):
+    Player = apps.get_model("chelsea", "Player")
+    players = list(Player.objects.only(
+        "take_ons_successful", "take_ons_attempted", "aerial_duels_won_count", "aerial_duels_attempted"
+    ))
+    for player in players:
+        player.take_ons = f"{player.take_ons_successful}/{player.take_ons_attempted}"
+        player.aerial_duels_won = f"{player.aerial_duels_won_count}/{player.aerial_duels_attempted}"
+    Player.objects.bulk_update(players, ["take_ons", "aerial_duels_won"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chelsea', '0009_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='take_ons_attempted',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='take_ons_successful',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='aerial_duels_attempted',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='aerial_duels_won_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(split_duel_strings, join_duel_strings),
+        migrations.RemoveField(
+            model_name='player',
+            name='take_ons',
+        ),
+        migrations.RemoveField(
+            model_name='player',
+            name='aerial_duels_won',
+        ),
+        migrations.RenameField(
+            model_name='player',
+            old_name='aerial_duels_won_count',
+            new_name='aerial_duels_won',
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='aerial_duel_success_rate',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(aerial_duels_attempted__gt=0, then=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(models.F('aerial_duels_won'), models.FloatField()), '*', models.Value(100.0)), '/', models.F('aerial_duels_attempted'))), default=models.Value(0.0), output_field=models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='take_on_success_rate',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(take_ons_attempted__gt=0, then=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(models.F('take_ons_successful'), models.FloatField()), '*', models.Value(100.0)), '/', models.F('take_ons_attempted'))), default=models.Value(0.0), output_field=models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['position', '-take_on_success_rate'], name='player_pos_take_on_rate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['position', '-aerial_duel_success_rate'], name='player_pos_aerial_rate_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='player',
+            constraint=models.CheckConstraint(condition=models.Q(('take_ons_successful__lte', models.F('take_ons_attempted'))), name='take_ons_successful_lte_attempted'),
+        ),
+        migrations.AddConstraint(
+            model_name='player',
+            constraint=models.CheckConstraint(condition=models.Q(('aerial_duels_won__lte', models.F('aerial_duels_attempted'))), name='aerial_duels_won_lte_attempted'),
+        ),
+    ]
@@ -1,4 +1,31 @@
 from django.db import models
+from django.db.models.functions import Cast, Lower
+from django.utils import timezone
+
+
+class NamedQuerySet(models.QuerySet):
+    def name_iexact(self, name):
+        """
+        Case-insensitive name match written as LOWER(name) = lower(value),
+        so it can use the functional LOWER(name) index (iexact compiles to
+        UPPER() on PostgreSQL and LIKE on SQLite, which can't).
+        """
+        return self.alias(name_lower=Lower("name")).filter(name_lower=name.lower())
+
+
+def success_rate(successful, attempted):
+    """
+    successful / attempted as a percentage, 0 when nothing was attempted,
+    computed by the database (see the *_success_rate GeneratedFields).
+    """
+    return models.Case(
+        models.When(
+            **{f"{attempted}__gt": 0},
+            then=Cast(models.F(successful), models.FloatField()) * 100.0 / models.F(attempted),
+        ),
+        default=models.Value(0.0),
+        output_field=models.FloatField(),
+    )
 
 
 class Manager(models.Model):
@@ -21,6 +48,10 @@ class Manager(models.Model):
     biggest_win = models.CharField(max_length=100, null=True, blank=True)  # E.g., "6-0 vs Arsenal (2021)"
     biggest_loss = models.CharField(max_length=100, null=True, blank=True)  # E.g., "0-4 vs Man Utd (2020)"
 
+    # Denormalized vote counter, maintained by chelsea.votes.record_vote
+    vote_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = NamedQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -30,6 +61,11 @@ class Manager(models.Model):
         total_games = self.games_won + self.games_drawn + self.games_lost
         return (self.games_won / total_games) * 100 if total_games > 0 else 0
 
+    class Meta:
+        indexes = [
+            models.Index(Lower("name"), name="manager_name_lower_idx"),
+        ]
+
 
 class Player(models.Model):
     name = models.CharField(max_length=100, unique=True)  # Ensures no duplicate players
@@ -38,18 +74,51 @@ class Player(models.Model):
     age = models.IntegerField()
     start_year = models.IntegerField()  # Year the player joined Chelsea
     end_year = models.IntegerField(null=True, blank=True)
-    take_ons = models.CharField(default=0 ,max_length=10)  # Store as "2/2" or "4/4"
-    aerial_duels_won = models.CharField(default=0, max_length=10)
+    take_ons_attempted = models.PositiveIntegerField(default=0)
+    take_ons_successful = models.PositiveIntegerField(default=0)
+    aerial_duels_attempted = models.PositiveIntegerField(default=0)
+    aerial_duels_won = models.PositiveIntegerField(default=0)
+    # Percentages stored by the database, so they can be filtered, sorted and indexed
+    take_on_success_rate = models.GeneratedField(
+        expression=success_rate("take_ons_successful", "take_ons_attempted"),
+        output_field=models.FloatField(), db_persist=True,
+    )
+    aerial_duel_success_rate = models.GeneratedField(
+        expression=success_rate("aerial_duels_won", "aerial_duels_attempted"),
+        output_field=models.FloatField(), db_persist=True,
+    )
     photo_url = models.URLField(blank=True, null=True)# Year the player left Chelsea (null if still at Chelsea)
+    vote_count = models.PositiveIntegerField(default=0, editable=False)  # Maintained by chelsea.votes.record_vote
     POSITION_CHOICES = [
         ("GK", "Goalkeeper"),
         ("DEF", "Defender"),
         ("MID", "Midfielder"),
         ("FWD", "Forward"),
     ]
+
+    objects = NamedQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
+    class Meta:
+        indexes = [
+            models.Index(Lower("name"), name="player_name_lower_idx"),
+            models.Index(fields=["position"], name="player_position_idx"),
+            models.Index(fields=["position", "-take_on_success_rate"], name="player_pos_take_on_rate_idx"),
+            models.Index(fields=["position", "-aerial_duel_success_rate"], name="player_pos_aerial_rate_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(take_ons_successful__lte=models.F("take_ons_attempted")),
+                name="take_ons_successful_lte_attempted",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(aerial_duels_won__lte=models.F("aerial_duels_attempted")),
+                name="aerial_duels_won_lte_attempted",
+            ),
+        ]
+
 
 class Season(models.Model):
     player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="seasons")
@@ -75,6 +144,51 @@ class Season(models.Model):
                 name='unique_season_per_player_and_competition'
             )
         ]
+        indexes = [
+            models.Index(fields=["competition", "year"], name="season_competition_year_idx"),
+            models.Index(fields=["manager", "competition"], name="season_manager_comp_idx"),
+        ]
+
+
+class PlayerCareerStats(models.Model):
+    """
+    Career totals per player and competition, derived from Season rows.
+    The row with competition=None holds the all-competition totals.
+    Maintained by chelsea.aggregates; never edit by hand.
+    """
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="career_stats")
+    competition = models.ForeignKey('Competition', on_delete=models.CASCADE, related_name="career_stats",
+                                    null=True, blank=True)
+    seasons = models.IntegerField(default=0)
+    goals = models.IntegerField(default=0)
+    assists = models.IntegerField(default=0)
+    matches = models.IntegerField(default=0)
+    minutes_played = models.IntegerField(default=0)
+    tackles = models.IntegerField(default=0)
+    recoveries = models.IntegerField(default=0)
+    ground_duels_won_pct = models.FloatField(default=0)  # Weighted by minutes played
+
+    # Rates per 90 minutes played
+    goals_per_90 = models.FloatField(default=0)
+    assists_per_90 = models.FloatField(default=0)
+    tackles_per_90 = models.FloatField(default=0)
+    recoveries_per_90 = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"{self.player_id} career stats ({self.competition_id or 'all competitions'})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['player', 'competition'],
+                name='unique_career_stats_per_player_and_competition'
+            ),
+            models.UniqueConstraint(
+                fields=['player'],
+                condition=models.Q(competition__isnull=True),
+                name='unique_career_totals_per_player'
+            ),
+        ]
 
 
 class Competition(models.Model):
@@ -87,9 +201,12 @@ class Competition(models.Model):
 
 
 class Vote(models.Model):
-    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="votes", null=True, blank=True)
-    manager = models.ForeignKey(Manager, on_delete=models.CASCADE, related_name="votes", null=True, blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)  # Tracks when the vote was cast
+    # Indexed through the (player, timestamp) / (manager, timestamp) composites below.
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="votes", null=True, blank=True,
+                               db_index=False)
+    manager = models.ForeignKey(Manager, on_delete=models.CASCADE, related_name="votes", null=True, blank=True,
+                                db_index=False)
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)  # Tracks when the vote was cast
 
     def __str__(self):
         if self.player:
@@ -108,3 +225,43 @@ class Vote(models.Model):
                 name="only_one_of_player_or_manager",
             )
         ]
+        indexes = [
+            models.Index(fields=["player", "timestamp"], name="vote_player_timestamp_idx"),
+            models.Index(fields=["manager", "timestamp"], name="vote_manager_timestamp_idx"),
+        ]
+
+
+class VoteRollup(models.Model):
+    """
+    Number of votes an entity received in one hour or one day (UTC).
+    Maintained incrementally by chelsea.rollups as votes are recorded.
+    """
+    HOUR = "hour"
+    DAY = "day"
+    GRANULARITY_CHOICES = [
+        (HOUR, "Hour"),
+        (DAY, "Day"),
+    ]
+
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    bucket = models.DateTimeField()  # Start of the hour/day
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="vote_rollups", null=True, blank=True)
+    manager = models.ForeignKey(Manager, on_delete=models.CASCADE, related_name="vote_rollups", null=True, blank=True)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.player or self.manager}: {self.count} votes ({self.granularity} of {self.bucket})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['granularity', 'bucket', 'player'],
+                condition=models.Q(player__isnull=False),
+                name='unique_player_vote_rollup'
+            ),
+            models.UniqueConstraint(
+                fields=['granularity', 'bucket', 'manager'],
+                condition=models.Q(manager__isnull=False),
+                name='unique_manager_vote_rollup'
+            ),
+        ]
@@ -0,0 +1,131 @@
+"""
+Vote leaderboard ranks for every player and manager.
+
+Each model gets a RankIndex: a sorted list of (-vote_count, id) keys plus
+the id -> (name, votes) map, so an entity's rank ("#347 of 2,100") is a
+bisect and its neighbours a slice, instead of counting votes per request.
+Ties share a rank (1, 2, 2, 4): the rank is one plus the number of rows
+with strictly more votes.
+
+Votes recorded by this process are applied in place once they commit
+(apply_votes, called by chelsea.votes). The index also remembers the
+versions (see chelsea.cache) it reflects: the model's data version and its
+vote-counter version. Applying a vote bumps the vote-counter version and,
+if the bump lands exactly one step past the remembered one, the index
+moves along with it. Any other bump (another worker's votes, an edited or
+new row) leaves the index behind, and the next lookup rebuilds it with one
+query, at most once per REBUILD_INTERVAL.
+
+With a per-process response cache (LocMemCache) each worker only sees its
+own bumps, so an index that keeps moving along with its own votes would
+never pick up the other workers' votes. Lookups therefore also rebuild an
+index that is MAX_AGE old, whatever its versions say.
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.db import DEFAULT_DB_ALIAS
+
+from .cache import bump_version, get_versions, vote_scope
+from .models import Player, Manager
+
+REBUILD_INTERVAL = 1.0  # seconds a stale index may keep serving lookups
+MAX_AGE = 30.0  # seconds before an index is rebuilt even if it looks current
+
+
+class RankIndex:
+    def __init__(self, model, rebuild_interval=REBUILD_INTERVAL, max_age=MAX_AGE):
+        self.model = model
+        self.rebuild_interval = rebuild_interval
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._keys = []
+        self._rows = {}
+        self._version = None
+        self._built_at = None
+
+    # --- maintenance ------------------------------------------------------
+
+    def _rebuild(self, version):
+        # From the primary: the index is kept under `version`, which a lagging replica may not reflect yet.
+        rows = self.model.objects.using(DEFAULT_DB_ALIAS).order_by().values_list("pk", "name", "vote_count")
+        self._rows = {pk: (name, votes) for pk, name, votes in rows}
+        self._keys = sorted((-votes, pk) for pk, (name, votes) in self._rows.items())
+        self._version = version
+        self._built_at = time.monotonic()
+
+    def _is_current(self, version):
+        return version == self._version and time.monotonic() - self._built_at < self.max_age
+
+    def _sync(self):
+        versions = get_versions([self.model, vote_scope(self.model)])
+        version = (versions[self.model], versions[vote_scope(self.model)])
+        if self._is_current(version):
+            return
+        with self._lock:
+            if self._is_current(version):
+                return
+            fresh = self._built_at is not None and time.monotonic() - self._built_at < self.rebuild_interval
+            if not fresh:
+                self._rebuild(version)
+
+    def apply_votes(self, counts):
+        """
+        Add committed votes ({id: n}) and bump the model's vote-counter version.
+        """
+        if not counts:
+            return
+        scope = vote_scope(self.model)
+        with self._lock:
+            votes_version = bump_version(scope)[scope]
+            if (self._version is None or votes_version != self._version[1] + 1
+                    or not counts.keys() <= self._rows.keys()):
+                return
+            for pk, n in counts.items():
+                name, votes = self._rows[pk]
+                del self._keys[bisect_left(self._keys, (-votes, pk))]
+                insort(self._keys, (-(votes + n), pk))
+                self._rows[pk] = (name, votes + n)
+            self._version = (self._version[0], votes_version)
+
+    # --- lookups ----------------------------------------------------------
+
+    def _entry(self, pk):
+        name, votes = self._rows[pk]
+        return {"id": pk, "name": name, "votes": votes, "rank": bisect_left(self._keys, (-votes,)) + 1}
+
+    def rank(self, pk, neighbours=0):
+        """
+        {"id", "name", "votes", "rank", "total", "above", "below"} for one row,
+        with up to `neighbours` rows on each side; None if the id is unknown.
+        """
+        self._sync()
+        with self._lock:
+            if pk not in self._rows:
+                return None
+            entry = self._entry(pk)
+            position = bisect_left(self._keys, (-entry["votes"], pk))
+            above = self._keys[max(0, position - neighbours):position]
+            below = self._keys[position + 1:position + 1 + neighbours]
+            return {
+                **entry,
+                "total": len(self._keys),
+                "above": [self._entry(key_pk) for _, key_pk in above],
+                "below": [self._entry(key_pk) for _, key_pk in below],
+            }
+
+
+_indexes = {model: RankIndex(model) for model in (Player, Manager)}
+
+
+def rank_index(model):
+    return _indexes[model]
+
+
+def apply_votes(model, counts):
+    """
+    on_commit hook for recorded votes: update the model's RankIndex in place
+    and bump its vote-counter version.
+    """
+    rank_index(model).apply_votes(counts)
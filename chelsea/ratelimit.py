@@ -0,0 +1,296 @@
+"""
+Rate limiting and de-duplication for the vote endpoints.
+
+Every vote is checked against three sliding windows before any query runs:
+
+- IP: votes per client IP, whatever the token (a NAT's worth of users);
+- CLIENT: votes per client, i.e. IP plus the optional X-Client-Token header;
+- ENTITY: votes per client IP for one player / manager, configured per
+  entity kind. A limit of 1 makes repeated votes for the same entity
+  duplicates. The token is left out: it is chosen by the client, so
+  rotating it must not buy another vote.
+
+A vote is counted only if it passes every window, so rejected requests
+don't extend a client's lockout. Windows are sliding-window counters: the
+count of the current fixed window plus the previous window's, weighted by
+how much of it still overlaps the sliding window. That's O(1) memory and
+time per key, at the price of assuming the previous window's votes were
+evenly spread.
+
+Counters live in process memory (MemoryStore, sharded so concurrent
+requests rarely wait on the same lock) or, for limits shared by several
+workers, in Redis (RedisStore; "local-redis" runs it against the LocalRedis
+stand-in of chelsea.cache).
+"""
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.signals import setting_changed
+
+from .cache import LocalRedis
+
+DEFAULTS = {
+    "ENABLED": True,
+    "BACKEND": "memory",
+    "REDIS_URL": "redis://localhost:6379/2",
+    "IP": (300, 60),
+    "CLIENT": (30, 60),
+    "ENTITY": {"player": (1, 3600), "manager": (1, 3600)},
+    "SHARDS": 64,
+    "TOKEN_HEADER": "HTTP_X_CLIENT_TOKEN",
+    "PROXY_HOPS": 0,
+}
+
+Rule = namedtuple("Rule", "limit window")
+
+
+def ratelimit_settings():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "RATE_LIMIT", {}))
+    return config
+
+
+def _estimate(current, previous, now, window):
+    """
+    Sliding-window count at `now`, and the fraction of the current fixed
+    window already elapsed.
+    """
+    elapsed = now / window % 1
+    return previous * (1 - elapsed) + current, elapsed
+
+
+def _retry_after(current, previous, elapsed, rule):
+    """
+    Seconds until one more hit fits under the rule (a rule with limit 0 never
+    lets one through; the window length is returned).
+    """
+    room = rule.limit - 1
+    if room < 0:
+        return rule.window
+    if current > room:
+        # Wait for the next window, until the current one has decayed enough.
+        return ((1 - elapsed) + (1 - room / current)) * rule.window
+    # Wait for the previous window to decay enough.
+    return max((1 - (room - current) / previous) - elapsed, 0) * rule.window
+
+
+# ==============================
+# 🧮 COUNTER STORES
+# ==============================
+class _Shard:
+    __slots__ = ("lock", "counters", "inserts")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}  # key -> [fixed window index, current count, previous count, expiry]
+        self.inserts = 0
+
+
+class MemoryStore:
+    """
+    Sliding-window counters in process memory, spread over `shards`
+    independently locked dicts. All keys of one hit() live in the shard of
+    its `group` (the limiter groups by client IP), so a hit takes one lock;
+    a key must always be used with the same group. Expired counters are
+    swept from a shard every `sweep_every` new keys.
+    """
+
+    def __init__(self, shards=64, sweep_every=4096):
+        self._shards = [_Shard() for _ in range(shards)]
+        self.sweep_every = sweep_every
+
+    def hit(self, checks, now=None, group=None):
+        """
+        Count one hit for every (key, rule) of `checks` if all of them are
+        under their limit. Returns None if counted, else (position of the
+        first exceeded check, seconds until it would pass).
+        """
+        now = time.time() if now is None else now
+        shard = self._shards[hash(checks[0][0] if group is None else group) % len(self._shards)]
+        with shard.lock:
+            counters = shard.counters
+            found = []
+            for position, (key, rule) in enumerate(checks):
+                index = int(now // rule.window)
+                counter = counters.get(key)
+                if counter is None or counter[0] < index - 1:
+                    current = previous = 0
+                elif counter[0] < index:
+                    current, previous = 0, counter[1]
+                else:
+                    current, previous = counter[1], counter[2]
+                count, elapsed = _estimate(current, previous, now, rule.window)
+                if count + 1 > rule.limit:
+                    return position, _retry_after(current, previous, elapsed, rule)
+                found.append((key, index, current, previous, rule.window))
+
+            for key, index, current, previous, window in found:
+                if key not in counters:
+                    shard.inserts += 1
+                    if shard.inserts % self.sweep_every == 0:
+                        counters = shard.counters = self._sweep(counters, now)
+                counters[key] = [index, current + 1, previous, (index + 2) * window]
+            return None
+
+    @staticmethod
+    def _sweep(counters, now):
+        return {key: counter for key, counter in counters.items() if counter[3] > now}
+
+    def reset(self):
+        for shard in self._shards:
+            with shard.lock:
+                shard.counters.clear()
+
+
+class RedisStore:
+    """
+    Sliding-window counters in Redis, one INCR key per fixed window, shared
+    by every worker. One MGET round trip checks all windows and one pipeline
+    counts the hit. The check and the count aren't one atomic step, so
+    concurrent workers may admit a few votes over the limit.
+    """
+    prefix = "ratelimit:"
+
+    def __init__(self, client):
+        self.client = client
+
+    def _key(self, key, index):
+        return f"{self.prefix}{key}:{index}"
+
+    def hit(self, checks, now=None, group=None):
+        now = time.time() if now is None else now
+        indexes = [int(now // rule.window) for _, rule in checks]
+        keys = []
+        for (key, _), index in zip(checks, indexes):
+            keys.extend((self._key(key, index), self._key(key, index - 1)))
+        values = [int(value or 0) for value in self.client.mget(keys)]
+
+        for position, (_, rule) in enumerate(checks):
+            current, previous = values[2 * position], values[2 * position + 1]
+            count, elapsed = _estimate(current, previous, now, rule.window)
+            if count + 1 > rule.limit:
+                return position, _retry_after(current, previous, elapsed, rule)
+
+        pipeline = self.client.pipeline()
+        for (key, rule), index in zip(checks, indexes):
+            pipeline.incr(self._key(key, index))
+            pipeline.expire(self._key(key, index), 2 * rule.window)
+        pipeline.execute()
+        return None
+
+    def reset(self):
+        self.client.flushdb()
+
+
+def _redis_client(url):
+    import redis
+
+    return redis.Redis.from_url(url)
+
+
+STORES = {
+    "memory": lambda config: MemoryStore(shards=config["SHARDS"]),
+    "redis": lambda config: RedisStore(_redis_client(config["REDIS_URL"])),
+    "local-redis": lambda config: RedisStore(LocalRedis.shared("local://chelsea-ratelimit")),
+}
+
+
+# ==============================
+# 🗳️ VOTE LIMITER
+# ==============================
+def vote_target(data):
+    """
+    "player:<id>" / "manager:<id>" for a vote payload (CastVoteView's
+    player_id / manager_id, or VoteComparisonView's vote_for), else None.
+    The id is normalised with int(), as the vote writers do, so "5", "05"
+    and 5.0 share one key; ids int() rejects get no entity check (the
+    vote itself is refused).
+    """
+    if not isinstance(data, dict):
+        return None
+    for kind, field in (("player", "vote_for"), ("player", "player_id"), ("manager", "manager_id")):
+        value = data.get(field)
+        if value:
+            try:
+                return f"{kind}:{int(value)}"
+            except (TypeError, ValueError, OverflowError):
+                return None
+    return None
+
+
+class VoteRateLimiter:
+    def __init__(self, store, ip_rule, client_rule, entity_rules, token_header="HTTP_X_CLIENT_TOKEN",
+                 proxy_hops=0):
+        self.store = store
+        self.ip_rule = Rule(*ip_rule)
+        self.client_rule = Rule(*client_rule)
+        self.entity_rules = {kind: Rule(*rule) for kind, rule in entity_rules.items()}
+        self.token_header = token_header
+        self.proxy_hops = proxy_hops
+
+    def client_ip(self, meta):
+        """
+        REMOTE_ADDR, or with `proxy_hops` trusted proxies in front of the app,
+        the address the outermost of them saw in X-Forwarded-For.
+        """
+        if self.proxy_hops:
+            forwarded = [ip.strip() for ip in meta.get("HTTP_X_FORWARDED_FOR", "").split(",") if ip.strip()]
+            if len(forwarded) >= self.proxy_hops:
+                return forwarded[-self.proxy_hops]
+        return meta.get("REMOTE_ADDR", "")
+
+    def check(self, meta, data):
+        """
+        Count a vote from the request with these META headers and payload.
+        Returns None if allowed, else the seconds to wait before retrying.
+        """
+        ip = self.client_ip(meta)
+        client = f"{ip}|{meta.get(self.token_header, '')[:64]}"
+        checks = [(f"ip:{ip}", self.ip_rule), (f"client:{client}", self.client_rule)]
+        target = vote_target(data)
+        if target is not None:
+            rule = self.entity_rules.get(target.partition(":")[0])
+            if rule is not None:
+                checks.append((f"entity:{ip}|{target}", rule))
+        rejected = self.store.hit(checks, group=ip)
+        return None if rejected is None else rejected[1]
+
+
+_limiter = None  # False once settings said disabled
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """
+    Return the process-wide limiter, or None when rate limiting is disabled.
+    """
+    global _limiter
+    if _limiter is not None:
+        return _limiter or None
+
+    config = ratelimit_settings()
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = config["ENABLED"] and VoteRateLimiter(
+                STORES[config["BACKEND"]](config),
+                config["IP"], config["CLIENT"], config["ENTITY"],
+                token_header=config["TOKEN_HEADER"], proxy_hops=config["PROXY_HOPS"],
+            )
+    return _limiter or None
+
+
+def reset_rate_limiter(**kwargs):
+    """
+    Drop the limiter (and its counters); the next request builds a new one
+    from the current settings.
+    """
+    global _limiter
+    if kwargs.get("setting", "RATE_LIMIT") != "RATE_LIMIT":
+        return
+    with _limiter_lock:
+        _limiter = None
+
+
+setting_changed.connect(reset_rate_limiter, dispatch_uid="reset-rate-limiter")
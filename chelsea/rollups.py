@@ -0,0 +1,145 @@
+"""
+Hourly and daily vote rollups.
+
+Every recorded vote increments one hourly and one daily VoteRollup bucket,
+so a sliding-window leaderboard only sums a few dozen buckets per entity
+instead of range-scanning the Vote table. Buckets are UTC-aligned, which
+makes windows accurate to the hour.
+"""
+import re
+from collections import Counter
+from datetime import timedelta, timezone
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone as dj_timezone
+
+from .cache import bump_version
+from .models import Vote, VoteRollup
+
+WINDOW_PATTERN = re.compile(r"^(\d+)([hd])$")
+MAX_WINDOW = timedelta(days=366)
+
+
+def hour_bucket(ts):
+    return ts.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(ts):
+    return ts.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _increment(granularity, bucket, player_id, manager_id, n):
+    lookup = {"granularity": granularity, "bucket": bucket, "player_id": player_id, "manager_id": manager_id}
+    if VoteRollup.objects.filter(**lookup).update(count=F("count") + n):
+        return
+    try:
+        with transaction.atomic():
+            VoteRollup.objects.create(count=n, **lookup)
+    except IntegrityError:
+        # Another writer created the bucket first.
+        VoteRollup.objects.filter(**lookup).update(count=F("count") + n)
+
+
+def record_rollups(votes):
+    """
+    Add (player_id, manager_id, timestamp) votes to their hourly and daily
+    buckets, with one UPDATE (or INSERT) per distinct bucket and entity.
+    """
+    buckets = Counter()
+    for player_id, manager_id, ts in votes:
+        buckets[(VoteRollup.HOUR, hour_bucket(ts), player_id, manager_id)] += 1
+        buckets[(VoteRollup.DAY, day_bucket(ts), player_id, manager_id)] += 1
+
+    with transaction.atomic():
+        for (granularity, bucket, player_id, manager_id), n in buckets.items():
+            _increment(granularity, bucket, player_id, manager_id, n)
+        transaction.on_commit(partial(bump_version, VoteRollup))
+
+
+def backfill_rollups(since=None):
+    """
+    Rebuild the buckets from the Vote table (from `since` onwards, if given).
+    Returns the number of buckets written.
+    """
+    votes = Vote.objects.all()
+    rollups = VoteRollup.objects.all()
+    if since is not None:
+        since = day_bucket(since)
+        votes = votes.filter(timestamp__gte=since)
+        rollups = rollups.filter(bucket__gte=since)
+
+    rows = []
+    for granularity, trunc in ((VoteRollup.HOUR, TruncHour), (VoteRollup.DAY, TruncDay)):
+        groups = (
+            votes.order_by()
+            .annotate(bucket=trunc("timestamp", tzinfo=timezone.utc))
+            .values("bucket", "player_id", "manager_id")
+            .annotate(count=Count("id"))
+        )
+        rows.extend(VoteRollup(granularity=granularity, **group) for group in groups.iterator())
+
+    with transaction.atomic():
+        rollups.delete()
+        VoteRollup.objects.bulk_create(rows, batch_size=1000)
+        transaction.on_commit(partial(bump_version, VoteRollup))
+    return len(rows)
+
+
+def parse_window(value):
+    """
+    Parse "1h", "24h", "7d", "36h"... into a timedelta. Raises ValueError.
+    """
+    match = WINDOW_PATTERN.match(value or "")
+    if not match:
+        raise ValueError(f"Invalid window '{value}'. Use a number of hours or days, e.g. '24h' or '7d'.")
+    amount, unit = int(match.group(1)), match.group(2)
+    window = timedelta(hours=amount) if unit == "h" else timedelta(days=amount)
+    if not timedelta(0) < window <= MAX_WINDOW:
+        raise ValueError(f"Window must be between 1h and {MAX_WINDOW.days}d.")
+    return window
+
+
+def window_filter(window, now=None):
+    """
+    Q object selecting the buckets that cover [now - window, now]: hourly
+    buckets for the partial days at both ends, daily buckets in between.
+    """
+    now = now or dj_timezone.now()
+    start = hour_bucket(now - window)
+    end = hour_bucket(now)
+    first_day = day_bucket(start) + timedelta(days=1) if start != day_bucket(start) else start
+    last_day = day_bucket(end)
+
+    if first_day >= last_day:
+        return Q(granularity=VoteRollup.HOUR, bucket__gte=start, bucket__lte=end)
+    return (
+        Q(granularity=VoteRollup.HOUR, bucket__gte=start, bucket__lt=first_day)
+        | Q(granularity=VoteRollup.DAY, bucket__gte=first_day, bucket__lt=last_day)
+        | Q(granularity=VoteRollup.HOUR, bucket__gte=last_day, bucket__lte=end)
+    )
+
+
+def _trending_rows(kind, window, limit, now):
+    return (
+        VoteRollup.objects.filter(window_filter(window, now), **{f"{kind}__isnull": False})
+        .values_list(f"{kind}_id", f"{kind}__name")
+        .annotate(votes=Sum("count"))
+        .order_by("-votes", f"{kind}_id")[:limit]
+    )
+
+
+def trending(kind, window, limit=10, now=None):
+    """
+    Most voted players or managers ("player" / "manager") over the window,
+    as dicts with id, name and votes.
+    """
+    rows = _trending_rows(kind, window, limit, now)
+    return [{"id": pk, "name": name, "votes": votes} for pk, name, votes in rows]
+
+
+async def atrending(kind, window, limit=10, now=None):
+    rows = _trending_rows(kind, window, limit, now)
+    return [{"id": pk, "name": name, "votes": votes} async for pk, name, votes in rows]
@@ -0,0 +1,174 @@
+"""
+In-memory name search for players and managers.
+
+Each model gets a NameIndex holding every name folded to lowercase ASCII
+("José Mourinho" -> "jose mourinho"), a sorted list of word-boundary
+suffixes for prefix autocomplete, and pg_trgm-style trigram posting lists
+for typo-tolerant matching. Lookups never touch the database.
+
+The index remembers the model's name version (see chelsea.cache) it was
+built from and is rebuilt, with one query, on the first lookup after a
+row write bumps that version. Votes only move the vote counters, so they
+leave the index alone.
+
+With a per-process response cache (LocMemCache) a write handled by another
+worker never bumps this worker's version, so snapshots are also rebuilt
+once they are MAX_AGE old, and resolve() checks the database for names the
+index doesn't know.
+"""
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.functions import Lower
+
+from .cache import get_name_version
+from .models import Player, Manager
+
+TRIGRAM_THRESHOLD = 0.5
+PREFIX_CANDIDATES = 200
+EXACT_SCORE, NAME_PREFIX_SCORE, WORD_PREFIX_SCORE = 1.0, 0.9, 0.8
+MAX_AGE = 60.0  # seconds a snapshot is served before it is rebuilt anyway
+
+
+def normalize(name):
+    """
+    Fold a name for matching: strip accents, casefold, collapse whitespace.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def trigrams(text):
+    """
+    pg_trgm trigrams: each word padded with two spaces in front and one behind.
+    """
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _Snapshot:
+    """
+    Immutable lookup structures built from one read of the name column.
+    """
+
+    def __init__(self, rows):
+        self.names = {}
+        self.exact = {}
+        self.postings = defaultdict(list)
+        suffixes = []
+
+        for pk, name in sorted(rows):
+            folded = normalize(name)
+            self.names[pk] = name
+            self.exact.setdefault(folded, pk)
+            words = folded.split(" ")
+            for i in range(len(words)):
+                suffixes.append((" ".join(words[i:]), pk, i == 0))
+            for gram in trigrams(folded):
+                self.postings[gram].append(pk)
+
+        suffixes.sort()
+        self.suffixes = suffixes
+
+
+class NameIndex:
+    def __init__(self, model, max_age=MAX_AGE):
+        self.model = model
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._version = None
+        self._built_at = None
+
+    def _is_current(self, version):
+        return version == self._version and time.monotonic() - self._built_at < self.max_age
+
+    def snapshot(self):
+        version = get_name_version(self.model)
+        if not self._is_current(version):
+            with self._lock:
+                if not self._is_current(version):
+                    # From the primary, which surely reflects `version` (see chelsea.db_router).
+                    rows = self.model.objects.using(DEFAULT_DB_ALIAS).order_by().values_list("pk", "name")
+                    self._snapshot = _Snapshot(rows)
+                    self._version = version
+                    self._built_at = time.monotonic()
+        return self._snapshot
+
+    def search(self, query, limit=10):
+        """
+        Return up to `limit` {"id", "name", "score"} matches for the query:
+        exact and prefix matches first, then trigram matches by similarity.
+        """
+        snapshot = self.snapshot()
+        folded = normalize(query)
+        if not folded:
+            return []
+
+        scores = {}
+        if folded in snapshot.exact:
+            scores[snapshot.exact[folded]] = EXACT_SCORE
+
+        start = bisect_left(snapshot.suffixes, (folded,))
+        for suffix, pk, whole_name in snapshot.suffixes[start:start + PREFIX_CANDIDATES]:
+            if not suffix.startswith(folded):
+                break
+            score = NAME_PREFIX_SCORE if whole_name else WORD_PREFIX_SCORE
+            scores[pk] = max(scores.get(pk, 0), score)
+
+        if len(scores) < limit:
+            query_grams = trigrams(folded)
+            shared = Counter(pk for gram in query_grams for pk in snapshot.postings.get(gram, ()))
+            for pk, common in shared.items():
+                if pk in scores:
+                    continue
+                # Share of the query's trigrams found in the name, like pg_trgm's
+                # word_similarity(), so a short query isn't diluted by a long name.
+                similarity = common / len(query_grams)
+                if similarity >= TRIGRAM_THRESHOLD:
+                    scores[pk] = round(similarity, 3)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], snapshot.names[item[0]], item[0]))
+        return [{"id": pk, "name": snapshot.names[pk], "score": score} for pk, score in ranked[:limit]]
+
+    def resolve(self, names):
+        """
+        Map each name to an id (None if unknown), ignoring case and accents.
+        When several rows share a name the lowest id wins.
+        Names missing from the index are looked up in the database (ignoring
+        case only); a hit means the snapshot is stale, so it is rebuilt on
+        the next lookup.
+        """
+        exact = self.snapshot().exact
+        ids = {name: exact.get(normalize(name)) for name in names}
+        missing = {name.lower() for name, pk in ids.items() if pk is None}
+        if missing:
+            rows = (
+                self.model.objects.using(DEFAULT_DB_ALIAS)
+                .alias(name_lower=Lower("name"))
+                .filter(name_lower__in=missing)
+                .order_by("-pk")
+                .values_list("pk", "name")
+            )
+            found = {normalize(name): pk for pk, name in rows}
+            if found:
+                self._version = None
+            for name, pk in ids.items():
+                if pk is None:
+                    ids[name] = found.get(normalize(name))
+        return ids
+
+
+_indexes = {model: NameIndex(model) for model in (Player, Manager)}
+
+
+def name_index(model):
+    return _indexes[model]
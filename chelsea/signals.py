@@ -0,0 +1,58 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .aggregates import refresh_career_stats
+from .cache import bump_name_version, bump_version
+from .models import Player, Manager, Season, Competition, Vote
+
+TRACKED_MODELS = (Player, Manager, Season, Competition, Vote)
+
+
+def invalidate_cached_responses(sender, **kwargs):
+    """
+    Bump the model's data version once the write is committed, so readers
+    never cache pre-commit data under the new version.
+    """
+    transaction.on_commit(partial(bump_version, sender))
+
+
+for model in TRACKED_MODELS:
+    post_save.connect(invalidate_cached_responses, sender=model, dispatch_uid=f"invalidate-{model.__name__}")
+    post_delete.connect(invalidate_cached_responses, sender=model, dispatch_uid=f"invalidate-{model.__name__}")
+
+
+def invalidate_name_index(sender, **kwargs):
+    """
+    Rebuild the model's name index (chelsea.search) once the write commits.
+    """
+    transaction.on_commit(partial(bump_name_version, sender))
+
+
+for model in (Player, Manager):
+    post_save.connect(invalidate_name_index, sender=model, dispatch_uid=f"names-{model.__name__}")
+    post_delete.connect(invalidate_name_index, sender=model, dispatch_uid=f"names-{model.__name__}")
+
+
+def remember_season_player(sender, instance, update_fields=None, **kwargs):
+    """
+    Note the player an existing Season belonged to before this save, so a
+    Season moved to another player refreshes both careers.
+    """
+    if instance._state.adding or update_fields is not None and not {"player", "player_id"} & set(update_fields):
+        return
+    instance._previous_player_id = Season.objects.filter(pk=instance.pk).values_list("player_id", flat=True).first()
+
+
+def refresh_player_career(sender, instance, **kwargs):
+    """
+    Recompute the player's career aggregates after a Season write commits.
+    """
+    player_ids = {instance.player_id, instance.__dict__.pop("_previous_player_id", None)} - {None}
+    transaction.on_commit(partial(refresh_career_stats, player_ids))
+
+
+pre_save.connect(remember_season_player, sender=Season, dispatch_uid="career-stats-pre-save")
+post_save.connect(refresh_player_career, sender=Season, dispatch_uid="career-stats-save")
+post_delete.connect(refresh_player_career, sender=Season, dispatch_uid="career-stats-delete")
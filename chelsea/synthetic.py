@@ -0,0 +1,206 @@
+"""
+Deterministic synthetic datasets for load testing.
+
+Everything is drawn from one random.Random(seed), so the same seed and
+sizes always produce the same rows. Rows are generated in batches and
+written with bulk_create; the denormalized data (vote counters, vote
+rollups, career aggregates) is rebuilt once at the end with the same
+code that maintains it in production.
+"""
+import random
+from datetime import timedelta
+
+from django.db import connection, transaction
+
+from .aggregates import refresh_career_stats
+from .cache import bump_name_version, bump_version
+from .models import Player, Manager, Season, Competition, Vote, VoteRollup, PlayerCareerStats
+from .rollups import backfill_rollups
+from .votes import reconcile_vote_counts
+
+COMPETITIONS = (
+    ("Premier League", "PL"),
+    ("FA Cup", "FAC"),
+    ("League Cup", "EFL"),
+    ("Champions League", "UCL"),
+    ("Europa League", "UEL"),
+    ("Club World Cup", "CWC"),
+)
+FIRST_YEAR, LAST_YEAR = 1980, 2025
+POSITIONS = ("GK", "DEF", "MID", "FWD")
+POSITION_WEIGHTS = (1, 4, 4, 2)
+FORMATIONS = ("4-3-3", "4-2-3-1", "3-4-3", "4-4-2", "3-5-2")
+NATIONALITIES = ("England", "France", "Spain", "Brazil", "Belgium", "Germany", "Nigeria", "Portugal", "Italy")
+FIRST_NAMES = (
+    "Adam", "Ben", "Carlos", "Didier", "Eden", "Frank", "Gianfranco", "Hakim", "Ivan", "John", "Kai", "Luis",
+    "Mason", "Nicolas", "Olivier", "Petr", "Reece", "Ruben", "Salomon", "Thiago", "Victor", "Willian",
+    "Xavier", "Yuri", "Zeca", "André", "César", "Jesús", "Enzo", "Moisés",
+)
+LAST_NAMES = (
+    "Abbott", "Barkley", "Costa", "Drogba", "Essien", "Fàbregas", "Gallas", "Hazard", "Ivanović", "James",
+    "Kanté", "Lampard", "Makélélé", "Nathan", "Obi", "Pedro", "Quinn", "Robben", "Silva", "Terry", "Upson",
+    "Vialli", "Wise", "Ximénez", "Young", "Zola", "Alonso", "Chilwell", "Mount", "Fernández",
+)
+
+
+def unique_names(rng, count):
+    """
+    "First Last" names, with a numeric suffix once the combinations run out.
+    """
+    seen = {}
+    names = []
+    for _ in range(count):
+        base = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        seen[base] = seen.get(base, 0) + 1
+        names.append(base if seen[base] == 1 else f"{base} {seen[base]}")
+    return names
+
+
+def popularity(rng, ids, skew=1.0):
+    """
+    Zipf-like cumulative weights over shuffled ids, so a few entities
+    collect most of the votes.
+    """
+    ids = list(ids)
+    rng.shuffle(ids)
+    cumulative, total = [], 0.0
+    for rank in range(1, len(ids) + 1):
+        total += 1 / rank ** skew
+        cumulative.append(total)
+    return ids, cumulative
+
+
+class SyntheticDataset:
+    def __init__(self, seed=42, batch_size=5000, log=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+
+    def _insert(self, model, rows):
+        created = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                created += self._write(model, batch)
+                batch = []
+        if batch:
+            created += self._write(model, batch)
+        self.log(f"{model.__name__}: {created} rows")
+        return created
+
+    @staticmethod
+    def _write(model, batch):
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        return len(batch)
+
+    # --- tables -----------------------------------------------------------
+
+    def competitions(self):
+        self._insert(Competition, (Competition(name=name, abbreviation=abbr) for name, abbr in COMPETITIONS))
+        return list(Competition.objects.order_by("pk").values_list("pk", flat=True))
+
+    def managers(self, count):
+        rng = self.rng
+
+        def rows():
+            for name in unique_names(rng, count):
+                start = rng.randint(FIRST_YEAR, LAST_YEAR)
+                won, drawn, lost = rng.randint(0, 150), rng.randint(0, 60), rng.randint(0, 60)
+                yield Manager(
+                    name=name, start_year=start, end_year=min(start + rng.randint(1, 6), LAST_YEAR),
+                    preferred_formation=rng.choice(FORMATIONS), trophies_won=rng.randint(0, 8),
+                    games_won=won, games_drawn=drawn, games_lost=lost,
+                    expected_points=round(won * 2.8 + drawn * 0.9, 1), actual_points=won * 3 + drawn,
+                )
+
+        self._insert(Manager, rows())
+        return list(Manager.objects.order_by("pk").values_list("pk", flat=True))
+
+    def players(self, count):
+        rng = self.rng
+
+        def rows():
+            for name in unique_names(rng, count):
+                start = rng.randint(FIRST_YEAR, LAST_YEAR)
+                take_ons, aerial_duels = rng.randint(0, 400), rng.randint(0, 600)
+                yield Player(
+                    name=name, position=rng.choices(POSITIONS, POSITION_WEIGHTS)[0],
+                    nationality=rng.choice(NATIONALITIES), age=rng.randint(17, 38), start_year=start,
+                    end_year=min(start + rng.randint(1, 10), LAST_YEAR),
+                    take_ons_attempted=take_ons, take_ons_successful=rng.randint(0, take_ons),
+                    aerial_duels_attempted=aerial_duels, aerial_duels_won=rng.randint(0, aerial_duels),
+                )
+
+        self._insert(Player, rows())
+        return list(Player.objects.order_by("pk").values_list("pk", flat=True))
+
+    def seasons(self, count, player_ids, manager_ids, competition_ids):
+        rng = self.rng
+        slots = [(competition, year) for competition in competition_ids for year in range(FIRST_YEAR, LAST_YEAR)]
+        per_player, extra = divmod(count, len(player_ids))
+
+        def rows():
+            for i, player_id in enumerate(player_ids):
+                n = min(per_player + (i < extra), len(slots))
+                for competition_id, year in rng.sample(slots, n):
+                    matches = rng.randint(1, 50)
+                    yield Season(
+                        player_id=player_id, competition_id=competition_id,
+                        manager_id=rng.choice(manager_ids) if manager_ids else None,
+                        year=f"{year}/{(year + 1) % 100:02d}", matches=matches,
+                        minutes_played=matches * rng.randint(20, 90), goals=rng.randint(0, 30),
+                        assists=rng.randint(0, 20), tackles=rng.randint(0, 120), recoveries=rng.randint(0, 200),
+                        ground_duels_won_pct=round(rng.uniform(30, 70), 1),
+                    )
+
+        self._insert(Season, rows())
+
+    def votes(self, count, player_ids, manager_ids, end, days=90, manager_share=0.1):
+        rng = self.rng
+        players, player_weights = popularity(rng, player_ids)
+        managers, manager_weights = popularity(rng, manager_ids)
+        span = timedelta(days=days).total_seconds()
+
+        def rows():
+            remaining = count
+            while remaining:
+                n = min(self.batch_size, remaining)
+                remaining -= n
+                n_managers = sum(rng.random() < manager_share for _ in range(n)) if managers else 0
+                picks = [(pk, None) for pk in rng.choices(players, cum_weights=player_weights, k=n - n_managers)]
+                picks += [(None, pk) for pk in rng.choices(managers, cum_weights=manager_weights, k=n_managers)]
+                rng.shuffle(picks)
+                for player_id, manager_id in picks:
+                    ts = end - timedelta(seconds=rng.random() * span)
+                    yield Vote(player_id=player_id, manager_id=manager_id, timestamp=ts)
+
+        self._insert(Vote, rows())
+
+    # --- driver -----------------------------------------------------------
+
+    def build(self, players, managers, seasons, votes, end, vote_days=90):
+        competition_ids = self.competitions()
+        manager_ids = self.managers(managers)
+        player_ids = self.players(players)
+        self.seasons(seasons, player_ids, manager_ids, competition_ids)
+        self.votes(votes, player_ids, manager_ids, end, days=vote_days)
+
+        reconcile_vote_counts()
+        self.log(f"VoteRollup: {backfill_rollups()} buckets")
+        self.log(f"PlayerCareerStats: {refresh_career_stats()} rows")
+        bump_version(Player, Manager, Season, Competition, Vote)
+        bump_name_version(Player, Manager)
+
+
+def flush():
+    """
+    Delete every row the generator writes. Plain DELETE statements: the ORM
+    would load every row to send the post_delete signals.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model in (Vote, VoteRollup, PlayerCareerStats, Season, Player, Manager, Competition):
+            cursor.execute(f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)}")
+    bump_version(Vote, VoteRollup, PlayerCareerStats, Season, Player, Manager, Competition)
+    bump_name_version(Player, Manager)
@@ -0,0 +1,103 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from chelsea import vote_buffer
+from chelsea.models import Player, Manager, Vote
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False})  # repeated votes from one client
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        self.hazard = Player.objects.create(
+            name="Eden Hazard", position="FWD", nationality="Belgium", age=24, start_year=2012, vote_count=3
+        )
+        self.costa = Player.objects.create(
+            name="Diego Costa", position="FWD", nationality="Spain", age=26, start_year=2014
+        )
+        self.cech = Player.objects.create(
+            name="Petr Cech", position="GK", nationality="Czechia", age=22, start_year=2004
+        )
+        self.manager = Manager.objects.create(name="Jose Mourinho", start_year=2013, preferred_formation="4-3-3")
+
+    async def test_cast_vote(self):
+        response = await self.async_client.post(
+            reverse('async-cast-vote'), {'player_id': self.costa.id}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((await Player.objects.aget(pk=self.costa.pk)).vote_count, 1)
+        self.assertEqual(await Vote.objects.acount(), 1)
+
+    async def test_first_buffered_vote_replays_spools_off_the_event_loop(self):
+        spool_dir = Path(tempfile.mkdtemp())
+        (spool_dir / "votes-999999999.spool").write_text(f"p {self.hazard.id} 1700000000.0\n")
+        config = {"ENABLED": True, "SPOOL_DIR": spool_dir, "FLUSH_INTERVAL": 3600}
+        with override_settings(VOTE_BUFFER=config):
+            response = await self.async_client.post(
+                reverse('async-cast-vote'), {'player_id': self.costa.id}, content_type='application/json'
+            )
+            buffer, vote_buffer._buffer = vote_buffer._buffer, None
+            await sync_to_async(buffer.flush)()  # on the test's connection, not the flush thread's
+            await sync_to_async(buffer.close)()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(await Vote.objects.acount(), 2)  # the dead worker's vote, then the queued one
+
+    async def test_cast_vote_errors(self):
+        url = reverse('async-cast-vote')
+        response = await self.async_client.post(url, {'player_id': 9999}, content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.post(url, {}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.post(url, "not json", content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(await Vote.objects.aexists())
+
+    async def test_vote_comparison(self):
+        url = reverse('async-vote-comparison')
+        response = await self.async_client.post(url, {
+            'player1_id': self.hazard.id, 'player2_id': self.costa.id, 'vote_for': self.costa.id
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+
+        response = await self.async_client.post(url, {
+            'player1_id': self.hazard.id, 'player2_id': self.cech.id, 'vote_for': self.cech.id
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    async def test_leaderboards_match_sync_views(self):
+        for sync_name, async_name, params in (
+            ('best-players', 'async-best-players', {'manager_id': self.manager.id}),
+            ('top-voted-player', 'async-top-voted-player', {}),
+            ('trending', 'async-trending', {'window': '7d'}),
+        ):
+            expected = await self.async_client.get(reverse(sync_name), params)
+            response = await self.async_client.get(reverse(async_name), params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), expected.json(), async_name)
+
+    async def test_best_manager_without_votes(self):
+        await Manager.objects.all().adelete()
+        response = await self.async_client.get(reverse('async-best-manager'))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_trending_rejects_bad_limits(self):
+        for limit in ("-1", "0", "abc"):
+            response = await self.async_client.get(reverse('async-trending'), {'limit': limit})
+            self.assertEqual(response.status_code, 400)
+
+
+class BenchAsyncCommandTests(TransactionTestCase):
+    # The benchmark issues requests from worker threads, which need committed data.
+
+    def test_reports_both_modes(self):
+        Player.objects.create(name="Eden Hazard", position="FWD", nationality="Belgium", age=24, start_year=2012)
+        out = StringIO()
+        call_command("bench_async", endpoint=["top-voted-player"], requests=5, concurrency=1, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(any(line.startswith("top-voted-player  sync") for line in lines))
+        self.assertTrue(any(line.startswith("top-voted-player  async") for line in lines))
@@ -0,0 +1,74 @@
+import json
+import tempfile
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from chelsea.benchmark import ENDPOINTS, route_names
+from chelsea.cache import response_cache
+from chelsea.models import Player, Manager, Season, Vote, PlayerCareerStats
+
+SMALL = {"players": 40, "managers": 4, "seasons": 200, "votes": 500, "end": datetime(2026, 1, 1, tzinfo=timezone.utc)}
+
+
+def seed(**options):
+    call_command("seed_synthetic", stdout=StringIO(), **{**SMALL, **options})
+
+
+class SeedSyntheticTests(TestCase):
+    def snapshot(self):
+        return (
+            list(Player.objects.order_by("pk").values_list("name", "position", "vote_count")),
+            list(Season.objects.order_by("pk").values_list("player__name", "competition__name", "year", "goals")),
+            list(Vote.objects.order_by("pk").values_list("player__name", "manager__name", "timestamp")),
+        )
+
+    def test_sizes_and_derived_data(self):
+        seed()
+        self.assertEqual(Player.objects.count(), 40)
+        self.assertEqual(Manager.objects.count(), 4)
+        self.assertEqual(Season.objects.count(), 200)
+        self.assertEqual(Vote.objects.count(), 500)
+        votes = sum(Player.objects.values_list("vote_count", flat=True))
+        votes += sum(Manager.objects.values_list("vote_count", flat=True))
+        self.assertEqual(votes, 500)
+        self.assertTrue(PlayerCareerStats.objects.filter(competition=None).exists())
+
+    def test_same_seed_same_data(self):
+        seed()
+        first = self.snapshot()
+        seed(flush=True)
+        self.assertEqual(self.snapshot(), first)
+        seed(flush=True, seed=7)
+        self.assertNotEqual(self.snapshot(), first)
+
+    def test_refuses_non_empty_database(self):
+        seed()
+        with self.assertRaises(CommandError):
+            seed()
+
+
+class BenchmarkTests(TestCase):
+    def test_every_route_has_a_recipe(self):
+        self.assertEqual(sorted(set(route_names()) - set(ENDPOINTS)), [])
+
+    def test_report(self):
+        response_cache().clear()
+        seed()
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "report.json"
+            call_command("benchmark", requests=2, output=str(output), stdout=StringIO(), stderr=StringIO())
+            report = json.loads(output.read_text())
+
+        self.assertEqual(report["skipped"], {})
+        self.assertEqual(set(report["endpoints"]), set(route_names()))
+        for name, result in report["endpoints"].items():
+            self.assertLess(result["status"], 400, name)
+            self.assertEqual(result["errors"], 0, name)
+            self.assertIn("p99", result["latency_ms"])
+        self.assertGreater(report["endpoints"]["player-list"]["sql_queries"], 0)
+        self.assertEqual(report["meta"]["rows"]["Player"], 40)
@@ -0,0 +1,113 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from chelsea.models import Player, Manager, Season, Competition, PlayerCareerStats
+
+
+def player_row(name, **fields):
+    return {"name": name, "position": "MID", "nationality": "England", "age": 25, "start_year": 2010, **fields}
+
+
+class BulkPlayerTests(APITestCase):
+    url = reverse('player-bulk')
+
+    def setUp(self):
+        self.lampard = Player.objects.create(**player_row("Frank Lampard"))
+
+    def test_create(self):
+        rows = [player_row(f"Player {i}") for i in range(20)]
+        with self.assertNumQueries(4), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, rows, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["created"]), 20)
+        self.assertEqual(response.data["errors"], [])
+        self.assertEqual(Player.objects.count(), 21)
+
+    def test_per_row_errors(self):
+        rows = [player_row("Mason Mount"), player_row("Too Young", age=10), player_row("Frank Lampard"),
+                player_row("Mason Mount"), "not a row"]
+        response = self.client.post(self.url, rows, format="json")
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1, 2, 3, 4])
+        self.assertIn("age", response.data["errors"][0]["errors"])
+        self.assertEqual(Player.objects.filter(name="Mason Mount").count(), 1)
+
+    def test_atomic(self):
+        rows = [player_row("Mason Mount"), player_row("Too Young", age=10)]
+        response = self.client.post(self.url + "?atomic=true", rows, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertFalse(Player.objects.filter(name="Mason Mount").exists())
+
+    def test_update(self):
+        other = Player.objects.create(**player_row("John Terry"))
+        rows = [
+            {"id": self.lampard.pk, "age": 30, "take_ons_attempted": 10},
+            {"id": other.pk, "take_ons_successful": 5},  # more than the stored 0 attempts
+            {"id": 999999, "age": 30},
+            {"age": 30},
+        ]
+        response = self.client.patch(self.url, rows, format="json")
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data["updated"], [self.lampard.pk])
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1, 2, 3])
+        self.lampard.refresh_from_db()
+        self.assertEqual((self.lampard.age, self.lampard.take_ons_attempted, self.lampard.nationality),
+                         (30, 10, "England"))
+
+    def test_batch_level_errors(self):
+        self.assertEqual(self.client.post(self.url, {"name": "x"}, format="json").status_code, 400)
+        self.assertEqual(self.client.post(self.url, [], format="json").status_code, 400)
+
+
+class BulkSeasonTests(APITestCase):
+    url = reverse('season-bulk')
+
+    def setUp(self):
+        self.players = [Player.objects.create(**player_row(f"Player {i}")) for i in range(11)]
+        self.premier_league = Competition.objects.create(name="Premier League")
+        Competition.objects.create(name="FA Cup")
+        self.manager = Manager.objects.create(name="José Mourinho", start_year=2004)
+
+    def test_create_resolves_names_once(self):
+        rows = [
+            {"player": player.name.upper(), "competition": "premier league", "manager": "José Mourinho",
+             "year": "2004/05", "goals": i}
+            for i, player in enumerate(self.players)
+        ]
+        # 3 name lookups, the uniqueness check, the insert, then the career stats
+        # refresh (savepoints included); none of it per row.
+        with self.assertNumQueries(12):
+            response = self.client.post(self.url, rows, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Season.objects.filter(manager=self.manager, competition=self.premier_league).count(), 11)
+
+    def test_unknown_names_and_duplicates(self):
+        rows = [
+            {"player": "Player 0", "competition": "Premier League", "year": "2004/05"},
+            {"player": "Nobody", "competition": "Premier League", "year": "2004/05"},
+            {"player": "Player 0", "competition": "premier league", "year": "2004/05"},
+            {"player": "Player 1", "competition": "Premier League", "year": "2004-05"},
+        ]
+        response = self.client.post(self.url, rows, format="json")
+        self.assertEqual(response.status_code, 207)
+        errors = {error["index"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(set(errors), {1, 2, 3})
+        self.assertIn("player", errors[1])
+        self.assertIn("year", errors[3])
+
+        # The stored row now clashes too.
+        response = self.client.post(self.url, rows[:1], format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_update_refreshes_career_stats(self):
+        season = Season.objects.create(player=self.players[0], competition=self.premier_league, year="2004/05")
+        rows = [{"id": season.pk, "goals": 13, "player": "Player 1", "manager": "José Mourinho"}]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(self.url, rows, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        season.refresh_from_db()
+        self.assertEqual((season.player, season.manager, season.goals), (self.players[1], self.manager, 13))
+        totals = PlayerCareerStats.objects.filter(competition__isnull=True)
+        self.assertFalse(totals.filter(player=self.players[0]).exists())
+        self.assertEqual(totals.get(player=self.players[1]).goals, 13)
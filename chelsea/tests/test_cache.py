@@ -0,0 +1,77 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from chelsea.cache import LocalRedis, bump_version, get_versions, metrics, response_cache
+from chelsea.models import Player
+
+LOCAL_REDIS_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'responses': {'BACKEND': 'chelsea.cache.LocalRedisCache', 'LOCATION': 'local://tests'},
+}
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+        metrics.reset()
+        self.player = Player.objects.create(
+            name="Didier Drogba", position="FWD", nationality="Ivory Coast", age=26, start_year=2004
+        )
+
+    def test_second_request_is_a_hit(self):
+        first = self.client.get(reverse('player-list'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('player-list'))
+        self.assertEqual((first["X-Cache"], second["X-Cache"]), ("MISS", "HIT"))
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(metrics.snapshot()["views"]["PlayerViewSet"], {"hits": 1, "misses": 1})
+
+    def test_vote_invalidates_leaderboard(self):
+        self.client.get(reverse('top-voted-player'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('cast-vote'), {'player_id': self.player.id})
+        response = self.client.get(reverse('top-voted-player'))
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["vote_count"], 1)
+
+    @override_settings(RATE_LIMIT={"ENABLED": False})
+    def test_vote_keeps_name_only_responses(self):
+        self.client.get(reverse('season-list'))
+        self.client.get(reverse('player-list'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('cast-vote'), {'player_id': self.player.id})
+        self.assertEqual(self.client.get(reverse('season-list'))["X-Cache"], "HIT")
+        self.assertEqual(self.client.get(reverse('player-list'))["X-Cache"], "MISS")
+
+    def test_viewset_write_invalidates_list(self):
+        self.client.get(reverse('player-list'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('player-detail', args=[self.player.id]), {'age': 27}, format='json')
+        response = self.client.get(reverse('player-list'))
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse('player-list'))
+        response = self.client.get(reverse('cache-metrics'))
+        self.assertEqual(response.json()["misses"], 1)
+
+
+@override_settings(CACHES=LOCAL_REDIS_CACHES)
+class LocalRedisBackendTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+
+    def test_versions_round_trip(self):
+        before = get_versions([Player])[Player]
+        bump_version(Player)
+        self.assertEqual(get_versions([Player])[Player], before + 1)
+
+    def test_responses_are_cached(self):
+        self.client.get(reverse('competition-list'))
+        self.assertEqual(self.client.get(reverse('competition-list'))["X-Cache"], "HIT")
+
+    def test_expiry(self):
+        client = LocalRedis()
+        client.set("k", b"v", ex=0)
+        self.assertIsNone(client.get("k"))
@@ -0,0 +1,78 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from chelsea.aggregates import refresh_career_stats
+from chelsea.cache import response_cache
+from chelsea.models import Player, Competition, Season, PlayerCareerStats
+
+
+class CareerStatsTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.league = Competition.objects.create(name="Premier League")
+        self.cup = Competition.objects.create(name="FA Cup")
+        self.lampard = Player.objects.create(
+            name="Frank Lampard", position="MID", nationality="England", age=28, start_year=2001
+        )
+        self.essien = Player.objects.create(
+            name="Michael Essien", position="MID", nationality="Ghana", age=24, start_year=2005
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Season.objects.create(player=self.lampard, competition=self.league, year="2009/10", goals=22,
+                                  minutes_played=3240, ground_duels_won_pct=50)
+            Season.objects.create(player=self.lampard, competition=self.cup, year="2009/10", goals=4,
+                                  minutes_played=360, ground_duels_won_pct=80)
+
+    def test_rows_refresh_on_season_writes(self):
+        total = PlayerCareerStats.objects.get(player=self.lampard, competition=None)
+        self.assertEqual((total.seasons, total.goals, total.minutes_played), (2, 26, 3600))
+        self.assertEqual(total.goals_per_90, 0.65)
+        self.assertEqual(total.ground_duels_won_pct, 53.0)
+
+        season = Season.objects.get(competition=self.cup)
+        with self.captureOnCommitCallbacks(execute=True):
+            season.delete()
+        self.assertFalse(PlayerCareerStats.objects.filter(competition=self.cup).exists())
+        self.assertEqual(PlayerCareerStats.objects.get(player=self.lampard, competition=None).goals, 22)
+
+    def test_moving_a_season_refreshes_both_players(self):
+        season = Season.objects.get(competition=self.cup)
+        season.player = self.essien
+        with self.captureOnCommitCallbacks(execute=True):
+            season.save()
+        self.assertEqual(PlayerCareerStats.objects.get(player=self.lampard, competition=None).goals, 22)
+        self.assertFalse(PlayerCareerStats.objects.filter(player=self.lampard, competition=self.cup).exists())
+        self.assertEqual(PlayerCareerStats.objects.get(player=self.essien, competition=None).goals, 4)
+
+    def test_refresh_all_is_idempotent(self):
+        before = list(PlayerCareerStats.objects.values("player", "competition", "goals").order_by("competition"))
+        refresh_career_stats()
+        after = list(PlayerCareerStats.objects.values("player", "competition", "goals").order_by("competition"))
+        self.assertEqual(before, after)
+
+    def test_compare_players_in_competition(self):
+        with self.assertNumQueries(2):  # stats rows + the player without seasons
+            response = self.client.get(reverse('compare-players'), {
+                'player1_id': self.lampard.id, 'player2_id': self.essien.id, 'competition_id': self.league.id
+            })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["competition"], "Premier League")
+        self.assertEqual(response.data["player1"]["stats"]["goals"], 22)
+        self.assertEqual(response.data["player2"]["stats"]["goals"], 0)
+
+    def test_compare_players_all_competitions(self):
+        response = self.client.get(reverse('compare-players'), {
+            'player1_id': self.lampard.id, 'player2_id': self.lampard.id
+        })
+        self.assertIsNone(response.data["competition"])
+        self.assertEqual(response.data["player1"]["stats"]["goals"], 26)
+
+    def test_player_competition_stats_single_query(self):
+        url = reverse('player-competition-stats', args=[self.lampard.id, self.cup.id])
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.data["stats"]["goals"], 4)
+
+        url = reverse('player-competition-stats', args=[self.essien.id, self.cup.id])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
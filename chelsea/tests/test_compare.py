@@ -0,0 +1,60 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from chelsea.aggregates import refresh_career_stats
+from chelsea.cache import response_cache
+from chelsea.models import Player, Manager, Competition, Season
+
+
+class MultiCompareTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.league = Competition.objects.create(name="Premier League")
+        self.mourinho = Manager.objects.create(name="Jose Mourinho", start_year=2004)
+        self.ancelotti = Manager.objects.create(name="Carlo Ancelotti", start_year=2009)
+        self.players = []
+        for i in range(6):
+            player = Player.objects.create(
+                name=f"Player {i}", position="MID", nationality="England", age=25, start_year=2004
+            )
+            self.players.append(player)
+            for year, manager in (("2004/05", self.mourinho), ("2009/10", self.ancelotti)):
+                Season.objects.create(player=player, manager=manager, competition=self.league, year=year,
+                                      goals=i, minutes_played=900)
+        refresh_career_stats()
+
+    def test_compare_many_players_two_queries(self):
+        ids = ",".join(str(player.id) for player in reversed(self.players))
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('compare-players'), {'ids': ids})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["name"] for row in response.data["players"]][:2], ["Player 5", "Player 4"])
+        self.assertEqual(response.data["players"][0]["stats"]["goals"], 10)
+
+    def test_compare_many_players_season_range(self):
+        ids = f"{self.players[1].id},{self.players[2].id}"
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('compare-players'), {
+                'ids': ids, 'competition_id': self.league.id, 'year_from': 2009, 'year_to': 2009
+            })
+        stats = [row["stats"] for row in response.data["players"]]
+        self.assertEqual([(s["seasons"], s["goals"], s["goals_per_90"]) for s in stats], [(1, 1, 0.1), (1, 2, 0.2)])
+
+    def test_compare_many_managers(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('compare-managers'), {
+                'ids': f"{self.mourinho.id},{self.ancelotti.id}", 'year_to': 2005
+            })
+        stats = [row["stats"] for row in response.data["managers"]]
+        self.assertEqual(stats[0], {"seasons": 1, "players_used": 6, "goals": 15, "assists": 0,
+                                    "tackles": 0, "recoveries": 0})
+        self.assertEqual(stats[1]["players_used"], 0)
+
+    def test_compare_many_validation(self):
+        response = self.client.get(reverse('compare-players'), {'ids': '1,abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "'ids' must be comma-separated integers."})
+        response = self.client.get(reverse('compare-players'), {'ids': '1', 'year_from': 'x'})
+        self.assertEqual(response.json(), {"error": "'year_from' must be an integer."})
+        self.assertEqual(self.client.get(reverse('compare-players'), {'ids': '999999'}).status_code, 404)
@@ -0,0 +1,60 @@
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+
+from chelsea.cache import response_cache
+from chelsea.models import Player
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False})  # repeated votes from one client
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.player = Player.objects.create(
+            name="Gianfranco Zola", position="FWD", nationality="Italy", age=30, start_year=1996
+        )
+
+    def test_validators_on_list_detail_and_leaderboards(self):
+        for url in (reverse('player-list'), reverse('player-detail', args=[self.player.pk]),
+                    reverse('top-voted-player')):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response["ETag"].startswith('"'), url)
+            self.assertIn("GMT", response["Last-Modified"])
+            self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_if_none_match(self):
+        url = reverse('player-list')
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+        self.assertEqual(self.client.get(url, {"page_size": 5}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"other", ' + etag).status_code, 304)
+
+    def test_write_changes_the_etag(self):
+        url = reverse('player-list')
+        etag = self.client.get(url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('cast-vote'), {'player_id': self.player.pk})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["results"][0]["vote_count"], 1)
+
+    def test_if_modified_since(self):
+        url = reverse('competition-list')
+        last_modified = self.client.get(url)["Last-Modified"]
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(0)).status_code, 200)
+
+    def test_if_none_match_takes_precedence(self):
+        url = reverse('competition-list')
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,186 @@
+import time
+from unittest import mock, skipUnless
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from chelsea.cache import MODIFIED_KEY, name_scope, response_cache, vote_scope
+from chelsea.db_router import ReplicaRouter, _end_request, begin_request, replica_aliases, replica_may_lag
+from chelsea.middleware import ReplicaRoutingMiddleware
+from chelsea.models import Player
+
+REPLICAS = ["replica1", "replica2"]
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter(replicas=REPLICAS)
+        self.addCleanup(_end_request)
+
+    def test_outside_requests_everything_uses_the_primary(self):
+        self.assertEqual(self.router.db_for_read(Player), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.router.db_for_write(Player), DEFAULT_DB_ALIAS)
+
+    def test_safe_requests_read_from_replicas_until_they_write(self):
+        state = begin_request(use_replica=True)
+        self.assertIn(self.router.db_for_read(Player), REPLICAS)
+        self.assertEqual(self.router.db_for_write(Player), DEFAULT_DB_ALIAS)
+        self.assertTrue(state.wrote)
+        self.assertEqual(self.router.db_for_read(Player), DEFAULT_DB_ALIAS)
+
+        begin_request(use_replica=False)
+        self.assertEqual(self.router.db_for_read(Player), DEFAULT_DB_ALIAS)
+
+    def test_transactions_read_from_the_primary(self):
+        begin_request(use_replica=True)
+        with mock.patch.object(connections[DEFAULT_DB_ALIAS], "in_atomic_block", True):
+            self.assertEqual(self.router.db_for_read(Player), DEFAULT_DB_ALIAS)
+
+    @override_settings(REPLICA_ROUTING={"STICKY_SECONDS": 5})
+    def test_replica_may_lag_behind_recent_writes(self):
+        begin_request(use_replica=True)
+        self.assertFalse(replica_may_lag(int(time.time())))  # nothing read from a replica yet
+        self.router.db_for_read(Player)
+        self.assertTrue(replica_may_lag(int(time.time()) - 2))
+        self.assertFalse(replica_may_lag(int(time.time()) - 60))
+
+    def test_migrations_only_run_on_the_primary(self):
+        self.assertTrue(self.router.allow_migrate(DEFAULT_DB_ALIAS, "chelsea"))
+        self.assertFalse(self.router.allow_migrate("replica1", "chelsea"))
+
+
+@override_settings(REPLICA_ROUTING={"STICKY_SECONDS": 5, "COOKIE": "primary_until"})
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter(replicas=REPLICAS)
+        self.addCleanup(_end_request)
+
+    def middleware(self, view):
+        with mock.patch("chelsea.middleware.replica_aliases", return_value=REPLICAS):
+            return ReplicaRoutingMiddleware(view)
+
+    def route(self, request, write=False):
+        seen = []
+
+        def view(request):
+            if write:
+                self.router.db_for_write(Player)
+            seen.append(self.router.db_for_read(Player))
+            return HttpResponse()
+
+        response = self.middleware(view)(request)
+        return seen[0], response
+
+    def test_unsafe_requests_make_the_client_sticky(self):
+        alias, response = self.route(self.factory.post("/api/vote/"))
+        self.assertEqual(alias, DEFAULT_DB_ALIAS)
+        cookie = response.cookies["primary_until"]
+        self.assertEqual(cookie["max-age"], 5)
+        self.assertAlmostEqual(float(cookie.value), time.time() + 5, delta=1)
+
+        request = self.factory.get("/api/players/")
+        request.COOKIES["primary_until"] = cookie.value
+        self.assertEqual(self.route(request)[0], DEFAULT_DB_ALIAS)
+
+        request.COOKIES["primary_until"] = str(time.time() - 1)
+        alias, response = self.route(request)
+        self.assertIn(alias, REPLICAS)
+        self.assertNotIn("primary_until", response.cookies)
+
+    def test_writes_during_safe_requests_make_the_client_sticky(self):
+        alias, response = self.route(self.factory.get("/api/players/"), write=True)
+        self.assertEqual(alias, DEFAULT_DB_ALIAS)
+        self.assertIn("primary_until", response.cookies)
+
+    def test_not_used_without_replicas(self):
+        from django.core.exceptions import MiddlewareNotUsed
+
+        with mock.patch("chelsea.middleware.replica_aliases", return_value=[]):
+            with self.assertRaises(MiddlewareNotUsed):
+                ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+
+class LaggingReplicaCacheTests(TestCase):
+    def setUp(self):
+        response_cache().clear()
+        Player.objects.create(name="Eden Hazard", position="FWD", nationality="Belgium", age=33, start_year=2012)
+
+    def get(self, read_replica, may_lag):
+        with mock.patch("chelsea.api.mixins.may_read_replica", return_value=read_replica), \
+                mock.patch("chelsea.api.mixins.replica_may_lag", return_value=may_lag):
+            return self.client.get(reverse("player-list"))
+
+    def test_answers_that_may_lag_are_cached_for_replica_readers_only(self):
+        for cache_status in ("MISS", "HIT"):
+            response = self.get(read_replica=True, may_lag=True)
+            self.assertEqual(response["X-Cache"], cache_status)
+            self.assertNotIn("ETag", response)
+
+        # A sticky client reads the primary and caches a validated answer...
+        response = self.get(read_replica=False, may_lag=False)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertIn("ETag", response)
+        # ...which everybody gets from then on.
+        self.assertIn("ETag", self.get(read_replica=True, may_lag=False))
+
+
+@skipUnless(replica_aliases(), "set DATABASE_REPLICA_URLS to test against real replica aliases")
+@override_settings(RATE_LIMIT={"ENABLED": False})
+class ReplicaRoutingIntegrationTests(TransactionTestCase):
+    """
+    Runs with two local databases, e.g.
+    DATABASE_URL=sqlite:////tmp/primary.sqlite3 DATABASE_REPLICA_URLS=sqlite:////tmp/replica.sqlite3
+    (replicas mirror the test database, so every alias sees the same rows).
+    """
+    databases = "__all__"
+
+    def setUp(self):
+        Player.objects.create(name="Eden Hazard", position="FWD", nationality="Belgium", age=33, start_year=2012)
+
+    def count_queries(self):
+        counts = dict.fromkeys(connections, 0)
+
+        def counter(alias):
+            def wrapper(execute, sql, params, many, context):
+                counts[alias] += 1
+                return execute(sql, params, many, context)
+            return wrapper
+
+        for alias in counts:
+            self.enterContext(connections[alias].execute_wrapper(counter(alias)))
+        return counts
+
+    def test_reads_use_replicas_and_writes_the_primary(self):
+        counts = self.count_queries()
+        url = reverse("player-list")
+        # Just written: the replica answers, but may lag, so the answer is
+        # cached briefly and without validators.
+        for cache_status in ("MISS", "HIT"):
+            response = self.client.get(url)
+            self.assertEqual((response.status_code, response["X-Cache"]), (200, cache_status))
+            self.assertNotIn("ETag", response)
+        self.assertEqual(counts[DEFAULT_DB_ALIAS], 0)
+        self.assertGreater(sum(counts[alias] for alias in replica_aliases()), 0)
+
+        response_cache().set_many({
+            MODIFIED_KEY.format(scope): int(time.time()) - 60
+            for model in apps.get_app_config("chelsea").get_models()
+            for scope in (model._meta.label_lower, vote_scope(model), name_scope(model))
+        }, timeout=None)
+        self.assertIn("ETag", self.client.get(url, {"_": 0}))
+        self.assertEqual(self.client.get(url, {"_": 0})["X-Cache"], "HIT")
+
+        counts.update(dict.fromkeys(counts, 0))
+        player = Player.objects.get()
+        response = self.client.post(reverse("cast-vote"), {"player_id": player.pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(sum(counts[alias] for alias in replica_aliases()), 0)
+
+        # Sticky: the client's next read stays on the primary.
+        counts.update(dict.fromkeys(counts, 0))
+        self.assertEqual(self.client.get(url, {"_": 1}).status_code, 200)
+        self.assertEqual(sum(counts[alias] for alias in replica_aliases()), 0)
@@ -0,0 +1,79 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from chelsea.cache import response_cache
+from chelsea.importers import parse_ratio
+from chelsea.models import Player
+
+
+class DuelStatsTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+
+    def player(self, name, position, aerials=(0, 0), take_ons=(0, 0)):
+        return Player.objects.create(
+            name=name, position=position, nationality="England", age=25, start_year=2010,
+            aerial_duels_won=aerials[0], aerial_duels_attempted=aerials[1],
+            take_ons_successful=take_ons[0], take_ons_attempted=take_ons[1],
+        )
+
+    def test_rates_are_computed_by_the_database(self):
+        response = self.client.post(reverse('player-list'), {
+            "name": "Eden Hazard", "position": "FWD", "nationality": "Belgium", "age": 24, "start_year": 2012,
+            "take_ons_successful": 3, "take_ons_attempted": 4,
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        player = Player.objects.get()
+        self.assertEqual((player.take_on_success_rate, player.aerial_duel_success_rate), (75.0, 0.0))
+        detail = self.client.get(reverse('player-detail', args=[player.pk])).json()
+        self.assertEqual(detail["take_on_success_rate"], 75.0)
+
+    def test_successful_cannot_exceed_attempted(self):
+        player = self.player("John Terry", "DEF", aerials=(5, 10))
+        response = self.client.patch(reverse('player-detail', args=[player.pk]), {"aerial_duels_won": 11},
+                                     format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("aerial_duels_won", response.data)
+
+    def test_top_aerial_duelists_among_defenders(self):
+        self.player("John Terry", "DEF", aerials=(60, 100))
+        self.player("Ricardo Carvalho", "DEF", aerials=(70, 100))
+        self.player("Branislav Ivanovic", "DEF", aerials=(3, 3))
+        self.player("Didier Drogba", "FWD", aerials=(90, 100))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('player-list'), {
+                "position": "def", "ordering": "-aerial_duel_success_rate", "page_size": 10,
+            })
+        names = [row["name"] for row in response.json()["results"]]
+        self.assertEqual(names, ["Branislav Ivanovic", "Ricardo Carvalho", "John Terry"])
+
+        response = self.client.get(reverse('player-list'), {
+            "position": "DEF", "ordering": "-aerial_duel_success_rate", "min_aerial_duels": 10,
+        })
+        self.assertEqual([row["name"] for row in response.json()["results"]], ["Ricardo Carvalho", "John Terry"])
+
+    def test_import_accepts_legacy_ratio_strings(self):
+        path = Path(tempfile.mkdtemp()) / "players.csv"
+        path.write_text(
+            "name,position,nationality,age,start_year,take_ons,aerial_duels_won\n"
+            "Arjen Robben,FWD,Netherlands,20,2004,4/6,1/3\n"
+            "Joe Cole,MID,England,22,2003,oops/2,0\n"
+        )
+        out, err = StringIO(), StringIO()
+        call_command("import_stats", "players", str(path), stdout=out, stderr=err)
+        self.assertIn("Imported 1 players (1 rejected)", out.getvalue())
+        robben = Player.objects.get(name="Arjen Robben")
+        self.assertEqual((robben.take_ons_successful, robben.take_ons_attempted), (4, 6))
+        self.assertEqual((robben.aerial_duels_won, robben.aerial_duels_attempted), (1, 3))
+
+    def test_parse_ratio(self):
+        self.assertEqual(parse_ratio("2/2"), (2, 2))
+        self.assertEqual(parse_ratio(" 3 / 7 "), (3, 7))
+        self.assertEqual(parse_ratio("5"), (5, 5))
+        self.assertIsNone(parse_ratio("n/a"))
@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+
+from chelsea.models import Player, Competition, Season, Vote
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.league = Competition.objects.create(name="Premier League")
+        self.cup = Competition.objects.create(name="FA Cup")
+        self.player = Player.objects.create(
+            name="Gianfranco Zola", position="FWD", nationality="Italy", age=30, start_year=1996
+        )
+        for year in ("1996/97", "1997/98", "1998/99"):
+            Season.objects.create(player=self.player, competition=self.league, year=year, goals=8)
+        Season.objects.create(player=self.player, competition=self.cup, year="1996/97", goals=3)
+        Vote.objects.create(player=self.player)
+
+    def stream(self, name, **params):
+        response = self.client.get(reverse(name), params)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_seasons_ndjson_with_filters(self):
+        response, body = self.stream('export-seasons', competition=self.league.id, year_from=1997, year_to=1998)
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual([row["year"] for row in rows], ["1997/98", "1998/99"])
+        self.assertEqual(rows[0]["player_name"], "Gianfranco Zola")
+
+    def test_seasons_csv(self):
+        response, body = self.stream('export-seasons', format='csv', player=self.player.id)
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[-1]["competition_name"], "FA Cup")
+
+    def test_votes_export(self):
+        _, body = self.stream('export-votes', player=self.player.id)
+        row = json.loads(body)
+        self.assertEqual(row["player_id"], self.player.id)
+        self.assertRegex(row["timestamp"], r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(\.\d+)?Z$")
+
+    def test_bad_parameters(self):
+        self.assertEqual(self.client.get(reverse('export-seasons'), {'format': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('export-votes'), {'player': 'x'}).status_code, 400)
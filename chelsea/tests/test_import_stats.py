@@ -0,0 +1,79 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from chelsea.models import Player, Manager, Season, Competition
+
+
+class ImportStatsTests(TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.competition = Competition.objects.create(name="Premier League")
+        Manager.objects.create(name="Jose Mourinho", start_year=2004)
+
+    def write(self, name, text):
+        path = self.tmp / name
+        path.write_text(text)
+        return str(path)
+
+    def run_import(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command("import_stats", *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_players_csv_upsert(self):
+        path = self.write("players.csv", (
+            "name,position,nationality,age,start_year,end_year\n"
+            "John Terry,DEF,England,25,1998,\n"
+            "Frank Lampard,MID,England,26,2001,2014\n"
+            "Bad Position,XX,England,26,2001,\n"
+        ))
+        out, err = self.run_import("players", path)
+        self.assertIn("Imported 2 players (1 rejected)", out)
+        self.assertIn("line 4", err)
+
+        self.write("players.csv", "name,position,nationality,age,start_year\nJohn Terry,DEF,England,36,1998\n")
+        self.run_import("players", path)
+        self.assertEqual(Player.objects.get(name="John Terry").age, 36)
+        self.assertEqual(Player.objects.count(), 2)
+
+    def test_seasons_ndjson_upsert_by_constraint(self):
+        Player.objects.create(name="Didier Drogba", position="FWD", nationality="Ivory Coast", age=26, start_year=2004)
+        rows = [
+            {"player": "didier drogba", "competition": "Premier League", "manager": "Jose Mourinho",
+             "year": "2004/05", "goals": 10},
+            {"player": "Didier Drogba", "competition": "Premier League", "year": "2004/05", "goals": 16},
+            {"player": "Unknown", "competition": "Premier League", "year": "2004/05"},
+            {"player": "Didier Drogba", "competition": "Premier League", "year": "2004"},
+        ]
+        path = self.write("seasons.ndjson", "\n".join(json.dumps(row) for row in rows))
+        out, err = self.run_import("seasons", path, "--chunk-size", "1")
+
+        self.assertIn("Imported 2 seasons (2 rejected)", out)
+        self.assertIn("Unknown player", err)
+        season = Season.objects.get()
+        self.assertEqual((season.goals, season.manager_id), (16, None))
+
+    def test_malformed_ndjson_lines_are_rejected(self):
+        lines = [
+            json.dumps({"name": "John Terry", "position": "DEF", "nationality": "England", "age": 25, "start_year": 1998}),
+            '{"name": "Frank Lampard", "position": "MID",',
+            json.dumps({"name": "Ashley Cole", "position": "DEF", "nationality": "England", "age": 25, "start_year": 2006}),
+        ]
+        out, err = self.run_import("players", self.write("players.ndjson", "\n".join(lines)), "--chunk-size", "1")
+        self.assertIn("Imported 2 players (1 rejected)", out)
+        self.assertIn("line 2", err)
+        self.assertIn("Invalid JSON", err)
+
+    def test_managers_are_matched_by_name(self):
+        path = self.write("managers.ndjson", "\n".join(json.dumps(row) for row in [
+            {"name": "Jose Mourinho", "start_year": 2013, "trophies_won": 8},
+            {"name": "Thomas Tuchel", "start_year": 2021},
+        ]))
+        self.run_import("managers", path)
+        self.assertEqual(Manager.objects.count(), 2)
+        self.assertEqual(Manager.objects.get(name="Jose Mourinho").trophies_won, 8)
@@ -0,0 +1,98 @@
+import re
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from chelsea.cache import response_cache
+from chelsea.instrumentation import BUCKETS_MS, RollingHistogram, get_request_metrics, track_request
+from chelsea.models import Player, Season, Competition
+
+
+def server_timing(response):
+    return {
+        name: float(duration)
+        for name, duration in re.findall(r"(\w+);dur=([\d.]+)", response["Server-Timing"])
+    }
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        response_cache().clear()
+        get_request_metrics().reset()
+        self.player = Player.objects.create(
+            name="Frank Lampard", position="MID", nationality="England", age=23, start_year=2001
+        )
+        competition = Competition.objects.create(name="Premier League")
+        Season.objects.create(player=self.player, competition=competition, year="2004/05", goals=13)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('season-list'))
+        timing = server_timing(response)
+        self.assertEqual(set(timing), {"db", "serialize", "view", "total"})
+        self.assertGreater(timing["serialize"], 0)
+        self.assertGreaterEqual(timing["total"], timing["view"])
+        queries = int(re.search(r'desc="(\d+) queries"', response["Server-Timing"]).group(1))
+        self.assertGreater(queries, 0)
+
+    async def test_async_view_queries_are_counted(self):
+        response = await self.async_client.get(reverse('async-top-voted-player'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('desc="0 queries"', response["Server-Timing"])
+
+    def test_queries_outside_requests_are_not_counted(self):
+        with track_request(slow_query=1.0) as timings:
+            Player.objects.count()
+        Player.objects.count()
+        self.assertEqual(timings.queries, 1)
+
+    def test_slow_queries_are_logged_with_the_view_name(self):
+        with override_settings(REQUEST_METRICS={"SLOW_QUERY_MS": 0}), \
+                self.assertLogs("chelsea.requests.slow_queries", "WARNING") as logs:
+            APIClient().get(reverse('season-list'))
+        self.assertIn("season-list", logs.output[0])
+        self.assertEqual(logs.records[0].view_name, "season-list")
+
+    def test_request_log_line(self):
+        with self.assertLogs("chelsea.requests", "INFO") as logs:
+            self.client.get(reverse('player-detail', args=[self.player.pk]))
+        record = logs.records[-1]
+        self.assertEqual((record.view_name, record.status), ("player-detail", 200))
+        self.assertGreater(record.queries, 0)
+
+    def test_metrics_endpoint(self):
+        for _ in range(3):
+            self.client.get(reverse('season-list'))
+        self.client.get("/no/such/page/")
+        data = self.client.get(reverse('request-metrics')).json()
+        endpoint = data["endpoints"]["GET season-list"]
+        self.assertEqual(endpoint["count"], 3)
+        self.assertEqual(sum(endpoint["latency_ms"]["buckets"].values()), 3)
+        self.assertGreater(endpoint["queries"]["mean"], 0)
+        self.assertIn("GET unresolved", data["endpoints"])
+
+    def test_disabled(self):
+        with override_settings(REQUEST_METRICS={"ENABLED": False}):
+            response = APIClient().get(reverse('season-list'))
+        self.assertNotIn("Server-Timing", response)
+
+
+class RollingHistogramTests(TestCase):
+    def test_percentiles_use_bucket_bounds(self):
+        histogram = RollingHistogram(window=60, slots=6)
+        for ms in [3] * 90 + [40] * 9 + [900]:
+            histogram.record(100.0, ms, 2, 1.0, 0.5, False)
+        latency = histogram.snapshot(100.0)["latency_ms"]
+        self.assertEqual((latency["p50"], latency["p90"], latency["p99"], latency["max"]), (5, 5, 50, 900))
+        self.assertEqual(latency["buckets"]["le_5"], 90)
+
+    def test_old_slots_age_out(self):
+        histogram = RollingHistogram(window=60, slots=6)
+        histogram.record(0.0, 10, 1, 1.0, 0.0, False)
+        histogram.record(55.0, 10000, 1, 1.0, 0.0, True)
+        self.assertEqual(histogram.snapshot(59.0)["count"], 2)
+        snapshot = histogram.snapshot(61.0)
+        self.assertEqual((snapshot["count"], snapshot["errors"]), (1, 1))
+        self.assertEqual(snapshot["latency_ms"]["buckets"]["inf"], 1)
+        self.assertIsNone(histogram.snapshot(200.0))
+        self.assertEqual(len(snapshot["latency_ms"]["buckets"]), len(BUCKETS_MS) + 1)
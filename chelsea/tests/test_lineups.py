@@ -0,0 +1,73 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from chelsea.lineups import best_xi, normalize_formation, parse_formation
+from chelsea.cache import response_cache
+from chelsea.models import Player, Manager
+
+
+def make_players(position, count, votes_from=0):
+    return [
+        Player.objects.create(
+            name=f"{position} {i}", position=position, nationality="England", age=25,
+            start_year=2020, vote_count=votes_from + i,
+        )
+        for i in range(count)
+    ]
+
+
+class FormationParsingTests(TestCase):
+    def test_parse_formations(self):
+        self.assertEqual(parse_formation("4-3-3"), {"GK": 1, "DEF": 4, "MID": 3, "FWD": 3})
+        self.assertEqual(parse_formation("4-2-3-1"), {"GK": 1, "DEF": 4, "MID": 5, "FWD": 1})
+
+    def test_invalid_formations(self):
+        for formation in ("4-4", "4-4-3", "a-b-c", None):
+            with self.assertRaises(ValueError):
+                parse_formation(formation)
+
+    def test_normalize_formation(self):
+        self.assertEqual(normalize_formation(" 4-03-3\n"), "4-3-3")
+        with self.assertRaises(ValueError):
+            normalize_formation("4-3-3\r\nX-Injected: 1")
+
+
+class BestPlayersTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+        make_players("GK", 2)
+        make_players("DEF", 5)
+        make_players("MID", 5)
+        make_players("FWD", 4)
+
+    def test_best_xi_single_query(self):
+        with self.assertNumQueries(1):
+            players = best_xi("3-4-3")
+        self.assertEqual(
+            [p.name for p in players],
+            ["GK 1", "DEF 4", "DEF 3", "DEF 2", "MID 4", "MID 3", "MID 2", "MID 1", "FWD 3", "FWD 2", "FWD 1"],
+        )
+
+    def test_view_uses_manager_formation(self):
+        manager = Manager.objects.create(name="Antonio Conte", start_year=2016, preferred_formation="3-4-3")
+        response = self.client.get(reverse('best-players'), {'manager_id': manager.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Formation"], "3-4-3")
+        self.assertEqual([p["position"] for p in response.data].count("MID"), 4)
+
+    def test_view_rejects_bad_formation(self):
+        response = self.client.get(reverse('best-players'), {'formation': '5-5-5'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_view_returns_normalized_formation(self):
+        response = self.client.get(reverse('best-players'), {'formation': '3-4-3\n'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Formation"], "3-4-3")
+
+    def test_view_rejects_bad_manager_id(self):
+        response = self.client.get(reverse('best-players'), {'manager_id': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('async-best-players'), {'manager_id': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
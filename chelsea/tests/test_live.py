@@ -0,0 +1,132 @@
+import json
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from chelsea.cache import bump_version, response_cache, vote_scope
+from chelsea.live import LeaderboardBroadcaster, Subscriber, diff_ranking
+from chelsea.models import Player, Manager
+
+
+def parse_event(text):
+    fields = dict(line.split(": ", 1) for line in text.strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+class DiffRankingTests(TestCase):
+    def test_reports_rank_and_count_changes(self):
+        old = {1: {"id": 1, "votes": 5, "rank": 1}, 2: {"id": 2, "votes": 4, "rank": 2}, 3: {"id": 3, "votes": 1, "rank": 3}}
+        new = {2: {"id": 2, "votes": 6, "rank": 1}, 1: {"id": 1, "votes": 5, "rank": 2}, 4: {"id": 4, "votes": 2, "rank": 3}}
+        changed, removed = diff_ranking(old, new)
+        self.assertEqual(removed, [3])
+        self.assertEqual({entry["id"]: (entry["previous_rank"], entry["votes_delta"]) for entry in changed},
+                         {2: (2, 2), 1: (1, 0), 4: (None, 2)})
+
+    def test_unchanged(self):
+        ranking = {1: {"id": 1, "votes": 5, "rank": 1}}
+        self.assertEqual(diff_ranking(ranking, dict(ranking)), ([], []))
+
+
+class BroadcasterTests(TestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.hazard = Player.objects.create(
+            name="Eden Hazard", position="FWD", nationality="Belgium", age=24, start_year=2012, vote_count=5
+        )
+        self.costa = Player.objects.create(
+            name="Diego Costa", position="FWD", nationality="Spain", age=26, start_year=2014, vote_count=3
+        )
+        Manager.objects.create(name="Jose Mourinho", start_year=2013)
+        self.broadcaster = LeaderboardBroadcaster(interval=60)
+        self.subscribers = []
+
+    def tearDown(self):
+        for subscriber in self.subscribers:
+            self.broadcaster.unsubscribe(subscriber)
+
+    def subscribe(self, maxsize=10):
+        subscriber = Subscriber(maxsize)
+        self.subscribers.append(subscriber)
+        return subscriber, self.broadcaster.subscribe(subscriber)
+
+    def vote(self, player, n=1):
+        Player.objects.filter(pk=player.pk).update(vote_count=player.vote_count + n)
+        player.vote_count += n
+        bump_version(vote_scope(Player))
+
+    def test_snapshot_then_delta(self):
+        subscriber, snapshot = self.subscribe()
+        name, data = parse_event(snapshot)
+        self.assertEqual(name, "snapshot")
+        self.assertEqual([row["name"] for row in data["players"]], ["Eden Hazard", "Diego Costa"])
+
+        self.vote(self.costa, 3)
+        self.assertTrue(self.broadcaster.refresh())
+        name, data = parse_event(subscriber.get(0))
+        self.assertEqual(name, "delta")
+        self.assertEqual(
+            [(row["id"], row["rank"], row["previous_rank"], row["votes_delta"]) for row in data["players"]],
+            [(self.costa.pk, 1, 2, 3), (self.hazard.pk, 2, 1, 0)],
+        )
+        self.assertNotIn("managers", data)
+
+    def test_one_computation_for_all_subscribers(self):
+        first, _ = self.subscribe()
+        second, _ = self.subscribe()
+        with self.assertNumQueries(0):
+            self.assertFalse(self.broadcaster.refresh())
+
+        self.vote(self.hazard)
+        with self.assertNumQueries(3):
+            self.broadcaster.refresh()
+        self.assertIs(first.get(0), second.get(0))
+
+    def test_lagging_subscriber_is_resynced(self):
+        subscriber, _ = self.subscribe(maxsize=1)
+        self.vote(self.costa)
+        self.broadcaster.refresh()
+        self.vote(self.costa)
+        self.broadcaster.refresh()
+        name, data = parse_event(subscriber.get(0))
+        self.assertEqual(name, "snapshot")
+        self.assertEqual(data["players"][0]["votes"], 5)
+        self.assertIsNone(subscriber.get(0))
+
+    def test_thread_stops_with_last_subscriber(self):
+        subscriber, _ = self.subscribe()
+        thread = self.broadcaster._thread
+        self.assertTrue(thread.is_alive())
+        self.broadcaster.unsubscribe(subscriber)
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+
+
+class LeaderboardStreamViewTests(TestCase):
+    def test_stream_starts_with_snapshot(self):
+        response_cache().clear()
+        Player.objects.create(name="Eden Hazard", position="FWD", nationality="Belgium", age=24, start_year=2012)
+        broadcaster = LeaderboardBroadcaster(interval=60)
+
+        with mock.patch("chelsea.api.streams.get_broadcaster", return_value=broadcaster):
+            response = self.client.get(reverse('leaderboard-stream'))
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            name, data = parse_event(next(iter(response.streaming_content)).decode())
+            response.close()
+
+        self.assertEqual(name, "snapshot")
+        self.assertEqual(data["players"][0]["name"], "Eden Hazard")
+        self.assertFalse(broadcaster._subscribers)
+
+    async def test_async_stream(self):
+        await Player.objects.acreate(name="Petr Cech", position="GK", nationality="Czechia", age=22, start_year=2004)
+        broadcaster = LeaderboardBroadcaster(interval=60)
+
+        with mock.patch("chelsea.api.streams.get_broadcaster", return_value=broadcaster):
+            response = await self.async_client.get(reverse('leaderboard-stream'))
+            name, data = parse_event((await anext(aiter(response.streaming_content))).decode())
+            response.close()
+
+        self.assertEqual(name, "snapshot")
+        self.assertEqual(data["best_xi"][0]["name"], "Petr Cech")
+        self.assertFalse(broadcaster._subscribers)
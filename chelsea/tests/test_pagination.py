@@ -0,0 +1,77 @@
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from chelsea.api.pagination import KeysetPagination
+from chelsea.cache import response_cache
+from chelsea.models import Competition, Player
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+        for i in range(5):
+            Competition.objects.create(name=f"Competition {i}")
+
+    def fetch_all(self, url, insert_after_first_page=False):
+        names = []
+        while url:
+            data = self.client.get(url).json()
+            names.extend(row["name"] for row in data["results"])
+            url = data["next"]
+            if insert_after_first_page:
+                Competition.objects.create(name="Late entry")
+                insert_after_first_page = False
+        return names
+
+    def test_pages_follow_primary_key(self):
+        names = self.fetch_all(reverse('competition-list') + "?page_size=2")
+        self.assertEqual(names, [f"Competition {i}" for i in range(5)])
+
+    def test_cursor_is_stable_under_inserts(self):
+        names = self.fetch_all(reverse('competition-list') + "?page_size=2", insert_after_first_page=True)
+        self.assertEqual(names[:5], [f"Competition {i}" for i in range(5)])
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(reverse('competition-list'), {'page_size': KeysetPagination.max_page_size * 10})
+        self.assertEqual(len(response.json()["results"]), 5)
+        request = Request(APIRequestFactory().get('/', {'page_size': 100000}))
+        self.assertEqual(KeysetPagination().get_page_size(request), KeysetPagination.max_page_size)
+
+
+class KeysetOrderingTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+        # Mostly ties: 2 players at 50%, the rest at 0% (nothing attempted).
+        Player.objects.bulk_create([
+            Player(name=f"Player {i}", position="MID", nationality="England", age=20 + i % 3, start_year=2010,
+                   take_ons_attempted=2 if i < 2 else 0, take_ons_successful=1 if i < 2 else 0)
+            for i in range(25)
+        ])
+
+    def fetch_all(self, params):
+        ids, url, data = [], reverse('player-list'), params
+        while url:
+            body = self.client.get(url, data).json()
+            ids.extend(row["id"] for row in body["results"])
+            url, data = body["next"], None
+            self.assertLessEqual(len(ids), 25, "pagination loops")
+        return ids, body
+
+    def test_ties_are_paged_through_exactly_once(self):
+        for ordering in ("-take_on_success_rate", "age", "-vote_count,name"):
+            ids, _ = self.fetch_all({"ordering": ordering, "page_size": 4})
+            self.assertEqual(len(ids), 25, ordering)
+            expected = Player.objects.order_by(*ordering.split(","), "-id" if ordering[0] == "-" else "id")
+            self.assertEqual(ids, list(expected.values_list("id", flat=True)), ordering)
+
+    def test_previous_link_walks_back(self):
+        ids, last = self.fetch_all({"ordering": "-take_on_success_rate", "page_size": 4})
+        back = self.client.get(last["previous"]).json()
+        self.assertEqual([row["id"] for row in back["results"]], ids[-5:-1])
+        self.assertIsNotNone(back["next"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('player-list'), {"ordering": "age", "cursor": "cD1bImEiLDFd"})
+        self.assertEqual(response.status_code, 404)
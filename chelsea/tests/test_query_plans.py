@@ -0,0 +1,131 @@
+"""
+Query-plan and query-count regression tests for the hot read paths.
+
+Plans are captured with QuerySet.explain(). On PostgreSQL sequential scans
+are disabled for the test transaction, since the planner would otherwise
+pick them for these tiny tables whatever indexes exist.
+"""
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from chelsea.aggregates import refresh_career_stats
+from chelsea.cache import response_cache
+from chelsea.models import Player, Manager, Competition, Season, Vote
+
+FULL_SCAN_MARKERS = ("Seq Scan", "SCAN chelsea_")
+
+
+class QueryPlanTests(APITestCase):
+    def setUp(self):
+        self.competition = Competition.objects.create(name="Premier League")
+        self.manager = Manager.objects.create(name="Jose Mourinho", start_year=2004)
+        self.player = Player.objects.create(
+            name="Petr Cech", position="GK", nationality="Czechia", age=22, start_year=2004
+        )
+
+    def plan(self, queryset):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_name=None):
+        plan = self.plan(queryset)
+        for marker in FULL_SCAN_MARKERS:
+            self.assertNotIn(marker, plan, f"Full table scan in plan:\n{plan}")
+        if index_name:
+            self.assertIn(index_name, plan)
+
+    def test_name_lookups_use_lower_index(self):
+        self.assertUsesIndex(Player.objects.name_iexact("petr cech"), "player_name_lower_idx")
+        self.assertUsesIndex(Manager.objects.name_iexact("jose mourinho"), "manager_name_lower_idx")
+
+    def test_position_filter(self):
+        self.assertUsesIndex(Player.objects.filter(position="GK"), "player_position_idx")
+
+    def test_duel_rate_ranking_by_position(self):
+        self.assertUsesIndex(Player.objects.filter(position="DEF").order_by("-aerial_duel_success_rate")[:10],
+                             "player_pos_aerial_rate_idx")
+        self.assertUsesIndex(Player.objects.filter(position="FWD").order_by("-take_on_success_rate")[:10],
+                             "player_pos_take_on_rate_idx")
+
+    def test_season_lookups(self):
+        self.assertUsesIndex(Season.objects.filter(player=self.player, competition=self.competition))
+        self.assertUsesIndex(Season.objects.filter(manager=self.manager, competition=self.competition),
+                             "season_manager_comp_idx")
+        self.assertUsesIndex(Season.objects.filter(competition=self.competition, year__gte="2010"),
+                             "season_competition_year_idx")
+
+    def test_votes_over_time(self):
+        since = timezone.now() - timedelta(days=1)
+        self.assertUsesIndex(Vote.objects.filter(player=self.player, timestamp__gte=since),
+                             "vote_player_timestamp_idx")
+        self.assertUsesIndex(Vote.objects.filter(manager=self.manager, timestamp__gte=since),
+                             "vote_manager_timestamp_idx")
+
+
+class EndpointQueryCountTests(APITestCase):
+    """
+    Each endpoint must run a fixed number of queries however many rows it returns.
+    """
+
+    def setUp(self):
+        self.competition = Competition.objects.create(name="Premier League")
+        self.manager = Manager.objects.create(name="Jose Mourinho", start_year=2004, preferred_formation="4-3-3")
+        self.rows = 0
+        self.add_rows(5)
+
+    def add_rows(self, count):
+        for _ in range(count):
+            self.rows += 1
+            for position in ("GK", "DEF", "MID", "FWD"):
+                player = Player.objects.create(
+                    name=f"{position} {self.rows}", position=position, nationality="England", age=25,
+                    start_year=2004,
+                )
+                Season.objects.create(player=player, manager=self.manager, competition=self.competition,
+                                      year="2004/05", goals=self.rows)
+                Vote.objects.create(player=player)
+        refresh_career_stats()
+
+    def count_queries(self, url, params=None):
+        response_cache().clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, url)
+        return len(queries)
+
+    def assertConstantQueries(self, url, params=None, expected=None):
+        small = self.count_queries(url, params)
+        self.add_rows(5)
+        large = self.count_queries(url, params)
+        self.assertEqual(small, large, f"{url} query count grows with the data")
+        if expected is not None:
+            self.assertEqual(small, expected, url)
+
+    def test_players_list(self):
+        self.assertConstantQueries(reverse('player-list'), expected=1)
+
+    def test_seasons_list(self):
+        self.assertConstantQueries(reverse('season-list'), expected=1)
+
+    def test_managers_list(self):
+        self.assertConstantQueries(reverse('manager-list'), expected=1)
+
+    def test_best_players(self):
+        self.assertConstantQueries(reverse('best-players'), expected=1)
+
+    def test_top_voted_player(self):
+        self.assertConstantQueries(reverse('top-voted-player'), expected=1)
+
+    def test_compare_players(self):
+        ids = ",".join(str(pk) for pk in Player.objects.values_list("pk", flat=True)[:10])
+        self.assertConstantQueries(reverse('compare-players'), {'ids': ids}, expected=2)
+
+    def test_trending(self):
+        self.assertConstantQueries(reverse('trending'), expected=1)
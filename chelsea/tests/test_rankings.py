@@ -0,0 +1,80 @@
+from django.db.models import F
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from chelsea.cache import bump_version, response_cache, vote_scope
+from chelsea.models import Player, Manager
+from chelsea.rankings import rank_index
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False})  # repeated votes from one client
+class RankIndexTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+        for model in (Player, Manager):
+            index = rank_index(model)
+            self.addCleanup(setattr, index, "rebuild_interval", index.rebuild_interval)
+            index.rebuild_interval = 0
+        self.players = [
+            Player.objects.create(name=name, position="MID", nationality="England", age=25, start_year=2010,
+                                  vote_count=votes)
+            for name, votes in (("Lampard", 9), ("Mata", 5), ("Kante", 5), ("Makelele", 3), ("Essien", 0))
+        ]
+        self.lampard, self.mata, self.kante, self.makelele, self.essien = self.players
+
+    def rank(self, player, **params):
+        return self.client.get(reverse('player-rank', args=[player.pk]), params)
+
+    def test_rank_and_neighbours(self):
+        data = self.rank(self.kante, k=1).json()
+        self.assertEqual((data["rank"], data["votes"], data["total"]), (2, 5, 5))
+        self.assertEqual([row["name"] for row in data["above"]], ["Mata"])
+        self.assertEqual([(row["name"], row["rank"]) for row in data["below"]], [("Makelele", 4)])
+
+        data = self.rank(self.lampard, k=2).json()
+        self.assertEqual((data["rank"], data["above"]), (1, []))
+        self.assertEqual([row["name"] for row in data["below"]], ["Mata", "Kante"])
+
+    def test_votes_are_applied_in_place(self):
+        self.rank(self.makelele)
+        for _ in range(3):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('cast-vote'), {'player_id': self.makelele.pk})
+        with self.assertNumQueries(0):
+            data = self.rank(self.makelele, k=1).json()
+        self.assertEqual((data["rank"], data["votes"]), (2, 6))
+        self.assertEqual([row["name"] for row in data["below"]], ["Mata"])
+
+    def test_foreign_writes_trigger_a_rebuild(self):
+        self.rank(self.essien)
+        # Votes counted by another worker: the counters move and the version is bumped.
+        Player.objects.filter(pk=self.essien.pk).update(vote_count=F("vote_count") + 20)
+        bump_version(vote_scope(Player))
+        self.assertEqual(self.rank(self.essien).json()["rank"], 1)
+
+    def test_stale_index_waits_for_the_rebuild_interval(self):
+        index = rank_index(Player)
+        self.rank(self.essien)
+        index.rebuild_interval = 60
+        Player.objects.filter(pk=self.essien.pk).update(vote_count=100)
+        bump_version(Player)
+        self.assertEqual(self.rank(self.essien).json()["rank"], 5)
+        index.rebuild_interval = 0
+        self.assertEqual(self.rank(self.essien).json()["rank"], 1)
+
+    def test_old_index_is_rebuilt_without_a_bump(self):
+        index = rank_index(Player)
+        self.rank(self.essien)
+        # Another worker's votes under a per-process cache: no bump reaches this one.
+        Player.objects.filter(pk=self.essien.pk).update(vote_count=100)
+        self.assertEqual(self.rank(self.essien).json()["rank"], 5)
+        self.addCleanup(setattr, index, "max_age", index.max_age)
+        index.max_age = 0
+        self.assertEqual(self.rank(self.essien).json()["rank"], 1)
+
+    def test_manager_rank_and_unknown_ids(self):
+        manager = Manager.objects.create(name="Jose Mourinho", start_year=2004, vote_count=2)
+        self.assertEqual(self.client.get(reverse('manager-rank', args=[manager.pk])).json()["rank"], 1)
+        self.assertEqual(self.client.get(reverse('manager-rank', args=[manager.pk + 1])).status_code, 404)
+        self.assertEqual(self.rank(self.mata, k="x").status_code, 400)
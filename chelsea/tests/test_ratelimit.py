@@ -0,0 +1,148 @@
+import threading
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from chelsea.cache import LocalRedis
+from chelsea.models import Player, Vote
+from chelsea.ratelimit import (
+    MemoryStore, RedisStore, Rule, VoteRateLimiter, get_rate_limiter, reset_rate_limiter, vote_target,
+)
+
+LIMITS = {"IP": (100, 60), "CLIENT": (3, 60), "ENTITY": {"player": (1, 3600)}}
+
+
+class SlidingWindowTests(TestCase):
+    def check_store(self, store):
+        rule = Rule(4, 10)
+        for now in (100.0, 101.0, 102.0, 103.0):
+            self.assertIsNone(store.hit([("k", rule)], now=now))
+        position, wait = store.hit([("k", rule)], now=104.0)
+        self.assertEqual(position, 0)
+        # The next window opens at 110; 4 * (1 - e) <= 3 once 2.5s into it.
+        self.assertAlmostEqual(wait, 8.5)
+
+        # Half-way through the next window the previous one counts for 2.
+        self.assertIsNone(store.hit([("k", rule)], now=115.0))
+        self.assertIsNone(store.hit([("k", rule)], now=115.0))
+        self.assertEqual(store.hit([("k", rule)], now=115.0)[0], 0)
+        # Two windows later it's all forgotten.
+        for _ in range(4):
+            self.assertIsNone(store.hit([("k", rule)], now=130.0))
+
+    def test_memory_store(self):
+        self.check_store(MemoryStore(shards=4))
+
+    def test_redis_store(self):
+        client = LocalRedis()
+        self.check_store(RedisStore(client))
+        self.assertTrue(client.get("ratelimit:k:13"))
+
+    def test_rejected_hits_are_not_counted(self):
+        store = MemoryStore(shards=4)
+        loose, tight = ("loose", Rule(10, 10)), ("tight", Rule(1, 10))
+        self.assertIsNone(store.hit([loose, tight], now=0.0))
+        for _ in range(5):
+            self.assertEqual(store.hit([loose, tight], now=1.0)[0], 1)
+        self.assertIsNone(store.hit([loose], now=1.0))
+        counters = store._shards[hash("loose") % 4].counters
+        self.assertEqual((counters["loose"][1], counters["tight"][1]), (2, 1))
+
+    def test_expired_counters_are_swept(self):
+        store = MemoryStore(shards=1, sweep_every=10)
+        for i in range(9):
+            store.hit([(f"old{i}", Rule(1, 10))], now=0.0)
+        store.hit([("new", Rule(1, 10))], now=25.0)
+        self.assertEqual(list(store._shards[0].counters), ["new"])
+
+    def test_vote_target_normalises_ids(self):
+        for value in (5, "5", "05", " 5", 5.0):
+            self.assertEqual(vote_target({"player_id": value}), "player:5")
+        self.assertEqual(vote_target({"vote_for": "7", "player_id": 1}), "player:7")
+        self.assertEqual(vote_target({"manager_id": "3"}), "manager:3")
+        for value in ("abc", "5.0", [5], float("inf")):
+            self.assertIsNone(vote_target({"player_id": value}))
+
+    def test_client_ip_behind_proxies(self):
+        limiter = VoteRateLimiter(MemoryStore(), (1, 1), (1, 1), {}, proxy_hops=1)
+        meta = {"REMOTE_ADDR": "10.0.0.1", "HTTP_X_FORWARDED_FOR": "6.6.6.6, 1.2.3.4"}
+        self.assertEqual(limiter.client_ip(meta), "1.2.3.4")
+        self.assertEqual(limiter.client_ip({"REMOTE_ADDR": "10.0.0.1"}), "10.0.0.1")
+
+
+@override_settings(RATE_LIMIT=LIMITS)
+class VoteRateLimitTests(APITestCase):
+    def setUp(self):
+        reset_rate_limiter()
+        self.players = [
+            Player.objects.create(name=f"Player {i}", position="MID", nationality="England", age=25, start_year=2010)
+            for i in range(5)
+        ]
+
+    def vote(self, player, **extra):
+        return self.client.post(reverse('cast-vote'), {"player_id": player.pk}, format="json", **extra)
+
+    def test_duplicate_votes_are_rejected_before_any_query(self):
+        self.assertEqual(self.vote(self.players[0]).status_code, 201)
+        with self.assertNumQueries(0):
+            response = self.vote(self.players[0])
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 3000)
+        self.assertEqual(Vote.objects.count(), 1)
+
+        # Spelling the id differently doesn't make it another entity.
+        response = self.client.post(reverse('cast-vote'), {"player_id": f"0{self.players[0].pk}"}, format="json")
+        self.assertEqual(response.status_code, 429)
+
+        # Nor does a new client token; another IP may still vote for them.
+        self.assertEqual(self.vote(self.players[0], HTTP_X_CLIENT_TOKEN="abc").status_code, 429)
+        self.assertEqual(self.vote(self.players[0], REMOTE_ADDR="10.1.1.1").status_code, 201)
+
+    def test_client_limit(self):
+        for player in self.players[:3]:
+            self.assertEqual(self.vote(player).status_code, 201)
+        self.assertEqual(self.vote(self.players[3]).status_code, 429)
+        self.assertEqual(self.vote(self.players[3], REMOTE_ADDR="10.1.1.1").status_code, 201)
+
+    def test_comparison_votes_count_for_the_chosen_player(self):
+        self.assertEqual(self.vote(self.players[1]).status_code, 201)
+        response = self.client.post(reverse('vote-comparison'), {
+            "player1_id": self.players[0].pk, "player2_id": self.players[1].pk, "vote_for": self.players[1].pk,
+        }, format="json")
+        self.assertEqual(response.status_code, 429)
+
+    async def test_async_views(self):
+        url = reverse('async-cast-vote')
+        player = self.players[2]
+        response = await self.async_client.post(url, {"player_id": player.pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        response = await self.async_client.post(url, {"player_id": player.pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertIn("throttled", response.json()["detail"])
+
+    async def test_async_checks_run_off_the_event_loop(self):
+        limiter, threads = get_rate_limiter(), []
+        real_check = limiter.check
+
+        def check(meta, data):
+            threads.append(threading.get_ident())
+            return real_check(meta, data)
+
+        with mock.patch.object(limiter, "check", side_effect=check):
+            response = await self.async_client.post(reverse('async-cast-vote'), {"player_id": self.players[3].pk},
+                                                    content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertNotEqual(threads, [threading.get_ident()])
+
+    def test_disabled_and_redis_backends(self):
+        with override_settings(RATE_LIMIT={"ENABLED": False}):
+            self.assertIsNone(get_rate_limiter())
+        with override_settings(RATE_LIMIT={**LIMITS, "BACKEND": "local-redis"}):
+            self.assertIsInstance(get_rate_limiter().store, RedisStore)
+            get_rate_limiter().store.reset()
+            self.assertEqual(self.vote(self.players[4]).status_code, 201)
+            self.assertEqual(self.vote(self.players[4]).status_code, 429)
+            get_rate_limiter().store.reset()
@@ -0,0 +1,107 @@
+import gzip
+import json
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from chelsea.api.renderers import ORJSONRenderer, ORJSONResponse, msgpack
+from chelsea.cache import response_cache
+from chelsea.middleware import CompressionMiddleware
+from chelsea.models import Player, Season, Competition
+
+
+class RendererTests(TestCase):
+    def test_orjson_matches_the_stdlib_renderer(self):
+        data = {"name": "Petr Čech", "rate": Decimal("0.5"), "when": datetime(2005, 5, 7, tzinfo=timezone.utc),
+                "ids": [1, 2, None], 3: True}
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_orjson_response(self):
+        response = ORJSONResponse({"error": "nope"}, status=400)
+        self.assertEqual((response.status_code, response["Content-Type"]), (400, "application/json"))
+        self.assertEqual(json.loads(response.content), {"error": "nope"})
+        with self.assertRaises(TypeError):
+            ORJSONResponse([1, 2])
+
+    def test_function_views_use_the_api_renderers(self):
+        Player.objects.create(name="Eden Hazard", position="FWD", nationality="Belgium", age=21, start_year=2012)
+        for url in (reverse('api_home'), reverse('player-get-by-name') + "?name=eden hazard",
+                    reverse('player-get-by-name') + "?name=nobody"):
+            response = self.client.get(url, HTTP_ACCEPT="application/json")
+            self.assertIsInstance(response.accepted_renderer, ORJSONRenderer, url)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get(reverse('player-get-by-name')).status_code, 400)
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_msgpack(self):
+        response = self.client.get(reverse('api_home'), HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content), {"message": "Welcome to Chelsea Tracker API!"})
+
+
+@override_settings(COMPRESSION={"MIN_SIZE": 200})
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        response_cache().clear()
+        competition = Competition.objects.create(name="Premier League")
+        for i in range(10):
+            player = Player.objects.create(
+                name=f"Player {i}", position="MID", nationality="England", age=25, start_year=2000
+            )
+            Season.objects.create(player=player, competition=competition, year="2004/05", goals=i)
+
+    def test_large_responses_are_gzipped(self):
+        url = reverse('season-list')
+        plain = self.client.get(url)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(response["ETag"], "W/" + plain["ETag"])
+
+        # The weak tag still revalidates.
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+    def test_cache_hits_are_not_recompressed(self):
+        url = reverse('season-list')
+        first = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        with mock.patch("chelsea.middleware.gzip.compress") as compress:
+            second = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        compress.assert_not_called()
+        self.assertEqual((second["X-Cache"], second.content), ("HIT", first.content))
+
+    def test_refused_or_small_responses_are_left_alone(self):
+        response = self.client.get(reverse('season-list'), HTTP_ACCEPT_ENCODING="gzip;q=0, identity")
+        self.assertNotIn("Content-Encoding", response)
+        self.assertIn("Accept-Encoding", response["Vary"])
+        response = self.client.get(reverse('api_home'), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(self.client.get(reverse('season-list'), HTTP_ACCEPT_ENCODING="gzip;q=0.5")
+                         ["Content-Encoding"], "gzip")
+
+    def test_streaming_responses_are_left_alone(self):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        middleware = CompressionMiddleware(lambda request: StreamingHttpResponse(iter([b"x" * 5000])))
+        self.assertNotIn("Content-Encoding", middleware(request))
+        middleware = CompressionMiddleware(lambda request: HttpResponse(b"x" * 5000))
+        self.assertEqual(middleware(request)["Content-Encoding"], "gzip")
+
+
+class RenderBenchmarkTests(TestCase):
+    def test_command(self):
+        call_command("seed_synthetic", players=20, managers=3, seasons=60, votes=50, stdout=StringIO())
+        out = StringIO()
+        call_command("bench_renderers", repeat=2, stdout=out)
+        output = out.getvalue()
+        self.assertIn("season-list", output)
+        self.assertIn("orjson", output)
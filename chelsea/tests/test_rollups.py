@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from chelsea.cache import response_cache
+from chelsea.models import Player, Manager, Vote, VoteRollup
+from chelsea.rollups import backfill_rollups, hour_bucket, parse_window, trending
+from chelsea.votes import apply_vote_batch, record_vote
+
+NOW = datetime(2025, 3, 10, 15, 30, tzinfo=timezone.utc)
+
+
+class VoteRollupTests(TestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.palmer = Player.objects.create(
+            name="Cole Palmer", position="MID", nationality="England", age=22, start_year=2023
+        )
+        self.jackson = Player.objects.create(
+            name="Nicolas Jackson", position="FWD", nationality="Senegal", age=23, start_year=2023
+        )
+        self.manager = Manager.objects.create(name="Enzo Maresca", start_year=2024)
+
+    def votes_at(self, player, *hours_ago):
+        apply_vote_batch([(player.id, None, NOW - timedelta(hours=h)) for h in hours_ago])
+
+    def test_record_vote_updates_hour_and_day_buckets(self):
+        record_vote(player_id=self.palmer.id)
+        record_vote(player_id=self.palmer.id)
+        record_vote(manager_id=self.manager.id)
+        self.assertEqual(
+            sorted(VoteRollup.objects.filter(player=self.palmer).values_list("granularity", "count")),
+            [("day", 2), ("hour", 2)],
+        )
+        self.assertEqual(VoteRollup.objects.filter(manager=self.manager).count(), 2)
+
+    def test_sliding_windows(self):
+        self.votes_at(self.palmer, 0, 1, 30, 30, 100)
+        self.votes_at(self.jackson, 0, 0, 0, 2)
+
+        self.assertEqual(trending("player", timedelta(hours=1), now=NOW)[0]["name"], "Nicolas Jackson")
+        day = trending("player", timedelta(hours=24), now=NOW)
+        self.assertEqual([(row["name"], row["votes"]) for row in day], [("Nicolas Jackson", 4), ("Cole Palmer", 2)])
+        week = trending("player", timedelta(days=7), now=NOW)
+        self.assertEqual(week[0], {"id": self.palmer.id, "name": "Cole Palmer", "votes": 5})
+
+    def test_window_sums_match_raw_votes(self):
+        self.votes_at(self.palmer, *range(0, 24 * 9, 5))
+        for window in (timedelta(hours=5), timedelta(hours=30), timedelta(days=3), timedelta(days=8)):
+            expected = Vote.objects.filter(timestamp__gte=hour_bucket(NOW - window)).count()
+            self.assertEqual(trending("player", window, now=NOW)[0]["votes"], expected)
+
+    def test_backfill_matches_incremental(self):
+        self.votes_at(self.palmer, 0, 5, 50)
+        before = sorted(VoteRollup.objects.values_list("granularity", "bucket", "count"))
+        self.assertEqual(backfill_rollups(), len(before))
+        self.assertEqual(sorted(VoteRollup.objects.values_list("granularity", "bucket", "count")), before)
+
+    def test_parse_window(self):
+        self.assertEqual(parse_window("36h"), timedelta(hours=36))
+        for value in ("", "0h", "5w", "400d"):
+            with self.assertRaises(ValueError):
+                parse_window(value)
+
+    def test_trending_endpoint(self):
+        record_vote(manager_id=self.manager.id)
+        response = self.client.get(reverse('trending'), {'type': 'manager', 'window': '1h'})
+        self.assertEqual(response.json()["results"], [{"id": self.manager.id, "name": "Enzo Maresca", "votes": 1}])
+        self.assertEqual(self.client.get(reverse('trending'), {'type': 'vote'}).status_code, 400)
+        for limit in ("-1", "0", "abc"):
+            self.assertEqual(self.client.get(reverse('trending'), {'limit': limit}).status_code, 400)
+
+    def test_trending_validators_move_with_the_hour(self):
+        url = reverse('trending')
+        with mock.patch("chelsea.api.views.timezone.now", return_value=NOW):
+            etag = self.client.get(url)["ETag"]
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with mock.patch("chelsea.api.views.timezone.now", return_value=NOW + timedelta(hours=1)):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response["X-Cache"]), (200, "MISS"))
+        self.assertNotEqual(response["ETag"], etag)
@@ -0,0 +1,120 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from chelsea.cache import bump_version, response_cache, vote_scope
+from chelsea.importers import PlayerImporter
+from chelsea.models import Player, Manager
+from chelsea.search import name_index, normalize, trigrams
+
+
+def make_player(name, position="FWD"):
+    return Player.objects.create(name=name, position=position, nationality="England", age=25, start_year=2004)
+
+
+class NormalizeTests(TestCase):
+    def test_strips_accents_case_and_spacing(self):
+        self.assertEqual(normalize("  José   MOURINHO "), "jose mourinho")
+        self.assertEqual(normalize("César Azpilicueta"), "cesar azpilicueta")
+
+    def test_trigrams_match_pg_trgm(self):
+        self.assertEqual(trigrams("cat"), {"  c", " ca", "cat", "at "})
+
+
+class NameIndexTests(TestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.hazard = make_player("Eden Hazard")
+        self.azpi = make_player("César Azpilicueta", "DEF")
+        self.drogba = make_player("Didier Drogba")
+        self.index = name_index(Player)
+
+    def test_prefix_on_any_word(self):
+        names = [hit["name"] for hit in self.index.search("haz")]
+        self.assertEqual(names, ["Eden Hazard"])
+        self.assertEqual(self.index.search("eden h")[0]["score"], 0.9)
+
+    def test_accent_insensitive(self):
+        self.assertEqual(self.index.search("cesar")[0]["id"], self.azpi.pk)
+        self.assertEqual(self.index.search("Cesar Azpilicueta")[0]["score"], 1.0)
+
+    def test_typo_tolerant(self):
+        self.assertEqual(self.index.search("drogbq")[0]["id"], self.drogba.pk)
+        self.assertEqual(self.index.search("hazzard")[0]["id"], self.hazard.pk)
+        self.assertEqual(self.index.search("zzzz"), [])
+
+    def test_lookups_do_not_query(self):
+        self.index.search("eden")
+        with self.assertNumQueries(0):
+            self.index.search("hazard")
+            self.index.resolve(["Eden Hazard"])
+
+    def test_rebuilt_after_write(self):
+        self.index.search("eden")
+        with self.captureOnCommitCallbacks(execute=True):
+            make_player("Mason Mount", "MID")
+        self.assertEqual(self.index.search("mount")[0]["name"], "Mason Mount")
+
+    def test_votes_do_not_rebuild(self):
+        self.index.search("eden")
+        bump_version(vote_scope(Player))  # what every committed vote does
+        with self.assertNumQueries(0):
+            self.index.search("hazard")
+
+    def test_rows_written_by_other_workers_are_resolved(self):
+        self.index.search("eden")
+        # No signal, so this process's name version doesn't move.
+        Player.objects.bulk_create([Player(name="Reece James", position="DEF", nationality="England",
+                                           age=20, start_year=2019)])
+        with self.assertNumQueries(1):
+            pk = self.index.resolve(["reece james"])["reece james"]
+        self.assertEqual(pk, Player.objects.get(name="Reece James").pk)
+        self.assertEqual(self.index.search("reece")[0]["id"], pk)
+
+    def test_snapshots_expire(self):
+        self.index.search("eden")
+        Player.objects.bulk_create([Player(name="Mason Mount", position="MID", nationality="England",
+                                           age=20, start_year=2019)])
+        self.assertEqual(self.index.search("mount"), [])
+        self.addCleanup(setattr, self.index, "max_age", self.index.max_age)
+        self.index.max_age = 0
+        self.assertEqual(self.index.search("mount")[0]["name"], "Mason Mount")
+
+    def test_rebuilt_after_import(self):
+        self.index.search("eden")
+        PlayerImporter().run([(1, {"name": "Reece James", "position": "DEF", "nationality": "England",
+                                   "age": 20, "start_year": 2019})])
+        self.assertEqual(self.index.resolve(["reece james"])["reece james"], Player.objects.get(name="Reece James").pk)
+
+
+class NameSearchApiTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.hazard = make_player("Eden Hazard")
+        self.manager = Manager.objects.create(name="José Mourinho", start_year=2004)
+
+    def test_player_get_by_name(self):
+        response = self.client.get(reverse('get-player-by-name'), {'name': 'eden hazard'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["id"], self.hazard.pk)
+
+    def test_manager_get_by_name(self):
+        response = self.client.get(reverse('get-manager-by-name'), {'name': 'Jose Mourinho'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["name"], "José Mourinho")
+
+        response = self.client.get(reverse('get-manager-by-name'), {'name': 'Antonio Conte'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_search(self):
+        response = self.client.get(reverse('manager-search'), {'q': 'mour'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["id"], self.manager.pk)
+
+    def test_resolve(self):
+        response = self.client.post(reverse('player-resolve'), {'names': ['EDEN HAZARD', 'Nobody']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"resolved": {"EDEN HAZARD": self.hazard.pk}, "unresolved": ["Nobody"]})
+
+        response = self.client.post(reverse('player-resolve'), {'names': 'Eden Hazard'}, format='json')
+        self.assertEqual(response.status_code, 400)
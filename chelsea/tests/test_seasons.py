@@ -0,0 +1,49 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from chelsea.cache import response_cache
+from chelsea.models import Player, Manager, Competition, Season
+
+
+class SeasonReadPathTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.competition = Competition.objects.create(name="Premier League")
+        self.manager = Manager.objects.create(name="Jose Mourinho", start_year=2004)
+        for i in range(5):
+            player = Player.objects.create(
+                name=f"Player {i}", position="MID", nationality="England", age=25, start_year=2004
+            )
+            Season.objects.create(
+                player=player, manager=self.manager, competition=self.competition, year="2004/05", goals=i
+            )
+
+    def test_list_runs_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('season-list'))
+        first = response.json()["results"][0]
+        self.assertEqual((first["player"], first["manager"], first["competition"]),
+                         ("Player 0", "Jose Mourinho", "Premier League"))
+
+    def test_compact_representation(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('season-list'), {'compact': 'true'})
+        first = response.json()["results"][0]
+        self.assertEqual(first["competition"], {"id": self.competition.id, "name": "Premier League"})
+        self.assertEqual(first["manager"], {"id": self.manager.id, "name": "Jose Mourinho"})
+
+    def test_admin_changelist_query_count_is_constant(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+
+        def changelist_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get("/admin/chelsea/season/").status_code, 200)
+            return len(queries)
+
+        before = changelist_queries()
+        for season in Season.objects.all():
+            Season.objects.create(player=season.player, competition=self.competition, year="2005/06")
+        self.assertEqual(changelist_queries(), before)
@@ -0,0 +1,83 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from chelsea.cache import response_cache
+from chelsea.models import Player, Manager, Season, Competition
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.competition = Competition.objects.create(name="Premier League")
+        self.manager = Manager.objects.create(name="Jose Mourinho", start_year=2004, games_won=3, games_lost=1)
+        self.players = [
+            Player.objects.create(name=name, position="FWD", nationality="Ivory Coast", age=26, start_year=2004,
+                                  photo_url=f"https://example.com/{i}.jpg")
+            for i, name in enumerate(("Didier Drogba", "Hernan Crespo", "Eidur Gudjohnsen"))
+        ]
+        for player in self.players:
+            for year in ("2004/05", "2005/06"):
+                Season.objects.create(player=player, manager=self.manager, competition=self.competition, year=year)
+
+    def get(self, name, params, *args):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name, args=args), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), [query["sql"] for query in queries]
+
+    def test_fields_trim_output_and_columns(self):
+        data, queries = self.get('player-list', {"fields": "id,name,position,photo_url"})
+        self.assertEqual(set(data["results"][0]), {"id", "name", "position", "photo_url"})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("nationality", queries[0])
+        self.assertNotIn("vote_count", queries[0])
+
+    def test_exclude(self):
+        data, queries = self.get('player-detail', {"exclude": "nationality,age"}, self.players[0].pk)
+        self.assertNotIn("nationality", data)
+        self.assertIn("vote_count", data)
+        self.assertNotIn('"nationality"', queries[0])
+
+    def test_computed_field_loads_its_columns(self):
+        data, queries = self.get('manager-list', {"fields": "name,win_rate"})
+        self.assertEqual(data["results"][0], {"name": "Jose Mourinho", "win_rate": 75.0})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("biggest_win", queries[0])
+
+    def test_ordering_field_is_loaded_for_the_cursor(self):
+        data, queries = self.get('player-list', {"fields": "name", "ordering": "-age", "page_size": 1})
+        self.assertIsNotNone(data["next"])
+        self.assertEqual(len(queries), 1)
+
+    def test_season_relations(self):
+        data, queries = self.get('season-list', {"fields": "id,year,competition"})
+        self.assertEqual(data["results"][0]["competition"], "Premier League")
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("chelsea_player", queries[0])
+
+    def test_expand_seasons(self):
+        data, queries = self.get('player-list', {"fields": "id,name", "expand": "seasons"})
+        self.assertEqual(len(queries), 2)
+        seasons = data["results"][0]["seasons"]
+        self.assertEqual([season["year"] for season in seasons], ["2004/05", "2005/06"])
+        self.assertEqual(seasons[0]["manager"], {"id": self.manager.pk, "name": "Jose Mourinho"})
+        self.assertNotIn("player", seasons[0])
+
+        data, queries = self.get('manager-detail', {"expand": "seasons"}, self.manager.pk)
+        self.assertEqual(len(data["seasons"]), 6)
+        self.assertEqual(len(queries), 2)
+
+    def test_expanded_response_follows_season_writes(self):
+        self.get('player-list', {"expand": "seasons"})
+        with self.captureOnCommitCallbacks(execute=True):
+            Season.objects.filter(year="2005/06").update(goals=7)
+            Season.objects.get(player=self.players[0], year="2005/06").save()
+        data, _ = self.get('player-list', {"expand": "seasons"})
+        self.assertEqual(data["results"][0]["seasons"][1]["goals"], 7)
+
+    def test_unknown_names(self):
+        for params in ({"fields": "id,salary"}, {"expand": "votes"}):
+            response = self.client.get(reverse('player-list'), params)
+            self.assertEqual(response.status_code, 400)
@@ -0,0 +1,105 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase
+
+from chelsea.models import Player, Manager, Vote
+from chelsea.vote_buffer import VoteBuffer, recover_spool
+
+
+class VoteBufferTests(TestCase):
+    def setUp(self):
+        self.spool_dir = Path(tempfile.mkdtemp())
+        self.player = Player.objects.create(
+            name="Frank Lampard", position="MID", nationality="England", age=30, start_year=2001
+        )
+        self.manager = Manager.objects.create(name="Carlo Ancelotti", start_year=2009)
+        self.buffer = VoteBuffer(self.spool_dir, batch_size=2, start_thread=False)
+
+    def tearDown(self):
+        self.buffer.close()
+
+    def test_votes_are_queued_until_flush(self):
+        self.buffer.submit(player_id=self.player.id)
+        self.buffer.submit(player_id=str(self.player.id))
+        self.buffer.submit(manager_id=self.manager.id)
+        self.assertFalse(Vote.objects.exists())
+
+        self.assertEqual(self.buffer.flush(), 3)
+        self.player.refresh_from_db()
+        self.manager.refresh_from_db()
+        self.assertEqual((self.player.vote_count, self.manager.vote_count), (2, 1))
+        self.assertEqual(Vote.objects.count(), 3)
+
+    def test_unknown_ids_are_rejected(self):
+        with self.assertRaises(Player.DoesNotExist):
+            self.buffer.submit(player_id=9999)
+        with self.assertRaises(Manager.DoesNotExist):
+            self.buffer.submit(manager_id="abc")
+
+    def test_spool_is_replayed_after_crash(self):
+        self.buffer.submit(player_id=self.player.id)
+        # Simulate a worker dying before its flush: drop the in-memory queue.
+        self.buffer._pending = []
+        self.buffer._closed = True
+
+        self.assertEqual(recover_spool(self.spool_dir), 1)
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.vote_count, 1)
+        self.assertEqual(list(self.spool_dir.iterdir()), [])
+
+    def test_spools_are_claimed_before_replay(self):
+        spool_dir = Path(tempfile.mkdtemp())
+        dead = spool_dir / "votes-999999999.spool"
+        dead.write_text(f"p {self.player.id} 1700000000.0\n")
+        # Claimed by a live worker: left alone.
+        claimed = spool_dir / f"votes-999999998.spool.replaying-{os.getppid()}"
+        claimed.write_text(f"p {self.player.id} 1700000000.0\n")
+
+        real_rename = os.rename
+
+        def lose_race(src, dst):
+            if src == dead:
+                real_rename(src, dst)  # another worker claims it first...
+                raise FileNotFoundError(src)
+            return real_rename(src, dst)
+
+        with mock.patch("chelsea.vote_buffer.os.rename", side_effect=lose_race):
+            self.assertEqual(recover_spool(spool_dir), 0)
+        self.assertFalse(Vote.objects.exists())
+        self.assertTrue(claimed.exists())
+
+        # ...and replays it, under its own claim.
+        self.assertEqual(recover_spool(spool_dir), 1)
+        self.assertEqual(Vote.objects.count(), 1)
+        self.assertFalse(list(spool_dir.glob("votes-999999999*")))
+
+    def test_failed_flush_is_retried_without_double_counting(self):
+        from chelsea import vote_buffer
+
+        for _ in range(3):
+            self.buffer.submit(player_id=self.player.id)
+        real_apply, calls = vote_buffer.apply_vote_batch, []
+
+        def fail_second_chunk(votes):
+            calls.append(votes)
+            if len(calls) == 2:
+                raise RuntimeError("db down")
+            return real_apply(votes)
+
+        # The first chunk (batch_size=2) is stored, then the second one fails.
+        with mock.patch.object(vote_buffer, "apply_vote_batch", side_effect=fail_second_chunk):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertFalse(Vote.objects.exists())
+
+        self.assertEqual(self.buffer.flush(), 3)
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.vote_count, 3)
+        self.assertEqual(Vote.objects.count(), 3)
+
+    def test_votes_for_deleted_players_are_dropped(self):
+        self.buffer.submit(player_id=self.player.id)
+        self.player.delete()
+        self.assertEqual(self.buffer.flush(), 0)
@@ -0,0 +1,67 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from chelsea.cache import response_cache
+from chelsea.models import Player, Manager, Vote
+from chelsea.votes import reconcile_vote_counts
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False})  # repeated votes from one client
+class VoteCounterTests(APITestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.player = Player.objects.create(
+            name="Eden Hazard", position="FWD", nationality="Belgium", age=24, start_year=2012
+        )
+        self.other = Player.objects.create(
+            name="Diego Costa", position="FWD", nationality="Spain", age=26, start_year=2014
+        )
+        self.manager = Manager.objects.create(name="Jose Mourinho", start_year=2013)
+
+    def test_cast_vote_bumps_counter(self):
+        self.client.post(reverse('cast-vote'), {'player_id': self.player.id})
+        self.client.post(reverse('cast-vote'), {'manager_id': self.manager.id})
+        self.player.refresh_from_db()
+        self.manager.refresh_from_db()
+        self.assertEqual(self.player.vote_count, 1)
+        self.assertEqual(self.manager.vote_count, 1)
+        self.assertEqual(Vote.objects.count(), 2)
+
+    def test_cast_vote_unknown_player(self):
+        response = self.client.post(reverse('cast-vote'), {'player_id': 9999})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Vote.objects.exists())
+
+    def test_vote_comparison_bumps_counter(self):
+        response = self.client.post(reverse('vote-comparison'), {
+            'player1_id': self.player.id, 'player2_id': self.other.id, 'vote_for': self.other.id
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.vote_count, 1)
+
+    def test_player_list_query_count_is_constant(self):
+        for _ in range(3):
+            self.client.post(reverse('cast-vote'), {'player_id': self.player.id})
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('player-list'))
+        counts = {row['name']: row['vote_count'] for row in response.json()['results']}
+        self.assertEqual(counts, {"Eden Hazard": 3, "Diego Costa": 0})
+
+    def test_reconcile_rebuilds_counters(self):
+        Vote.objects.create(player=self.player)
+        Vote.objects.create(player=self.player)
+        Player.objects.filter(pk=self.other.pk).update(vote_count=7)
+
+        self.assertEqual(reconcile_vote_counts(), (2, 0))
+        self.player.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.player.vote_count, self.other.vote_count), (2, 0))
+
+        call_command('reconcile_vote_counts', stdout=StringIO())
+        self.assertEqual(reconcile_vote_counts(), (0, 0))
@@ -1,16 +1,31 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django.test import override_settings
 from django.urls import reverse
+from chelsea.aggregates import refresh_career_stats
+from chelsea.cache import response_cache
 from chelsea.models import Player, Manager, Competition, Season, Vote
 
 
+@override_settings(RATE_LIMIT={"ENABLED": False})  # repeated votes from one client
 class APITestCaseEndpoints(APITestCase):
     def setUp(self):
         """Set up initial test data."""
-        self.player = Player.objects.create(name="Test Player")
-        self.manager = Manager.objects.create(name="Test Manager")
+        response_cache().clear()
+        self.player = Player.objects.create(
+            name="Test Player", position="FWD", nationality="England", age=25, start_year=2020
+        )
+        self.other_player = Player.objects.create(
+            name="Other Player", position="FWD", nationality="France", age=27, start_year=2021
+        )
+        self.manager = Manager.objects.create(name="Test Manager", start_year=2020, preferred_formation="4-3-3")
+        self.other_manager = Manager.objects.create(name="Other Manager", start_year=2022)
         self.competition = Competition.objects.create(name="Test Competition")
-        self.season = Season.objects.create(year=2023)
+        self.season = Season.objects.create(
+            player=self.player, manager=self.manager, competition=self.competition, year="2023/24",
+            goals=10, matches=30, minutes_played=2400,
+        )
+        refresh_career_stats()
 
     def test_api_home(self):
         response = self.client.get(reverse('api_home'))
@@ -43,10 +58,13 @@ class APITestCaseEndpoints(APITestCase):
     def test_cast_vote(self):
         response = self.client.post(reverse('cast-vote'), {'player_id': self.player.id})
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Vote.objects.filter(player=self.player).count(), 1)
 
     def test_vote_comparison(self):
-        response = self.client.get(reverse('vote-comparison'))
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse('vote-comparison'), {
+            'player1_id': self.player.id, 'player2_id': self.other_player.id, 'vote_for': self.player.id,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
     def test_best_players(self):
         response = self.client.get(reverse('best-players'))
@@ -61,11 +79,15 @@ class APITestCaseEndpoints(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_compare_players(self):
-        response = self.client.get(reverse('compare-players'))
+        response = self.client.get(reverse('compare-players'), {
+            'player1_id': self.player.id, 'player2_id': self.other_player.id,
+        })
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_compare_managers(self):
-        response = self.client.get(reverse('compare-managers'))
+        response = self.client.get(reverse('compare-managers'), {
+            'manager1_id': self.manager.id, 'manager2_id': self.other_manager.id,
+        })
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_player_competition_stats(self):
@@ -75,3 +97,4 @@ class APITestCaseEndpoints(APITestCase):
     def test_manager_competition_stats(self):
         response = self.client.get(reverse('manager-competition-stats', args=[self.manager.id, self.competition.id]))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["stats"]["goals"], 10)
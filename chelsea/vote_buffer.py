@@ -0,0 +1,298 @@
+"""
+Write-behind vote ingestion.
+
+When settings.VOTE_BUFFER["ENABLED"] is set, CastVoteView hands votes to a
+process-wide VoteBuffer instead of writing them straight to the database.
+Each vote is validated against a cached set of player/manager ids, appended
+to a per-process spool file (so a crashed worker loses nothing) and queued
+in memory. A background thread flushes the queue with bulk_create whenever
+BATCH_SIZE votes are pending or FLUSH_INTERVAL seconds have passed, and the
+queue is flushed once more at interpreter shutdown.
+
+Spool files left behind by dead workers are replayed when the next buffer
+starts, or on demand with `manage.py flush_vote_spool`.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .models import Player, Manager
+from .votes import apply_vote_batch
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": False,
+    "BATCH_SIZE": 500,
+    "FLUSH_INTERVAL": 1.0,
+    "ID_CACHE_TTL": 60.0,
+    "SPOOL_DIR": None,
+}
+
+# Minimum delay between id-set reloads triggered by an unknown id, so a
+# flood of bogus ids cannot turn every request into a SELECT.
+MISS_RELOAD_INTERVAL = 1.0
+
+SPOOL_PREFIX = "votes-"
+SPOOL_SUFFIX = ".spool"
+REPLAYING = ".replaying-"
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _parse_spool(path):
+    votes = []
+    with open(path) as fh:
+        for line in fh:
+            try:
+                kind, pk, ts = line.split()
+                pk = int(pk)
+                ts = datetime.fromtimestamp(float(ts), tz=timezone.utc)
+            except ValueError:
+                continue  # torn final line from a crash mid-write
+            votes.append((pk, None, ts) if kind == "p" else (None, pk, ts))
+    return votes
+
+
+def _apply_in_chunks(votes, size):
+    """
+    Store one spool segment in a single transaction: either every chunk is
+    committed or none is, so retrying a failed segment never counts a vote
+    twice. Only a crash between the commit and unlinking the file can still
+    replay a segment.
+    """
+    stored = 0
+    with transaction.atomic():
+        for start in range(0, len(votes), size):
+            stored += apply_vote_batch(votes[start:start + size])
+    return stored
+
+
+def _spool_owner(path):
+    """
+    Pid of the process a spool file belongs to: the worker that wrote it,
+    or the one replaying it.
+    """
+    name, _, replayer = path.name.partition(REPLAYING)
+    try:
+        return int(replayer or name[len(SPOOL_PREFIX):].split(".", 1)[0])
+    except ValueError:
+        return None
+
+
+def recover_spool(spool_dir, batch_size=DEFAULTS["BATCH_SIZE"]):
+    """
+    Replay spool files whose owning process is gone.
+    Returns the number of votes stored.
+
+    Each file is first claimed by renaming it to "<name>.replaying-<pid>";
+    rename is atomic, so when several workers start at once only one of
+    them replays a given file.
+    """
+    spool_dir = Path(spool_dir)
+    if not spool_dir.is_dir():
+        return 0
+
+    stored = 0
+    for path in sorted(spool_dir.glob(f"{SPOOL_PREFIX}*{SPOOL_SUFFIX}*")):
+        pid = _spool_owner(path)
+        if pid is None or pid != os.getpid() and _pid_alive(pid):
+            continue
+        claimed = path.with_name(f"{path.name.partition(REPLAYING)[0]}{REPLAYING}{os.getpid()}")
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            continue  # claimed by another worker
+        stored += _apply_in_chunks(_parse_spool(claimed), batch_size)
+        claimed.unlink(missing_ok=True)
+        logger.info("Replayed vote spool %s", path.name)
+    return stored
+
+
+class VoteBuffer:
+    """
+    Validates, spools and queues votes; flushes them to the database in batches.
+    """
+
+    def __init__(self, spool_dir, batch_size=500, flush_interval=1.0, id_cache_ttl=60.0,
+                 start_thread=True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.id_cache_ttl = id_cache_ttl
+        self.spool_dir = Path(spool_dir)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = []
+        self._retry = []  # (segment path, votes) whose flush failed
+        self._segment = 0
+        self._known = {"p": frozenset(), "m": frozenset()}
+        self._loaded_at = {"p": 0.0, "m": 0.0}
+
+        self._spool_path = self.spool_dir / f"{SPOOL_PREFIX}{os.getpid()}{SPOOL_SUFFIX}"
+        recover_spool(self.spool_dir, batch_size)
+        self._spool_fd = self._open_spool()
+
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = None
+        if start_thread:
+            self._thread = threading.Thread(target=self._run, name="vote-buffer", daemon=True)
+            self._thread.start()
+
+    # --- validation -------------------------------------------------------
+
+    def _load_ids(self, kind):
+        model = Player if kind == "p" else Manager
+        self._known[kind] = frozenset(model.objects.values_list("pk", flat=True))
+        self._loaded_at[kind] = time.monotonic()
+
+    def _is_known(self, kind, pk):
+        age = time.monotonic() - self._loaded_at[kind]
+        if age > self.id_cache_ttl:
+            self._load_ids(kind)
+        elif pk not in self._known[kind] and age > MISS_RELOAD_INTERVAL:
+            self._load_ids(kind)  # the entity may have been created since
+        return pk in self._known[kind]
+
+    # --- ingestion --------------------------------------------------------
+
+    def _open_spool(self):
+        return os.open(self._spool_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def submit(self, player_id=None, manager_id=None):
+        """
+        Queue a vote. Raises Player.DoesNotExist / Manager.DoesNotExist
+        for ids that are not in the cached id set.
+        """
+        kind, model, pk = ("p", Player, player_id) if player_id else ("m", Manager, manager_id)
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise model.DoesNotExist
+        if not self._is_known(kind, pk):
+            raise model.DoesNotExist
+
+        now = time.time()
+        vote = (pk, None, now) if kind == "p" else (None, pk, now)
+        with self._lock:
+            os.write(self._spool_fd, f"{kind} {pk} {now}\n".encode())
+            self._pending.append(vote)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """
+        Write all queued votes to the database. Returns the number stored.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                segment = None
+                if batch:
+                    os.close(self._spool_fd)
+                    self._segment += 1
+                    segment = self._spool_path.with_name(f"{self._spool_path.name}.{self._segment}")
+                    os.rename(self._spool_path, segment)
+                    self._spool_fd = self._open_spool()
+
+            work = self._retry + ([(segment, batch)] if batch else [])
+            self._retry = []
+            stored = 0
+            for i, (path, votes) in enumerate(work):
+                rows = [(p, m, datetime.fromtimestamp(ts, tz=timezone.utc)) for p, m, ts in votes]
+                try:
+                    stored += _apply_in_chunks(rows, self.batch_size)
+                except Exception:
+                    logger.exception("Vote flush failed; %d votes kept for retry", len(votes))
+                    self._retry = work[i:]
+                    break
+                path.unlink(missing_ok=True)
+            return stored
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            self.flush()
+
+    def close(self):
+        """
+        Stop the flush thread and drain the queue.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        os.close(self._spool_fd)
+        if not self._retry and os.path.getsize(self._spool_path) == 0:
+            self._spool_path.unlink(missing_ok=True)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def buffer_settings():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "VOTE_BUFFER", {}))
+    if config["SPOOL_DIR"] is None:
+        config["SPOOL_DIR"] = Path(settings.BASE_DIR) / "var" / "vote_spool"
+    return config
+
+
+def get_vote_buffer():
+    """
+    Return the process-wide buffer, or None when buffering is disabled.
+    """
+    global _buffer
+    if _buffer is not None:
+        return _buffer
+
+    config = buffer_settings()
+    if not config["ENABLED"]:
+        return None
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = VoteBuffer(
+                config["SPOOL_DIR"],
+                batch_size=config["BATCH_SIZE"],
+                flush_interval=config["FLUSH_INTERVAL"],
+                id_cache_ttl=config["ID_CACHE_TTL"],
+            )
+            atexit.register(_buffer.close)
+    return _buffer
+
+
+async def aget_vote_buffer():
+    """
+    Async get_vote_buffer(). Building the buffer replays leftover spools
+    through the ORM, so that first call runs in a worker thread.
+    """
+    if _buffer is not None:
+        return _buffer
+    if not buffer_settings()["ENABLED"]:
+        return None
+    return await sync_to_async(get_vote_buffer)()
@@ -0,0 +1,100 @@
+from collections import Counter
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from .cache import bump_version, vote_scope
+from .models import Player, Manager, Vote
+from .rankings import apply_votes
+from .rollups import record_rollups
+
+
+def record_vote(player_id=None, manager_id=None):
+    """
+    Store a vote and bump the voted entity's counter in one transaction.
+    Raises Player.DoesNotExist / Manager.DoesNotExist for unknown ids.
+    """
+    model, pk = (Player, player_id) if player_id else (Manager, manager_id)
+
+    with transaction.atomic():
+        # The counter UPDATE doubles as the existence check, saving a SELECT.
+        if not model.objects.filter(pk=pk).update(vote_count=F("vote_count") + 1):
+            raise model.DoesNotExist
+        transaction.on_commit(partial(apply_votes, model, {int(pk): 1}))
+        vote = Vote.objects.create(player_id=player_id, manager_id=manager_id)
+        record_rollups([(vote.player_id, vote.manager_id, vote.timestamp)])
+        return vote
+
+
+# The async ORM has no transaction support, so the vote transaction runs in
+# the request's worker thread while the event loop keeps serving others.
+arecord_vote = sync_to_async(record_vote)
+
+
+def _bump_counters(model, counts):
+    """
+    Add per-id increments to the counter column with a single UPDATE.
+    """
+    if not counts:
+        return
+    increment = Case(*(When(pk=pk, then=Value(n)) for pk, n in counts.items()), default=Value(0))
+    model.objects.filter(pk__in=counts).update(vote_count=F("vote_count") + increment)
+
+
+def apply_vote_batch(votes):
+    """
+    Bulk-insert a batch of (player_id, manager_id, timestamp) tuples and bump
+    the counters once per distinct entity. Votes for entities deleted since
+    they were queued are dropped. Returns the number of votes stored.
+    """
+    player_counts = Counter(p for p, m, ts in votes if p)
+    manager_counts = Counter(m for p, m, ts in votes if m)
+
+    with transaction.atomic():
+        live_players = set(Player.objects.filter(pk__in=player_counts).values_list("pk", flat=True))
+        live_managers = set(Manager.objects.filter(pk__in=manager_counts).values_list("pk", flat=True))
+        rows = [
+            Vote(player_id=p, manager_id=m, timestamp=ts)
+            for p, m, ts in votes
+            if (p in live_players) or (m in live_managers)
+        ]
+        Vote.objects.bulk_create(rows)
+        record_rollups([(vote.player_id, vote.manager_id, vote.timestamp) for vote in rows])
+        player_counts = {pk: n for pk, n in player_counts.items() if pk in live_players}
+        manager_counts = {pk: n for pk, n in manager_counts.items() if pk in live_managers}
+        _bump_counters(Player, player_counts)
+        _bump_counters(Manager, manager_counts)
+        transaction.on_commit(partial(bump_version, Vote))
+        transaction.on_commit(partial(apply_votes, Player, player_counts))
+        transaction.on_commit(partial(apply_votes, Manager, manager_counts))
+    return len(rows)
+
+
+def _vote_count_subquery(field):
+    votes = (
+        Vote.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(votes), Value(0))
+
+
+def reconcile_vote_counts():
+    """
+    Rebuild the denormalized counters from the Vote table.
+    Returns the number of (players, managers) whose counter was corrected.
+    """
+    fixed = []
+    with transaction.atomic():
+        for model, field in ((Player, "player"), (Manager, "manager")):
+            expected = _vote_count_subquery(field)
+            drifted = model.objects.annotate(expected=expected).exclude(vote_count=F("expected"))
+            fixed.append(drifted.count())
+            model.objects.update(vote_count=expected)
+        transaction.on_commit(partial(bump_version, vote_scope(Player), vote_scope(Manager)))
+    return tuple(fixed)